@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+"""
+Import-time and cold-start benchmark for PyLD.
+
+Each measurement runs in a fresh interpreter, which records how long
+`import pyld` takes, the resident memory after the import and the latency
+of the first and second call of each API function. The medians over
+several runs are written as JSON and can be compared against a previous
+result to detect regressions.
+
+.. module:: startup
+  :synopsis: Cold-start benchmark for pyld
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from argparse import SUPPRESS, ArgumentParser
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# the API functions whose first call is timed
+FUNCTIONS = [
+    'compact', 'expand', 'flatten', 'frame', 'normalize', 'to_rdf',
+    'from_rdf', 'parse_nquads']
+
+# regressions smaller than these are ignored as noise
+MIN_DELTA_MS = 2.0
+MIN_DELTA_KB = 1024
+
+CONTEXT = {
+    '@vocab': 'http://schema.org/',
+    'knows': {'@type': '@id'},
+    'tags': {'@container': '@list'},
+}
+
+DOCUMENT = {
+    '@context': CONTEXT,
+    '@id': 'http://example.org/alice',
+    '@type': 'Person',
+    'name': 'Alice',
+    'knows': 'http://example.org/bob',
+    'tags': ['a', 'b'],
+    'spouse': {'name': 'Bob', 'birthDate': {
+        '@value': '1970-01-01', '@type': 'Date'}},
+}
+
+NQUADS = (
+    '<http://example.org/alice> <http://schema.org/name> "Alice" .\n'
+    '<http://example.org/alice> <http://schema.org/knows> _:b0 .\n'
+    '_:b0 <http://schema.org/age> '
+    '"42"^^<http://www.w3.org/2001/XMLSchema#integer> .\n')
+
+
+def _rss_kb():
+    """
+    Returns the resident memory of the current process.
+
+    :return: the resident set size in KiB, or the peak one where the current
+      one is not available.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def _call(jsonld, name):
+    """
+    Calls an API function on a small document.
+
+    :param jsonld: the pyld.jsonld module.
+    :param name: the name of the function.
+    """
+    if name == 'compact':
+        jsonld.compact(DOCUMENT, CONTEXT)
+    elif name == 'expand':
+        jsonld.expand(DOCUMENT)
+    elif name == 'flatten':
+        jsonld.flatten(DOCUMENT)
+    elif name == 'frame':
+        jsonld.frame(DOCUMENT, {'@context': CONTEXT, '@type': 'Person'})
+    elif name == 'normalize':
+        jsonld.normalize(DOCUMENT, {
+            'algorithm': 'URDNA2015', 'format': 'application/n-quads'})
+    elif name == 'to_rdf':
+        jsonld.to_rdf(DOCUMENT)
+    elif name == 'from_rdf':
+        jsonld.from_rdf(NQUADS)
+    elif name == 'parse_nquads':
+        jsonld.parse_nquads(NQUADS)
+
+
+def probe(name):
+    """
+    Measures the import of pyld and the first calls of a function in the
+    current interpreter, which must not have imported pyld yet.
+
+    :param name: the name of the function to call, None to only import.
+
+    :return: the measurements.
+    """
+    sys.path.insert(0, SRC)
+    modules = len(sys.modules)
+    rss = _rss_kb()
+    start = time.perf_counter()
+    import pyld.jsonld
+    rval = {
+        'import_ms': (time.perf_counter() - start) * 1000,
+        'rss_kb': _rss_kb() - rss,
+        'modules': len(sys.modules) - modules,
+    }
+    if name:
+        for key in ('first_ms', 'second_ms'):
+            start = time.perf_counter()
+            _call(pyld.jsonld, name)
+            rval[key] = (time.perf_counter() - start) * 1000
+    return rval
+
+
+def _run_probe(name):
+    """
+    Runs a probe in a fresh interpreter.
+
+    :param name: the name of the function to call, None to only import.
+
+    :return: the measurements, including the wall time of the whole process.
+    """
+    args = [sys.executable, os.path.abspath(__file__), '--probe', name or '']
+    start = time.perf_counter()
+    output = subprocess.run(
+        args, check=True, stdout=subprocess.PIPE, universal_newlines=True)
+    rval = json.loads(output.stdout)
+    rval['process_ms'] = (time.perf_counter() - start) * 1000
+    return rval
+
+
+def _median(samples):
+    """
+    Returns the median of each measurement.
+
+    :param samples: a list of measurements.
+
+    :return: the median measurements.
+    """
+    return {
+        key: statistics.median(sample[key] for sample in samples)
+        for key in samples[0]}
+
+
+def run(functions, runs):
+    """
+    Runs the startup benchmark.
+
+    :param functions: the names of the functions whose first call is timed.
+    :param runs: the number of fresh interpreters used for each measurement.
+
+    :return: the results.
+    """
+    sys.path.insert(0, SRC)
+    from pyld import __version__
+
+    return {
+        'pyld': __version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'runs': runs,
+        'import': _median([_run_probe(None) for _ in range(runs)]),
+        'first_call': {
+            name: _median([_run_probe(name) for _ in range(runs)])
+            for name in functions},
+    }
+
+
+def _metrics(results):
+    """
+    Flattens the measurements used to detect regressions.
+
+    :param results: the results of the benchmark.
+
+    :return: a dict of metric name -> value.
+    """
+    rval = {
+        'import.' + key: results['import'][key]
+        for key in ('import_ms', 'process_ms', 'rss_kb')}
+    for name, result in results['first_call'].items():
+        rval['first_call.' + name] = result['first_ms']
+    return rval
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares results with a baseline.
+
+    :param results: the results of the benchmark.
+    :param baseline: the results to compare with.
+    :param threshold: the largest allowed ratio between a result and its
+      baseline.
+
+    :return: a list of (metric, baseline, result) for each regression.
+    """
+    rval = []
+    current = _metrics(results)
+    for key, before in _metrics(baseline).items():
+        after = current.get(key)
+        if after is None:
+            continue
+        slack = MIN_DELTA_KB if key.endswith('_kb') else MIN_DELTA_MS
+        if after > before * threshold and after - before > slack:
+            rval.append((key, before, after))
+    return rval
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '-r', '--runs', type=int, default=5,
+        help='Fresh interpreters per measurement [default: %(default)s]')
+    parser.add_argument(
+        '-f', '--function', dest='functions', action='append',
+        choices=FUNCTIONS,
+        help='Time the first call of this function [default: all]')
+    parser.add_argument(
+        '-o', '--output',
+        help='The filename to write the JSON results to [default: stdout]')
+    parser.add_argument(
+        '-b', '--baseline',
+        help='A previous JSON result to compare with')
+    parser.add_argument(
+        '-t', '--threshold', type=float, default=1.25,
+        help='Fail when a measurement exceeds its baseline by this ratio '
+             '[default: %(default)s]')
+    parser.add_argument(
+        '--max-import-ms', type=float,
+        help='Fail when importing pyld takes longer than this')
+    parser.add_argument('--probe', help=SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe is not None:
+        print(json.dumps(probe(args.probe)))
+        return 0
+
+    results = run(args.functions or FUNCTIONS, args.runs)
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    import_ms = results['import']['import_ms']
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        regressions.append(('import.import_ms', args.max_import_ms, import_ms))
+    for key, before, after in regressions:
+        print(
+            f'REGRESSION: {key}: {before:.1f} -> {after:.1f}',
+            file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,364 @@
+#!/usr/bin/env python
+"""
+Performance benchmark suite for PyLD.
+
+Times the operation of each test of the json-ld-api, json-ld-framing and
+normalization test manifests, loaded with the manifest loader and local
+document loader of the test runner, and of synthetic inputs scaled from
+a thousand to a million nodes. Results are written as JSON so they can be
+compared between commits.
+
+.. module:: suite
+  :synopsis: Benchmark suite for pyld
+"""
+
+import copy
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import unittest
+import warnings
+from argparse import ArgumentParser
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'tests'))
+import runtests  # noqa: E402
+from runtests import Manifest, TEST_TYPES, jsonld  # noqa: E402
+from workloads import WORKLOADS, generate  # noqa: E402
+
+OPERATIONS = [
+    'expand', 'compact', 'flatten', 'frame', 'to_rdf', 'from_rdf',
+    'normalize']
+
+# sibling directories holding the test suites, as in the test runner
+SIBLING_DIRS = [
+    '../json-ld-api/tests/',
+    '../json-ld-framing/tests/',
+    '../normalization/tests/',
+]
+
+
+def _no_remote_loader(url, options=None):
+    raise jsonld.LoadDocumentError(
+        'Benchmarks do not load remote documents.', url=url,
+        code='loading document failed')
+
+
+def load_tests(targets, identifier=None):
+    """
+    Loads the tests of the given manifests with the test runner.
+
+    :param targets: the manifests or directories holding a manifest.
+    :param identifier: only load tests whose id contains this string.
+
+    :return: the list of runnable tests.
+    """
+    runtests.ROOT_MANIFEST_DIR = '/'
+    runtests.ONLY_IDENTIFIER = identifier
+    root_manifest = {
+        '@id': '',
+        '@type': 'mf:Manifest',
+        'name': 'PyLD benchmarks',
+        'sequence': [],
+    }
+    for target in targets:
+        if os.path.isdir(target):
+            target = os.path.join(target, 'manifest.jsonld')
+        root_manifest['sequence'].append(os.path.abspath(target))
+    suite = Manifest(root_manifest, '/').load()
+
+    rval = []
+    for test in _iter_tests(suite):
+        if test.is_negative or test.is_syntax:
+            continue
+        try:
+            test.setUp()
+        except unittest.SkipTest:
+            continue
+        if not test.pending:
+            rval.append(test)
+    return rval
+
+
+def _iter_tests(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_tests(test)
+        else:
+            yield test
+
+
+def _measure(fn, make_args, repeat, min_time):
+    """
+    Times a function, calling it enough times per sample for the sample to
+    take at least `min_time` seconds.
+
+    :param fn: the function to time.
+    :param make_args: a function returning fresh arguments for one call.
+    :param repeat: the number of samples.
+    :param min_time: the minimum duration of a sample in seconds.
+
+    :return: the timing, in milliseconds per call.
+    """
+    start = time.perf_counter()
+    fn(*make_args())
+    elapsed = time.perf_counter() - start
+    number = max(1, math.ceil(min_time / elapsed)) if elapsed else 1000
+
+    samples = []
+    for _ in range(repeat):
+        args = [make_args() for _ in range(number)]
+        gc.collect()
+        start = time.perf_counter()
+        for a in args:
+            fn(*a)
+        samples.append((time.perf_counter() - start) / number * 1000)
+    return {
+        'min_ms': min(samples),
+        'median_ms': statistics.median(samples),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def bench_corpus(tests, operations, repeat, min_time):
+    """
+    Times the operation of each test.
+
+    :param tests: the tests, as loaded by `load_tests`.
+    :param operations: the operations to time.
+    :param repeat: the number of samples per test.
+    :param min_time: the minimum duration of a sample in seconds.
+
+    :return: a dict of test id -> timing, and the ids of failing tests.
+    """
+    results = {}
+    errors = []
+    for test in tests:
+        info = TEST_TYPES[test.test_type]
+        fn = info['fn']
+        if fn not in operations:
+            continue
+        test_id = test.data.get('@id', test.data.get('id'))
+        params = [param(test) for param in info['params']]
+        try:
+            timing = _measure(
+                getattr(jsonld, fn), lambda: copy.deepcopy(params),
+                repeat, min_time)
+        except Exception:
+            errors.append(test_id)
+            continue
+        timing['operation'] = fn
+        results[test_id] = timing
+    return results, errors
+
+
+def bench_synthetic(workloads, sizes, operations, repeat, min_time, seed=0):
+    """
+    Times each operation on synthetic documents of increasing size.
+
+    :param workloads: the names of the workloads generating the documents.
+    :param sizes: the numbers of nodes.
+    :param operations: the operations to time.
+    :param repeat: the number of samples per size.
+    :param min_time: the minimum duration of a sample in seconds.
+    :param seed: the seed of the workload generator.
+
+    :return: a dict of workload -> operation -> number of nodes -> timing.
+    """
+    results = {}
+    for name in workloads:
+        results[name] = {op: {} for op in operations}
+        for size in sizes:
+            for op, timing in _bench_document(
+                    name, size, operations, repeat, min_time, seed):
+                results[name][op][str(size)] = timing
+    return results
+
+
+def _bench_document(name, size, operations, repeat, min_time, seed):
+    """
+    Times each operation on the document of a workload.
+
+    :return: an iterator over (operation, timing) tuples.
+    """
+    doc = generate(name, size, seed)
+    ctx = doc['@context']
+    frame = dict(WORKLOADS[name].frame, **{'@context': ctx})
+    expanded = jsonld.expand(doc)
+    nquads = jsonld.to_rdf(expanded, {'format': 'application/n-quads'})
+    cases = {
+        'expand': (jsonld.expand, lambda: (doc,)),
+        'compact': (jsonld.compact, lambda: (expanded, ctx)),
+        'flatten': (jsonld.flatten, lambda: (expanded,)),
+        'frame': (jsonld.frame, lambda: (expanded, frame)),
+        'to_rdf': (jsonld.to_rdf, lambda: (expanded,)),
+        'from_rdf': (jsonld.from_rdf, lambda: (nquads,)),
+        'normalize': (jsonld.normalize, lambda: (expanded, {
+            'algorithm': 'URDNA2015',
+            'format': 'application/n-quads'})),
+    }
+    for op in operations:
+        fn, make_args = cases[op]
+        yield op, _measure(fn, make_args, repeat, min_time)
+
+
+def _commit():
+    """
+    Returns the commit of the source tree, None if it is not a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, check=True,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _timings(results):
+    """
+    Flattens the timings of a result.
+
+    :param results: the results of the suite.
+
+    :return: a dict of (section, key) -> median time in milliseconds.
+    """
+    rval = {}
+    for test_id, timing in results.get('corpus', {}).items():
+        rval[('corpus', test_id)] = timing['median_ms']
+    for name, operations in results.get('synthetic', {}).items():
+        for op, sizes in operations.items():
+            for size, timing in sizes.items():
+                rval[('synthetic', f'{name}/{op}/{size}')] = \
+                    timing['median_ms']
+    return rval
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares results with a baseline.
+
+    :param results: the results of the suite.
+    :param baseline: the results to compare with.
+    :param threshold: the largest allowed ratio between a timing and its
+      baseline.
+
+    :return: the geometric mean of the ratios per section, and a list of
+      (key, baseline, result) for each regression.
+    """
+    current = _timings(results)
+    ratios = {}
+    regressions = []
+    for key, before in _timings(baseline).items():
+        after = current.get(key)
+        if after is None or not before:
+            continue
+        ratios.setdefault(key[0], []).append(after / before)
+        if after > before * threshold:
+            regressions.append((key[1], before, after))
+    means = {
+        section: math.exp(statistics.mean(math.log(r) for r in values))
+        for section, values in ratios.items()}
+    return means, regressions
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        'tests', metavar='TEST', nargs='*',
+        help='A manifest or directory to benchmark')
+    parser.add_argument(
+        '-n', '--number', dest='identifier',
+        help='Limit tests to those containing the specified test identifier')
+    parser.add_argument(
+        '-p', '--operation', dest='operations', action='append',
+        choices=OPERATIONS,
+        help='Only time this operation [default: all]')
+    parser.add_argument(
+        '-s', '--sizes', default='1000,10000',
+        help='Comma-separated node counts of the synthetic inputs, '
+             'empty to skip them [default: %(default)s]')
+    parser.add_argument(
+        '-w', '--workload', dest='workloads', action='append',
+        choices=sorted(WORKLOADS),
+        help='Generate the synthetic inputs with this workload '
+             '[default: graph]')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='The seed of the workload generator [default: %(default)s]')
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=5,
+        help='Samples per measurement [default: %(default)s]')
+    parser.add_argument(
+        '--min-time', type=float, default=0.01,
+        help='Minimum duration of a sample in seconds '
+             '[default: %(default)s]')
+    parser.add_argument(
+        '--no-corpus', action='store_true', default=False,
+        help='Skip the test manifests')
+    parser.add_argument(
+        '-o', '--output',
+        help='The filename to write the JSON results to [default: stdout]')
+    parser.add_argument(
+        '-b', '--baseline',
+        help='A previous JSON result to compare with')
+    parser.add_argument(
+        '-t', '--threshold', type=float, default=1.25,
+        help='Fail when a timing exceeds its baseline by this ratio '
+             '[default: %(default)s]')
+    args = parser.parse_args()
+
+    operations = args.operations or OPERATIONS
+    warnings.simplefilter('ignore')
+    jsonld.set_document_loader(_no_remote_loader)
+
+    results = {
+        'pyld': jsonld.__version__,
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+    }
+    if not args.no_corpus:
+        targets = args.tests or [
+            d for d in SIBLING_DIRS if os.path.exists(d)]
+        if not targets:
+            raise Exception('No test manifest or directory specified.')
+        tests = load_tests(targets, args.identifier)
+        results['corpus'], results['errors'] = bench_corpus(
+            tests, operations, args.repeat, args.min_time)
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    if sizes:
+        results['synthetic'] = bench_synthetic(
+            args.workloads or ['graph'], sizes, operations, args.repeat,
+            args.min_time, args.seed)
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        means, regressions = compare(results, json.load(f), args.threshold)
+    for section, mean in sorted(means.items()):
+        print(f'{section}: {mean:.3f}x baseline', file=sys.stderr)
+    for key, before, after in regressions:
+        print(
+            f'REGRESSION: {key}: {before:.3f}ms -> {after:.3f}ms',
+            file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+"""
+Seeded synthetic workloads for benchmarks and profiling.
+
+Each workload generates a JSON-LD document of a configurable size that
+stresses a specific hot path of the processor. The same name, size and
+seed always generate the same document, which can also be written as
+N-Quads.
+
+.. module:: workloads
+  :synopsis: Synthetic workload generator for pyld
+"""
+
+import json
+import os
+import random
+import sys
+from argparse import ArgumentParser
+from typing import Any, Callable, Dict, NamedTuple
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from pyld import jsonld  # noqa: E402
+
+EX = 'http://example.org/'
+XSD_INTEGER = 'http://www.w3.org/2001/XMLSchema#integer'
+
+
+class Workload(NamedTuple):
+    # the function generating the document: (size, rng) -> document
+    generate: Callable[[int, random.Random], Dict[str, Any]]
+    # the hot path stressed by the workload
+    description: str
+    # the frame keys used to frame the document, besides its @context
+    frame: Dict[str, Any] = {}
+
+
+def graph(size, rng):
+    """
+    Nodes with a type, literals, a link to a random node and a blank node
+    every tenth node.
+    """
+    nodes = []
+    for i in range(size):
+        node = {
+            '@id': f'{EX}node/{i}',
+            '@type': 'Person' if i % 2 else 'Organization',
+            'name': f'Node {i}',
+            'age': i % 100,
+            'knows': f'{EX}node/{rng.randrange(size)}',
+        }
+        if i % 10 == 0:
+            node['address'] = {'streetAddress': f'{i} Main Street'}
+        nodes.append(node)
+    return {
+        '@context': {
+            '@vocab': 'http://schema.org/',
+            'knows': {'@type': '@id'},
+            'age': {'@type': XSD_INTEGER},
+        },
+        '@graph': nodes,
+    }
+
+
+def wide(size, rng):
+    """
+    A single node with `size` values spread over a few properties, about a
+    third of them duplicates, which `add_value` has to detect.
+    """
+    node = {'@id': f'{EX}wide'}
+    for i in range(size):
+        # each property gets size / 24 values of each kind, drawn from as
+        # many, so that a value repeats an earlier one about a third of the
+        # time
+        value = rng.randrange(max(1, size // 24))
+        prop = f'p{i % 8}'
+        if i % 3 == 0:
+            value = {'@id': f'{EX}node/{value}'}
+        elif i % 3 == 1:
+            value = f'value {value}'
+        node.setdefault(prop, []).append(value)
+    return {'@context': {'@vocab': EX}, **node}
+
+
+def deep(size, rng, depth=100):
+    """
+    Chains of `depth` nested nodes, `size` nodes in total, which stress the
+    recursion of `_expand` and `_compact`.
+    """
+    chains = []
+    for start in range(0, size, depth):
+        node = None
+        for i in reversed(range(start, min(start + depth, size))):
+            child = node
+            node = {'@id': f'{EX}node/{i}', 'value': rng.randrange(size)}
+            if child is not None:
+                node['child'] = child
+        chains.append(node)
+    return {'@context': {'@vocab': EX}, '@graph': chains}
+
+
+def symmetric(size, rng, ring=6):
+    """
+    Rings of `ring` blank nodes, `size` nodes in total, all isomorphic. All
+    blank nodes have the same first degree hash, so canonicalization falls
+    back to `hash_n_degree_quads` and its permutations.
+    """
+    nodes = []
+    for start in range(0, size, ring):
+        end = min(start + ring, size)
+        for i in range(start, end):
+            next_ = start + (i - start + 1) % (end - start)
+            nodes.append({
+                '@id': f'_:b{i}',
+                'next': {'@id': f'_:b{next_}'},
+                'label': 'node',
+            })
+    rng.shuffle(nodes)
+    return {'@context': {'@vocab': EX}, '@graph': nodes}
+
+
+def large_context(size, rng):
+    """
+    A context with `size` terms (prefixes, typed terms and containers) and
+    nodes using a sample of them, which stress the inverse context and
+    `_compact_iri`.
+    """
+    context = {'@vocab': EX}
+    terms = []
+    for i in range(size):
+        term = f'term{i}'
+        if i % 4 == 0:
+            context[f'ns{i}'] = f'{EX}ns/{i}/'
+            context[term] = f'ns{i}:{term}'
+        elif i % 4 == 1:
+            context[term] = {'@id': f'{EX}{term}', '@type': '@id'}
+        elif i % 4 == 2:
+            context[term] = {'@id': f'{EX}{term}', '@container': '@set'}
+        else:
+            context[term] = {'@id': f'{EX}{term}', '@language': 'en'}
+        terms.append(term)
+    nodes = []
+    for i in range(max(1, size // 10)):
+        node = {'@id': f'{EX}node/{i}'}
+        for term in rng.sample(terms, min(10, len(terms))):
+            node[term] = f'{EX}node/{rng.randrange(size)}'
+        nodes.append(node)
+    return {'@context': context, '@graph': nodes}
+
+
+def long_list(size, rng):
+    """
+    A node with a `@list` of `size` items, which stresses `_list_to_rdf`
+    and the list conversion of `_from_rdf`.
+    """
+    items = []
+    for i in range(size):
+        if i % 2:
+            items.append({'@id': f'{EX}node/{rng.randrange(size)}'})
+        else:
+            items.append(rng.randrange(size))
+    return {
+        '@context': {'@vocab': EX, 'items': {'@container': '@list'}},
+        '@id': f'{EX}list',
+        'items': items,
+    }
+
+
+def named_graphs(size, rng, nodes_per_graph=10):
+    """
+    `size` nodes spread over named graphs of `nodes_per_graph` nodes.
+    """
+    graphs = []
+    for start in range(0, size, nodes_per_graph):
+        graphs.append({
+            '@id': f'{EX}graph/{start // nodes_per_graph}',
+            '@graph': [{
+                '@id': f'{EX}node/{i}',
+                'value': rng.randrange(size),
+                'link': {'@id': f'{EX}node/{rng.randrange(size)}'},
+            } for i in range(start, min(start + nodes_per_graph, size))],
+        })
+    return {'@context': {'@vocab': EX}, '@graph': graphs}
+
+
+WORKLOADS = {
+    'graph': Workload(
+        graph, 'nodes linking to random nodes',
+        {'@type': 'Person', 'knows': {'@embed': '@never'}}),
+    'wide': Workload(wide, 'many values per property (add_value)'),
+    'deep': Workload(deep, 'deep nesting (_expand recursion)'),
+    'symmetric': Workload(
+        symmetric, 'isomorphic blank node rings (hash_n_degree_quads)'),
+    'large_context': Workload(
+        large_context, 'large contexts (inverse context, _compact_iri)'),
+    'long_list': Workload(long_list, 'long lists (_list_to_rdf, _from_rdf)'),
+    'named_graphs': Workload(named_graphs, 'many named graphs'),
+}
+
+
+def generate(name, size, seed=0):
+    """
+    Generates the document of a workload.
+
+    :param name: the name of the workload.
+    :param size: the number of nodes or values of the document.
+    :param seed: the seed of the random generator.
+
+    :return: the JSON-LD document.
+    """
+    return WORKLOADS[name].generate(size, random.Random(seed))
+
+
+def to_nquads(document):
+    """
+    Converts a generated document to N-Quads.
+
+    :param document: the JSON-LD document.
+
+    :return: the N-Quads.
+    """
+    return jsonld.to_rdf(document, {'format': 'application/n-quads'})
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        'workload', nargs='?', choices=sorted(WORKLOADS),
+        help='The workload to generate')
+    parser.add_argument(
+        '-n', '--size', type=int, default=1000,
+        help='The number of nodes or values [default: %(default)s]')
+    parser.add_argument(
+        '-s', '--seed', type=int, default=0,
+        help='The seed of the random generator [default: %(default)s]')
+    parser.add_argument(
+        '-f', '--format', choices=['jsonld', 'nquads'], default='jsonld',
+        help='The output format [default: %(default)s]')
+    parser.add_argument(
+        '-o', '--output',
+        help='The filename to write to [default: stdout]')
+    parser.add_argument(
+        '-l', '--list', action='store_true', default=False,
+        help='List the workloads')
+    args = parser.parse_args()
+
+    if args.list or not args.workload:
+        for name, workload in sorted(WORKLOADS.items()):
+            print(f'{name}: {workload.description}')
+        return 0
+
+    document = generate(args.workload, args.size, args.seed)
+    if args.format == 'nquads':
+        output = to_nquads(document)
+    else:
+        output = json.dumps(document, indent=2) + '\n'
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,6 +15,7 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+from functools import lru_cache
 from json.encoder import JSONEncoder, _make_iterencode, encode_basestring
 
 
@@ -94,8 +95,11 @@ def default(self, o):
                     'is not JSON serializable')
 
 
+# ids of the containers being encoded, to detect circular references
+_markers = {}
+
 _iterencode = _make_iterencode(
-    dict(), default, encode_basestring, None, es6_format,
+    _markers, default, encode_basestring, None, es6_format,
     ':', ',', True, False, False, _intstr=es6_format)
 
 
@@ -122,14 +126,169 @@ class Encoder(JSONEncoder):
         # don't pass the iterator directly to ''.join() to get more
         # deatiled exceptions. The list call should be roughly
         # equivalent to the PySequence_Fast that ''.join() would do.
-        chunks = _iterencode(o, 0)
-        if not isinstance(chunks, (list, tuple)):
-            chunks = list(chunks)
+        try:
+            chunks = _iterencode(o, 0)
+            if not isinstance(chunks, (list, tuple)):
+                chunks = list(chunks)
+        finally:
+            # an error leaves the markers of the containers it was in
+            _markers.clear()
         return ''.join(chunks)
 
 
-_encode = Encoder.encode
+# integers in this range are exact doubles and es6_format writes them as is
+_MAX_SAFE_INTEGER = 2 ** 53
+
+
+@lru_cache(maxsize=4096)
+def _es6_float(value):
+    return es6_format(value)
+
+
+def _encode_fast(o):
+    '''Return the canonical JSON representation of a Python data structure
+    made of dicts with str keys, lists, tuples, str, int, float, bool and
+    None, without the generator machinery of `_iterencode`.
+
+    Raises _Unsupported for anything else, so the caller can fall back to
+    `Encoder.encode`.
+    '''
+    if isinstance(o, str):
+        return encode_basestring(o)
+    if o is None:
+        return 'null'
+    if o is True:
+        return 'true'
+    if o is False:
+        return 'false'
+    if isinstance(o, int):
+        if -_MAX_SAFE_INTEGER < o < _MAX_SAFE_INTEGER:
+            return int.__repr__(o)
+        return es6_format(o)
+    if isinstance(o, float):
+        if o.is_integer():
+            if -_MAX_SAFE_INTEGER < o < _MAX_SAFE_INTEGER:
+                return int.__repr__(int(o))
+        elif 1e-4 <= abs(o) < 1e16:
+            # the shortest repr has no exponent in this range, as in ES6
+            return float.__repr__(o)
+        return _es6_float(o)
+    if isinstance(o, dict):
+        for key in o:
+            if not isinstance(key, str):
+                raise _Unsupported
+        return '{' + ','.join([
+            encode_basestring(key) + ':' + _encode_fast(value)
+            for key, value in sorted(o.items())]) + '}'
+    if isinstance(o, (list, tuple)):
+        return '[' + ','.join([_encode_fast(value) for value in o]) + ']'
+    raise _Unsupported
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _encode(o):
+    try:
+        return _encode_fast(o)
+    except (_Unsupported, RecursionError):
+        # the stdlib encoder raises the same errors as before for
+        # unsupported types and circular references
+        return Encoder.encode(o)
 
 
 def canonicalize(obj, utf8=True):
     return _encode(obj).encode() if utf8 else _encode(obj)
+
+
+class _BufferedWriter(object):
+    '''Collects chunks of canonical JSON and passes them on to a write
+    function in blocks, UTF-8 encoded or not.
+    '''
+    __slots__ = 'chunks', 'sink', 'utf8'
+
+    # number of chunks collected before they are joined and written
+    BLOCK = 4096
+
+    def __init__(self, sink, utf8):
+        self.chunks = []
+        self.sink = sink
+        self.utf8 = utf8
+
+    def write(self, chunk):
+        self.chunks.append(chunk)
+        if len(self.chunks) >= self.BLOCK:
+            self.flush()
+
+    def flush(self):
+        if self.chunks:
+            data = ''.join(self.chunks)
+            self.chunks = []
+            self.sink(data.encode() if self.utf8 else data)
+
+
+def _write(o, write, markers):
+    '''Write the canonical JSON representation of a Python data structure,
+    a chunk at a time, so that only the leaves are encoded in memory.
+    '''
+    if isinstance(o, dict):
+        if not all(isinstance(key, str) for key in o):
+            write(Encoder.encode(o))
+            return
+        marker = id(o)
+        if marker in markers:
+            raise ValueError('Circular reference detected')
+        markers.add(marker)
+        write('{')
+        separator = ''
+        for key, value in sorted(o.items()):
+            write(separator + encode_basestring(key) + ':')
+            _write(value, write, markers)
+            separator = ','
+        write('}')
+        markers.remove(marker)
+    elif isinstance(o, (list, tuple)):
+        marker = id(o)
+        if marker in markers:
+            raise ValueError('Circular reference detected')
+        markers.add(marker)
+        write('[')
+        separator = ''
+        for value in o:
+            write(separator)
+            _write(value, write, markers)
+            separator = ','
+        write(']')
+        markers.remove(marker)
+    else:
+        write(_encode(o))
+
+
+def canonicalize_to(obj, fp, utf8=True):
+    '''Write the canonical JSON representation of a Python data structure to
+    a file-like object, without holding all of it in memory.
+
+    :param obj: the data structure.
+    :param fp: the object to write to, with a `write` method.
+    :param utf8: True to write UTF-8 encoded bytes, False to write str.
+    '''
+    writer = _BufferedWriter(fp.write, utf8)
+    _write(obj, writer.write, set())
+    writer.flush()
+
+
+def canonical_digest(obj, hash):
+    '''Feed the UTF-8 encoded canonical JSON representation of a Python data
+    structure to a hash object, without holding all of it in memory.
+
+    :param obj: the data structure.
+    :param hash: the hash object, with an `update` method, such as
+      `hashlib.sha256()`.
+
+    :return: the hash object.
+    '''
+    writer = _BufferedWriter(hash.update, True)
+    _write(obj, writer.write, set())
+    writer.flush()
+    return hash
@@ -1,5 +1,5 @@
 from json.encoder import JSONEncoder
-from typing import Any, NoReturn, Iterator, Callable
+from typing import Any, NoReturn, Iterator, Callable, List, Set, Union
 
 
 def es6_format(value: str) -> str: ...
@@ -23,7 +23,31 @@ class Encoder(JSONEncoder):
     def encode(cls, o: Any) -> str: ...
 
 
-_encode: Callable[[Any], str]
+_MAX_SAFE_INTEGER: int
 
 
-def canonicalize(obj: Any, utf8: bool) -> str: ...
+def _es6_float(value: float) -> str: ...
+def _encode_fast(o: Any) -> str: ...
+
+
+class _Unsupported(Exception): ...
+
+
+def _encode(o: Any) -> str: ...
+def canonicalize(obj: Any, utf8: bool = ...) -> Union[bytes, str]: ...
+
+
+class _BufferedWriter(object):
+    chunks: List[str]
+    sink: Callable[[Union[bytes, str]], Any]
+    utf8: bool
+    BLOCK: int
+    def __init__(
+        self, sink: Callable[[Union[bytes, str]], Any], utf8: bool) -> None: ...
+    def write(self, chunk: str) -> None: ...
+    def flush(self) -> None: ...
+
+
+def _write(o: Any, write: Callable[[str], Any], markers: Set[int]) -> None: ...
+def canonicalize_to(obj: Any, fp: Any, utf8: bool = ...) -> None: ...
+def canonical_digest(obj: Any, hash: Any) -> Any: ...
@@ -0,0 +1,390 @@
+"""
+Statistics and management of the context caches.
+
+The caches are:
+
+- 'resolved_contexts': the contexts resolved from URLs and inline
+  contexts (`RESOLVED_CONTEXT_CACHE_MAX_SIZE`).
+- 'processed_contexts': the active contexts resulting from processing each
+  resolved context, which every resolved context keeps for up to
+  `MAX_ACTIVE_CONTEXTS` active contexts it was processed against.
+- 'inverse_contexts': the inverse contexts used for compaction
+  (`INVERSE_CONTEXT_CACHE_MAX_SIZE`).
+- 'term_indexes': the CURIE prefix indexes used for compaction
+  (`INVERSE_CONTEXT_CACHE_MAX_SIZE`).
+- 'inline_context_keys': the cache keys of inline contexts, with a JSON
+  copy of each context rather than the context itself
+  (`RESOLVED_CONTEXT_CACHE_MAX_SIZE`).
+- 'i18n_datatypes': the language and direction of i18n datatypes
+  (`DATATYPE_CACHE_MAX_SIZE`).
+- 'initial_contexts': the initial context of each processing mode, which is
+  not bounded and has no hit counters.
+
+Hits and misses are counted on each lookup, and evictions each time an
+entry is dropped to make room for a new one.
+
+.. module:: cache
+  :synopsis: Context cache statistics and management
+"""
+import sys
+from collections.abc import Mapping
+
+from cachetools import Cache, LRUCache
+
+__all__ = [
+    'CacheStats', 'StatsLRUCache', 'CACHES',
+    'stats', 'reset_stats', 'clear', 'resize', 'warm',
+]
+
+CACHES = (
+    'resolved_contexts', 'processed_contexts', 'inverse_contexts',
+    'term_indexes', 'inline_context_keys', 'i18n_datatypes',
+    'initial_contexts',
+)
+
+
+class CacheStats:
+    """
+    The hit, miss and eviction counters of a cache.
+    """
+    __slots__ = 'hits', 'misses', 'evictions'
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Sets the counters to zero.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class StatsLRUCache(LRUCache):
+    """
+    A least recently used cache that counts its hits, misses and evictions,
+    and can be resized.
+    """
+
+    def __init__(self, maxsize, stats=None):
+        """
+        Creates a StatsLRUCache.
+
+        :param maxsize: the maximum number of entries, 0 to disable the
+          cache.
+        :param [stats]: the CacheStats to count with, to share counters
+          between caches (default: new counters).
+        """
+        if maxsize < 0:
+            raise ValueError('maxsize must be non-negative')
+        # entries are evicted here, so that the cache can be resized
+        LRUCache.__init__(self, sys.maxsize)
+        self._maxsize = maxsize
+        self.stats = CacheStats() if stats is None else stats
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    def get(self, key, default=None):
+        if key in self:
+            self.stats.hits += 1
+            return self[key]
+        self.stats.misses += 1
+        return default
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            if not self._maxsize:
+                return
+            self._evict(self._maxsize - 1)
+        LRUCache.__setitem__(self, key, value)
+
+    def _evict(self, size):
+        """
+        Evicts the least recently used entries until at most `size` are
+        left.
+        """
+        while len(self) > size:
+            self.popitem()
+            self.stats.evictions += 1
+
+    def resize(self, maxsize):
+        """
+        Sets the maximum number of entries, evicting the least recently used
+        ones that no longer fit.
+
+        :param maxsize: the maximum number of entries, 0 to disable the
+          cache.
+        """
+        if maxsize < 0:
+            raise ValueError('maxsize must be non-negative')
+        self._maxsize = maxsize
+        self._evict(maxsize)
+
+    def peek(self):
+        """
+        Returns the values of the cache without marking them as recently
+        used.
+
+        :return: the list of values.
+        """
+        return [Cache.__getitem__(self, key) for key in list(self)]
+
+
+def _caches():
+    """
+    Returns the bounded caches kept by the modules of pyld.
+
+    :return: a dict of name -> StatsLRUCache.
+    """
+    from . import context_resolver, jsonld
+
+    return {
+        'resolved_contexts': jsonld._resolved_context_cache,
+        'inverse_contexts': jsonld._inverse_context_cache,
+        'term_indexes': jsonld._term_index_cache,
+        'inline_context_keys': context_resolver._inline_context_keys,
+        'i18n_datatypes': jsonld._i18n_datatype_cache,
+    }
+
+
+def _resolved_contexts():
+    """
+    Returns the resolved contexts held by the resolved context cache.
+
+    :return: the list of ResolvedContexts.
+    """
+    from .jsonld import _resolved_context_cache
+
+    rval = []
+    for tag_map in _resolved_context_cache.peek():
+        for resolved in tag_map.values():
+            if isinstance(resolved, list):
+                rval.extend(resolved)
+            else:
+                rval.append(resolved)
+    return rval
+
+
+def _check_names(names):
+    """
+    Validates cache names.
+
+    :param names: the cache names, None for all of them.
+
+    :return: the list of cache names.
+    """
+    if names is None:
+        return list(CACHES)
+    if isinstance(names, str):
+        names = [names]
+    for name in names:
+        if name not in CACHES:
+            raise ValueError(f'Unknown cache: {name}')
+    return list(names)
+
+
+def _entry(cache_stats, currsize, maxsize):
+    """
+    Returns the statistics of a cache.
+    """
+    rval = {
+        'hits': None, 'misses': None, 'evictions': None, 'hit_rate': None,
+        'currsize': currsize, 'maxsize': maxsize,
+    }
+    if cache_stats is not None:
+        lookups = cache_stats.hits + cache_stats.misses
+        rval.update(
+            hits=cache_stats.hits, misses=cache_stats.misses,
+            evictions=cache_stats.evictions,
+            hit_rate=cache_stats.hits / lookups if lookups else None)
+    return rval
+
+
+def stats(names=None, memory=False):
+    """
+    Returns the statistics of the context caches.
+
+    The 'maxsize' of 'processed_contexts' is the number of active contexts
+    kept per resolved context, and its 'currsize' the total number of
+    processed contexts kept by the resolved contexts in the cache.
+
+    :param [names]: the name or names of the caches (default: all).
+    :param [memory]: True to estimate the memory used by each cache, which
+      walks every cached value (default: False).
+
+    :return: a dict of cache name -> dict with the 'hits', 'misses',
+      'evictions', 'hit_rate', 'currsize' and 'maxsize' of the cache, and
+      its estimated size in 'bytes' if requested.
+    """
+    from .context_resolver import ResolvedContext
+    from .jsonld import INITIAL_CONTEXTS
+
+    caches = _caches()
+    rval = {}
+    for name in _check_names(names):
+        if name in caches:
+            cache = caches[name]
+            entry = _entry(cache.stats, len(cache), cache.maxsize)
+            values = cache.peek() if memory else None
+        elif name == 'processed_contexts':
+            values = [
+                value for resolved in _resolved_contexts()
+                for value in resolved.processed()]
+            entry = _entry(
+                ResolvedContext.stats, len(values), ResolvedContext.maxsize)
+        else:
+            values = list(INITIAL_CONTEXTS.values())
+            entry = _entry(None, len(values), None)
+        if memory:
+            entry['bytes'] = _sizeof(values)
+        rval[name] = entry
+    return rval
+
+
+def _sizeof(values):
+    """
+    Estimates the memory used by values and the objects they hold, counting
+    each shared object once. The processed contexts of resolved contexts are
+    not included, as they are counted in 'processed_contexts'.
+
+    :param values: the values.
+
+    :return: the estimated size in bytes.
+    """
+    from .context_resolver import ResolvedContext
+
+    seen = set()
+    size = 0
+    stack = list(values)
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        if isinstance(o, Mapping):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif isinstance(o, ResolvedContext):
+            stack.append(o.document)
+    return size
+
+
+def reset_stats(names=None):
+    """
+    Sets the counters of the context caches to zero.
+
+    :param [names]: the name or names of the caches (default: all).
+    """
+    from .context_resolver import ResolvedContext
+
+    caches = _caches()
+    for name in _check_names(names):
+        if name in caches:
+            caches[name].stats.reset()
+        elif name == 'processed_contexts':
+            ResolvedContext.stats.reset()
+
+
+def clear(names=None):
+    """
+    Removes the entries of the context caches. Their counters are kept, see
+    `reset_stats`.
+
+    :param [names]: the name or names of the caches (default: all).
+    """
+    from .jsonld import INITIAL_CONTEXTS
+
+    caches = _caches()
+    for name in _check_names(names):
+        if name in caches:
+            caches[name].clear()
+        elif name == 'processed_contexts':
+            for resolved in _resolved_contexts():
+                resolved.cache.clear()
+        else:
+            INITIAL_CONTEXTS.clear()
+
+
+def resize(name, maxsize):
+    """
+    Sets the maximum number of entries of a context cache, evicting the
+    least recently used entries that no longer fit.
+
+    For 'processed_contexts', this sets the number of active contexts kept
+    by each resolved context, both cached and resolved later.
+
+    :param name: the name of the cache.
+    :param maxsize: the maximum number of entries, 0 to disable the cache.
+    """
+    from .context_resolver import ResolvedContext
+
+    _check_names(name)
+    caches = _caches()
+    if name in caches:
+        caches[name].resize(maxsize)
+    elif name == 'processed_contexts':
+        if maxsize < 0:
+            raise ValueError('maxsize must be non-negative')
+        ResolvedContext.maxsize = maxsize
+        for resolved in _resolved_contexts():
+            resolved.resize(maxsize)
+    else:
+        raise ValueError(f'Cache {name} cannot be resized.')
+
+
+def warm(urls_or_contexts, options=None):
+    """
+    Resolves and processes contexts ahead of time, filling the resolved,
+    processed and inverse context caches, so that later operations using
+    the same contexts neither fetch nor process them again.
+
+    Remote contexts loaded while warming are kept until they are evicted or
+    cleared, even when their document loader does not tag them as static.
+
+    :param urls_or_contexts: an iterable of context URLs, contexts (or
+      documents with a `@context`) and contexts serialized with
+      `jsonld.dumps_context`.
+    :param [options]: the options to use.
+      [base] the base IRI to use.
+      [processingMode] Either 'json-ld-1.0' or 'json-ld-1.1',
+        defaults to 'json-ld-1.1'.
+      [documentLoader(url, options)] the document loader
+        (default: _default_document_loader).
+
+    :return: the list of processed active contexts, in input order.
+    """
+    from . import jsonld
+    from .context_resolver import ContextResolver
+
+    options = options.copy() if options else {}
+    options.setdefault('base', '')
+    options.setdefault('documentLoader', jsonld._default_document_loader)
+    options.setdefault('processingMode', jsonld.JSONLD_VERSION)
+
+    processor = jsonld.JsonLdProcessor()
+    shared_cache = jsonld._resolved_context_cache
+    rval = []
+    for ctx in urls_or_contexts:
+        if isinstance(ctx, bytes):
+            rval.append(jsonld.loads_context(ctx))
+            continue
+        # use a private resolver to keep every context it resolves
+        resolver = ContextResolver(
+            {}, options['documentLoader'], options.get('profiler'))
+        initial_ctx = processor._get_initial_context(options)
+        active_ctx = processor.process_context(
+            initial_ctx, ctx, dict(options, contextResolver=resolver))
+        processor._get_inverse_context(active_ctx)
+        processor._get_term_index(active_ctx)
+        for key, resolved in resolver.per_op_cache.items():
+            tag_map = shared_cache[key] if key in shared_cache else {}
+            tag_map['static'] = resolved
+            shared_cache[key] = tag_map
+        rval.append(active_ctx)
+    return rval
@@ -0,0 +1,51 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from cachetools import LRUCache
+
+__all__ = [
+    'CacheStats', 'StatsLRUCache', 'CACHES',
+    'stats', 'reset_stats', 'clear', 'resize', 'warm',
+]
+
+CACHES: Tuple[str, ...]
+
+
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self) -> None: ...
+    def reset(self) -> None: ...
+
+
+class StatsLRUCache(LRUCache):
+    _maxsize: int
+    stats: CacheStats
+
+    def __init__(self, maxsize: int, stats: Optional[CacheStats] = ...) -> None: ...
+    @property
+    def maxsize(self) -> int: ...
+    def get(self, key: Any, default: Any = ...) -> Any: ...
+    def __setitem__(self, key: Any, value: Any) -> None: ...
+    def _evict(self, size: int) -> None: ...
+    def resize(self, maxsize: int) -> None: ...
+    def peek(self) -> List[Any]: ...
+
+
+def _caches() -> Dict[str, StatsLRUCache]: ...
+def _resolved_contexts() -> List[Any]: ...
+def _check_names(names: Optional[Union[str, Iterable[str]]]) -> List[str]: ...
+def _entry(
+    cache_stats: Optional[CacheStats], currsize: int,
+    maxsize: Optional[int]) -> Dict[str, Any]: ...
+def stats(
+    names: Optional[Union[str, Iterable[str]]] = ...,
+    memory: bool = ...) -> Dict[str, Dict[str, Any]]: ...
+def _sizeof(values: Iterable[Any]) -> int: ...
+def reset_stats(names: Optional[Union[str, Iterable[str]]] = ...) -> None: ...
+def clear(names: Optional[Union[str, Iterable[str]]] = ...) -> None: ...
+def resize(name: str, maxsize: int) -> None: ...
+def warm(
+    urls_or_contexts: Iterable[Any],
+    options: Optional[Dict[str, Any]] = ...) -> List[Any]: ...
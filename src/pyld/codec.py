@@ -0,0 +1,150 @@
+"""
+JSON codec used to parse remote documents, HTML script elements and JSON
+literals.
+
+The first of orjson, ujson and simdjson that can be imported is used, and
+the standard library `json` module otherwise. The `PYLD_JSON_CODEC`
+environment variable or `set_json_codec` select another one.
+"""
+import json
+from importlib import import_module
+from os import getenv
+from typing import Any, Callable, NamedTuple
+
+
+__all__ = ['JsonCodec', 'set_json_codec', 'get_json_codec', 'loads']
+
+
+class JsonCodec(NamedTuple):
+    name: str
+    loads: Callable[[Any], Any]
+
+
+def _orjson(module):
+    return JsonCodec('orjson', module.loads)
+
+
+def _ujson(module):
+    return JsonCodec('ujson', module.loads)
+
+
+def _simdjson(module):
+    return JsonCodec('simdjson', module.loads)
+
+
+STDLIB_CODEC = JsonCodec('json', json.loads)
+
+# maps digits to '0', '.' to itself and any other byte to ' ', to find runs
+# of digits that may be integers too large for 64 bits
+_DIGITS = bytes(
+    48 if 48 <= i <= 57 else i if i == 46 else 32 for i in range(256))
+_LONG_RUN = b'0' * 19
+
+# codec name -> function creating the codec from its module, by preference
+_BACKENDS = {
+    'orjson': _orjson,
+    'ujson': _ujson,
+    'simdjson': _simdjson,
+    'json': lambda module: STDLIB_CODEC,
+}
+
+
+def _may_hold_long_integers(s):
+    """
+    Returns True if a JSON document may hold integers that don't fit in 64
+    bits, which some codecs parse as floats.
+
+    :param s: the JSON document, as str or bytes.
+
+    :return: True if it has a run of 19 digits not preceded by a '.'.
+    """
+    if isinstance(s, str):
+        s = s.encode('utf-8', 'surrogatepass')
+    digits = s.translate(_DIGITS)
+    pos = digits.find(_LONG_RUN)
+    while pos != -1:
+        if pos == 0 or digits[pos - 1] == 32:
+            return True
+        pos = digits.find(_LONG_RUN, pos + 1)
+    return False
+
+
+def _load_codec(name):
+    """
+    Creates a codec from its backend module.
+
+    :param name: the name of the codec.
+
+    :return: the codec, None if its module can't be imported.
+    """
+    try:
+        module = import_module(name)
+    except ImportError:
+        return None
+    return _BACKENDS[name](module)
+
+
+def _default_codec():
+    """
+    Returns the codec named by `PYLD_JSON_CODEC`, or the first available one.
+
+    :return: the codec.
+    """
+    name = getenv('PYLD_JSON_CODEC')
+    if name in _BACKENDS:
+        return _load_codec(name) or STDLIB_CODEC
+    for name in _BACKENDS:
+        codec = _load_codec(name)
+        if codec is not None:
+            return codec
+
+
+_codec = _default_codec()
+
+
+def set_json_codec(codec):
+    """
+    Sets the JSON codec.
+
+    :param codec: the name of a supported codec ('orjson', 'ujson',
+      'simdjson' or 'json'), or a JsonCodec.
+    """
+    global _codec
+    if isinstance(codec, str):
+        if codec not in _BACKENDS:
+            raise ValueError(f'Unknown JSON codec: {codec}')
+        loaded = _load_codec(codec)
+        if loaded is None:
+            raise ImportError(f'JSON codec {codec} is not installed.')
+        codec = loaded
+    _codec = codec
+
+
+def get_json_codec():
+    """
+    Gets the JSON codec.
+
+    :return: the JsonCodec in use.
+    """
+    return _codec
+
+
+def loads(s):
+    """
+    Parses a JSON document with the JSON codec.
+
+    Input that may hold integers that don't fit in 64 bits, and input the
+    codec rejects, such as lone surrogates, is parsed with the standard
+    library instead, so results and errors don't depend on the codec.
+
+    :param s: the JSON document, as str or bytes.
+
+    :return: the parsed value.
+    """
+    codec = _codec
+    if codec is STDLIB_CODEC or _may_hold_long_integers(s):
+        return json.loads(s)
+    try:
+        return codec.loads(s)
+    except Exception:
+        return json.loads(s)
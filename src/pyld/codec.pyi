@@ -0,0 +1,27 @@
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+__all__ = ['JsonCodec', 'set_json_codec', 'get_json_codec', 'loads']
+
+
+class JsonCodec(NamedTuple):
+    name: str
+    loads: Callable[[Any], Any]
+
+
+def _orjson(module: Any) -> JsonCodec: ...
+def _ujson(module: Any) -> JsonCodec: ...
+def _simdjson(module: Any) -> JsonCodec: ...
+
+
+STDLIB_CODEC: JsonCodec
+_DIGITS: bytes
+_LONG_RUN: bytes
+_codec: JsonCodec
+
+
+def _may_hold_long_integers(s: Union[str, bytes]) -> bool: ...
+def _load_codec(name: str) -> Optional[JsonCodec]: ...
+def _default_codec() -> JsonCodec: ...
+def set_json_codec(codec: Union[str, JsonCodec]) -> None: ...
+def get_json_codec() -> JsonCodec: ...
+def loads(s: Union[str, bytes]) -> Any: ...
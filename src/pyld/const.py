@@ -17,6 +17,7 @@ MAX_CONTEXT_URLS = get_intenv('MAX_CONTEXT_URLS', 10)
 MAX_ACTIVE_CONTEXTS = get_intenv('MAX_ACTIVE_CONTEXTS', 10)
 RESOLVED_CONTEXT_CACHE_MAX_SIZE = get_intenv('RESOLVED_CONTEXT_CACHE_MAX_SIZE', 100)
 INVERSE_CONTEXT_CACHE_MAX_SIZE = get_intenv('INVERSE_CONTEXT_CACHE_MAX_SIZE', 20)
+DATATYPE_CACHE_MAX_SIZE = get_intenv('DATATYPE_CACHE_MAX_SIZE', 100)
 
 # XSD constants
 XSD_BOOLEAN = 'http://www.w3.org/2001/XMLSchema#boolean'
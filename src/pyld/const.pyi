@@ -13,6 +13,7 @@ MAX_CONTEXT_URLS: int
 MAX_ACTIVE_CONTEXTS: int
 RESOLVED_CONTEXT_CACHE_MAX_SIZE: int
 INVERSE_CONTEXT_CACHE_MAX_SIZE: int
+DATATYPE_CACHE_MAX_SIZE: int
 XSD_BOOLEAN: str
 XSD_DOUBLE: str
 XSD_INTEGER: str
@@ -7,11 +7,81 @@ Context Resolver for managing remote contexts.
 .. moduleauthor:: Dave Longley
 .. moduleauthor:: Gregg Kellogg <gregg@greggkellogg.net>
 """
-from cachetools import LRUCache
+import json
+
+from .cache import CacheStats, StatsLRUCache
 from .c14n import canonicalize
 from .types import Mapping
 from .exceptions import JsonLdSyntaxError, ContextUrlError, InvalidUrl
-from .const import MAX_CONTEXT_URLS, MAX_ACTIVE_CONTEXTS
+from .const import (
+    MAX_CONTEXT_URLS, MAX_ACTIVE_CONTEXTS, RESOLVED_CONTEXT_CACHE_MAX_SIZE)
+
+
+# id of an inline context -> (snapshot, scalars, cache key), so the cache
+# key of an inline context that is resolved again unchanged is not
+# recomputed; only the JSON snapshots are kept, not the contexts themselves
+_inline_context_keys = StatsLRUCache(RESOLVED_CONTEXT_CACHE_MAX_SIZE)
+
+
+def _scalars(value, path=()):
+    """
+    Finds the booleans and numbers of a JSON value, which `==` does not tell
+    apart: true == 1 == 1.0.
+
+    :param value: the JSON value.
+    :param path: the path of the value.
+
+    :return: a list of (path, type) tuples.
+    """
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    elif isinstance(value, (bool, int, float)):
+        return [(path, type(value))]
+    else:
+        return []
+    return [
+        scalar for k, v in items for scalar in _scalars(v, path + (k,))]
+
+
+def _same_scalars(ctx, scalars):
+    """
+    Checks that the booleans and numbers of a snapshot have the same types
+    in a context equal to it.
+
+    :param ctx: the context.
+    :param scalars: the (path, type) tuples of the snapshot.
+
+    :return: True if every scalar has the same type in the context.
+    """
+    for path, type_ in scalars:
+        value = ctx
+        for k in path:
+            value = value[k]
+        if type(value) is not type_:
+            return False
+    return True
+
+
+def _inline_context_key(ctx):
+    """
+    Returns the cache key of an inline context, its canonical JSON.
+
+    :param ctx: the inline context.
+
+    :return: the cache key.
+    """
+    entry = _inline_context_keys.get(id(ctx))
+    # the snapshot detects changes made to the context since its key was
+    # computed, and other contexts later created with the same id
+    if (entry is not None and entry[0] == ctx and
+            _same_scalars(ctx, entry[1])):
+        return entry[2]
+    key = canonicalize(dict(ctx), utf8=False)
+    snapshot = json.loads(key)
+    _inline_context_keys[id(ctx)] = (snapshot, _scalars(snapshot), key)
+    return key
 
 
 class ResolvedContext:
@@ -19,6 +89,10 @@ class ResolvedContext:
     A cached contex document, with a cache indexed by referencing active
     context.
     """
+    # the size and counters of the caches of all resolved contexts
+    maxsize = MAX_ACTIVE_CONTEXTS
+    stats = CacheStats()
+
     def __init__(self, document):
         """
         Creates a ResolvedContext with caching for processed contexts
@@ -26,32 +100,93 @@ class ResolvedContext:
         """
         # processor-specific RDF parsers
         self.document = document
-        self.cache = LRUCache(maxsize=MAX_ACTIVE_CONTEXTS)
+        self.cache = StatsLRUCache(ResolvedContext.maxsize, ResolvedContext.stats)
+
+    def __setstate__(self, state):
+        # count the hits of unpickled contexts with those of the others
+        self.__dict__.update(state)
+        self.cache.stats = ResolvedContext.stats
+        for value in self.cache.peek():
+            if isinstance(value, StatsLRUCache):
+                value.stats = ResolvedContext.stats
 
-    def get_processed(self, active_ctx):
+    def get_processed(self, active_ctx, base=''):
         """
         Returns any processed context for this resolved context relative
         to an active context.
-        """
-        return self.cache.get(active_ctx['_uuid'])
 
-    def set_processed(self, active_ctx, processed_ctx):
+        :param active_ctx: the active context.
+        :param base: the base IRI the context is processed with, used if
+          the processed context depends on it.
+        """
+        key = active_ctx['_uuid']
+        # only the lookup of the processed context itself is counted
+        per_base = self.cache[key] if key in self.cache else None
+        if isinstance(per_base, StatsLRUCache):
+            return per_base.get(base)
+        return self.cache.get(key)
+
+    def set_processed(self, active_ctx, processed_ctx, base=None):
         """
         Sets any processed context for this resolved context relative to
         an active context.
+
+        :param active_ctx: the active context.
+        :param processed_ctx: the processed context.
+        :param base: the base IRI the context was processed with, None if
+          the processed context does not depend on it.
+        """
+        key = active_ctx['_uuid']
+        if base is None:
+            self.cache[key] = processed_ctx
+            return
+        # contexts with a relative @vocab or @import are kept per base IRI
+        per_base = self.cache[key] if key in self.cache else None
+        if not isinstance(per_base, StatsLRUCache):
+            per_base = StatsLRUCache(
+                ResolvedContext.maxsize, ResolvedContext.stats)
+        per_base[base] = processed_ctx
+        self.cache[key] = per_base
+
+    def processed(self):
+        """
+        Returns the processed contexts of this resolved context, without
+        marking them as recently used.
+
+        :return: the list of processed contexts.
         """
-        self.cache[active_ctx['_uuid']] = processed_ctx
+        rval = []
+        for value in self.cache.peek():
+            if isinstance(value, StatsLRUCache):
+                rval.extend(value.peek())
+            else:
+                rval.append(value)
+        return rval
+
+    def resize(self, maxsize):
+        """
+        Sets the number of processed contexts kept per active context and
+        per base IRI.
+
+        :param maxsize: the maximum number of entries, 0 to disable the
+          cache.
+        """
+        self.cache.resize(maxsize)
+        for value in self.cache.peek():
+            if isinstance(value, StatsLRUCache):
+                value.resize(maxsize)
 
 
 class ContextResolver:
     """
     Resolves and caches remote contexts.
     """
-    def __init__(self, shared_cache, document_loader):
+    def __init__(self, shared_cache, document_loader, profiler=None):
         # processor-specific RDF parsers
         self.per_op_cache = {}
         self.shared_cache = shared_cache
         self.document_loader = document_loader
+        self.profiler = profiler
 
     def resolve(self, active_ctx, context, base, cycles=None):
         """
@@ -79,6 +214,7 @@ class ContextResolver:
         for ctx in context:
             if isinstance(ctx, str):
                 resolved = self._get(ctx)
+                self._count(resolved)
                 if not resolved:
                     resolved = self._resolve_remote_context(
                         active_ctx, ctx, base, cycles)
@@ -95,8 +231,9 @@ class ContextResolver:
                                         context=ctx, code='invalid local context')
             else:
                 # context is an object, get/create `ResolvedContext` for it
-                key = canonicalize(dict(ctx)).decode('UTF-8')
+                key = _inline_context_key(ctx)
                 resolved = self._get(key)
+                self._count(resolved)
                 if not resolved:
                     # create a new static `ResolvedContext` and cache it
                     resolved = ResolvedContext(ctx)
@@ -105,6 +242,16 @@ class ContextResolver:
 
         return all_resolved
 
+    def _count(self, resolved):
+        """
+        Reports a context cache hit or miss to the profiler, if any.
+
+        :param resolved: the context found in the cache, None if it missed.
+        """
+        if self.profiler is not None:
+            self.profiler.count(
+                'context_cache_hits' if resolved else 'context_cache_misses')
+
     def _get(self, key):
         resolved = self.per_op_cache.get(key)
         if not resolved:
@@ -169,7 +316,8 @@ class ContextResolver:
         try:
             remote_doc = load_document(
                 url,
-                {'documentLoader': self.document_loader},
+                {'documentLoader': self.document_loader,
+                 'profiler': self.profiler},
                 requestProfile='http://www.w3.org/ns/json-ld#context',
             )
             context = remote_doc.get('document', url)
@@ -1,60 +1,82 @@
-from collections.abc import Mapping, MutableMapping, Set
-from typing import Any, Optional, List, Dict, Callable, Tuple
-
-
-class ResolvedContext:
-    document: Any
-    cache: MutableMapping[str, Any]
-    def __init__(self, document: Any) -> None: ...
-    def get_processed(self, active_ctx: Any): ...
-    def set_processed(self, active_ctx: Any, processed_ctx: Any) -> None: ...
-
-
-class ContextResolver:
-    per_op_cache: Dict[str, Any]
-    shared_cache: Mapping
-    document_loader: Callable
-
-    def __init__(
-        self,
-        shared_cache: Mapping,
-        document_loader: Callable,
-    ) -> None: ...
-
-    def resolve(
-        self,
-        active_ctx: Any,
-        context: Any,
-        base: Any,
-        cycles: Optional[Set[str]]
-    ) -> List[Any]: ...
-
-    def _get(self, key: Any) -> Any: ...
-
-    def _cache_resolved_context(
-        self,
-        key: Any,
-        resolved: Any,
-        tag: Any,
-    ) -> Any: ...
-
-    def _resolve_remote_context(
-        self,
-        active_ctx: Any,
-        url: Any,
-        base: Any,
-        cycles: Optional[Set[str]],
-    ) -> List[Any]: ...
-
-    def _fetch_context(
-        self,
-        active_ctx: Any,
-        url: str,
-        cycles: Set[str],
-    ) -> Tuple[Dict[str, Any], Dict[str, Any]]: ...
-
-    def _resolve_context_urls(
-        self,
-        context: Mapping[str, Any],
-        base: Any
-    ) -> None: ...
+from collections.abc import Mapping, Set
+from typing import Any, Optional, List, Dict, Callable, Tuple
+
+from .cache import CacheStats, StatsLRUCache
+
+
+_inline_context_keys: StatsLRUCache
+
+
+def _scalars(
+    value: Any, path: Tuple[Any, ...] = ...) -> List[Tuple[Tuple[Any, ...], type]]: ...
+def _same_scalars(
+    ctx: Any, scalars: List[Tuple[Tuple[Any, ...], type]]) -> bool: ...
+def _inline_context_key(ctx: Mapping) -> str: ...
+
+
+class ResolvedContext:
+    maxsize: int
+    stats: CacheStats
+    document: Any
+    cache: StatsLRUCache
+    def __init__(self, document: Any) -> None: ...
+    def __setstate__(self, state: Dict[str, Any]) -> None: ...
+    def get_processed(self, active_ctx: Any, base: str = ...): ...
+    def set_processed(
+        self, active_ctx: Any, processed_ctx: Any,
+        base: Optional[str] = ...) -> None: ...
+    def processed(self) -> List[Any]: ...
+    def resize(self, maxsize: int) -> None: ...
+
+
+class ContextResolver:
+    per_op_cache: Dict[str, Any]
+    shared_cache: Mapping
+    document_loader: Callable
+    profiler: Optional[Any]
+
+    def __init__(
+        self,
+        shared_cache: Mapping,
+        document_loader: Callable,
+        profiler: Optional[Any] = ...,
+    ) -> None: ...
+
+    def resolve(
+        self,
+        active_ctx: Any,
+        context: Any,
+        base: Any,
+        cycles: Optional[Set[str]]
+    ) -> List[Any]: ...
+
+    def _count(self, resolved: Any) -> None: ...
+    def _get(self, key: Any) -> Any: ...
+
+    def _cache_resolved_context(
+        self,
+        key: Any,
+        resolved: Any,
+        tag: Any,
+    ) -> Any: ...
+
+    def _resolve_remote_context(
+        self,
+        active_ctx: Any,
+        url: Any,
+        base: Any,
+        cycles: Optional[Set[str]],
+    ) -> List[Any]: ...
+
+    def _fetch_context(
+        self,
+        active_ctx: Any,
+        url: str,
+        cycles: Set[str],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]: ...
+
+    def _resolve_context_urls(
+        self,
+        context: Mapping[str, Any],
+        base: Any
+    ) -> None: ...
@@ -14,13 +14,7 @@ from urllib.parse import urlparse
 import string
 import re
 
-try:
-    from httpx import AsyncClient, get as http_get
-except ImportError:
-    from requests import get as http_get
-    # TODO: aiohttp failover
-    AsyncClient = None
-
+from .codec import loads
 from .exceptions import JsonLdError, InvalidUrl, LoadDocumentError
 from .jsonld import prepend_base
 from .const import LINK_HEADER_REL
@@ -54,13 +48,55 @@ def validate_url(url, secure=False):
             url=url, code='loading document failed')
 
 
+def _http_get():
+    """
+    Imports the synchronous HTTP client the first time a document is loaded.
+
+    :return: the get function of httpx, or of requests if httpx is not
+      installed.
+    """
+    try:
+        from httpx import get
+    except ImportError:
+        try:
+            from requests import get
+        except ImportError as cause:
+            raise _missing_http_client(cause)
+    return get
+
+
+def _missing_http_client(cause):
+    """
+    Returns the error raised when no HTTP client is installed.
+
+    :param cause: the ImportError of the HTTP client.
+
+    :return: the LoadDocumentError.
+    """
+    return LoadDocumentError(
+        'httpx (or requests) is required to load remote documents; '
+        'install pyld[http]',
+        code='loading document failed', cause=cause)
+
+
+def _count_size(profiler, response):
+    """
+    Reports the size in bytes of a response to a profiler.
+
+    :param profiler: the profiler, None if there is none.
+    :param response: the HTTP response.
+    """
+    if profiler is not None:
+        profiler.count('document_size', len(response.content))
+
+
 def parse_response(response, url):
     content_type = response.headers.get('content-type') or 'application/octet-stream'
 
     doc = dict(contentType=content_type,
                contextUrl=None,
                documentUrl=str(response.url),
-               document=response.json())
+               document=loads(response.content))
 
     link_header = response.headers.get('link')
     if link_header:
@@ -111,7 +147,8 @@ def sync_document_loader(secure=False, **kwargs):
             validate_url(url, secure=secure)
             options = options or {}
             headers = options.get('headers', BASE_HEADERS)
-            response = http_get(url, headers=headers, **kwargs)
+            response = _http_get()(url, headers=headers, **kwargs)
+            _count_size(options.get('profiler'), response)
 
             return parse_response(response, url)
 
@@ -140,19 +177,28 @@ def async_document_loader(loop=None, secure=False, **kwargs):
     if loop is None:
         loop = asyncio.get_event_loop()
 
-    async def async_loader(url, headers):
+    async def async_loader(url, headers, profiler):
         """
         Retrieves JSON-LD at the given URL asynchronously.
 
         :param url: the URL to retrieve.
+        :param headers: the HTTP headers of the request.
+        :param profiler: the profiler to report the response size to, None
+          if there is none.
 
         :return: the RemoteDocument.
         """
         try:
             validate_url(url, secure=secure)
+            # TODO: aiohttp failover
+            try:
+                from httpx import AsyncClient
+            except ImportError as cause:
+                raise _missing_http_client(cause)
 
             async with AsyncClient() as session:
                 response = await session.get(url, headers=headers, **kwargs)
+                _count_size(profiler, response)
 
                 return parse_response(response, url)
 
@@ -172,7 +218,9 @@ def async_document_loader(loop=None, secure=False, **kwargs):
 
         :return: the RemoteDocument.
         """
-        headers = (options or {}).get('headers', BASE_HEADERS)
-        return loop.run_until_complete(async_loader(url, headers=headers))
+        options = options or {}
+        headers = options.get('headers', BASE_HEADERS)
+        return loop.run_until_complete(async_loader(
+            url, headers=headers, profiler=options.get('profiler')))
 
     return loader
@@ -1,8 +1,10 @@
-from typing import Any, Callable
-from httpx import Response
-
-Loader = Callable[[str, dict[str, Any]], dict[str, Any]]
-def validate_url(url: str, secure: bool) -> None: ...
-def parse_response(response: Response, url: str) -> dict[str, Any]: ...
-def sync_document_loader(secure: bool, **kwargs: Any) -> Loader: ...
-def async_document_loader(loop: Any, secure: bool, **kwargs: Any) -> Loader: ...
+from typing import Any, Callable
+from httpx import Response
+
+Loader = Callable[[str, dict[str, Any]], dict[str, Any]]
+def validate_url(url: str, secure: bool) -> None: ...
+def _http_get() -> Callable[..., Response]: ...
+def _count_size(profiler: Any, response: Response) -> None: ...
+def parse_response(response: Response, url: str) -> dict[str, Any]: ...
+def sync_document_loader(secure: bool, **kwargs: Any) -> Loader: ...
+def async_document_loader(loop: Any, secure: bool, **kwargs: Any) -> Loader: ...
@@ -25,6 +25,17 @@ class JsonLdError(Exception):
             rval += ''.join(traceback.format_list(self.causeTrace))
         return rval
 
+    def __reduce__(self):
+        # args holds the error itself, so it cannot be used to rebuild it
+        return _restore_error, (self.__class__, self.args[1:], self.__dict__)
+
+
+def _restore_error(cls, args, state):
+    error = cls.__new__(cls)
+    error.args = (error,) + args
+    error.__dict__.update(state)
+    return error
+
 
 class JsonLdSyntaxError(JsonLdError):
     type = 'jsonld.SyntaxError'
@@ -96,3 +107,7 @@ class UnknownFormat(JsonLdError):
 
 class UnsupportedVersion(JsonLdError):
     type = 'jsonld.UnsupportedVersion'
+
+
+class WorkerError(JsonLdError):
+    type = 'jsonld.WorkerError'
@@ -15,6 +15,8 @@ class JsonLdError(Exception):
         **kwargs: Any
     ) -> None: ...
 
+    def __reduce__(self) -> Any: ...
+
 
 class JsonLdException(JsonLdError):
     type: str
@@ -39,3 +41,4 @@ class ProcessingModeConflict(JsonLdException): ...
 class RdfError(JsonLdException): ...
 class UnknownFormat(JsonLdException): ...
 class UnsupportedVersion(JsonLdException): ...
+class WorkerError(JsonLdException): ...
@@ -15,17 +15,19 @@ JSON-LD.
 """
 
 import copy
-import json
+import pickle
 import re
 import warnings
 import uuid
-from functools import cmp_to_key
+from functools import cmp_to_key, lru_cache
 from numbers import Integral, Real
 
 from cachetools import LRUCache
-import lxml.html
 
 from .c14n import canonicalize
+from .cache import StatsLRUCache
+from .codec import (
+    JsonCodec, loads as json_loads, set_json_codec, get_json_codec)
 from .context_resolver import ContextResolver
 from .exceptions import (
     JsonLdError, CompactError, CyclicalContext, FlattenError,
@@ -33,11 +35,13 @@ from .exceptions import (
     NormalizeError, NullRemoteDocument, ProcessingModeConflict, RdfError,
     UnknownFormat, UnsupportedVersion,
 )
-from .types import frozendict, IdentifierIssuer, Mapping
+from .types import (
+    frozendict, CompiledFrame, IdentifierIssuer, Mapping, QuadColumns)
 from .const import (
     __copyright__, __license__, __version__,
     KEYWORDS, JSONLD_VERSION,
     RESOLVED_CONTEXT_CACHE_MAX_SIZE, INVERSE_CONTEXT_CACHE_MAX_SIZE,
+    DATATYPE_CACHE_MAX_SIZE, MAX_ACTIVE_CONTEXTS,
     XSD_BOOLEAN, XSD_DOUBLE, XSD_INTEGER, XSD_STRING,
     RDF_LIST, RDF_FIRST, RDF_REST, RDF_NIL, RDF_TYPE, RDF_LANGSTRING, RDF_JSON_LITERAL,
 )
@@ -46,22 +50,36 @@ from .parse import (
     parse_url, unparse_url, parse_nquads, to_nquads
 )
 from .normalization import URDNA2015, URGNA2012
+from .profiler import Profiler, phase
 
 
 __all__ = [
     '__copyright__', '__license__', '__version__',
     'compact', 'expand', 'flatten', 'frame', 'link', 'from_rdf', 'to_rdf',
-    'normalize', 'set_document_loader', 'get_document_loader',
+    'normalize', 'dumps_context', 'loads_context', 'iter_expand', 'iter_frame',
+    'compile_frame',
+    'compact_many', 'expand_many', 'flatten_many', 'to_rdf_many',
+    'set_document_loader', 'get_document_loader',
+    'set_json_codec', 'get_json_codec', 'JsonCodec',
     'load_document', 'sync_document_loader', 'async_document_loader',
     'register_rdf_parser', 'unregister_rdf_parser',
-    'JsonLdProcessor', 'JsonLdError', 'ContextResolver',
+    'JsonLdProcessor', 'JsonLdError', 'ContextResolver', 'CompiledFrame',
+    'QuadColumns', 'Profiler',
 ]
 
 
 # resolved context cache
 # TODO: consider basing max on context size rather than number
-_resolved_context_cache = LRUCache(maxsize=RESOLVED_CONTEXT_CACHE_MAX_SIZE)
-_inverse_context_cache = LRUCache(maxsize=INVERSE_CONTEXT_CACHE_MAX_SIZE)
+# (see pyld.cache for their statistics and management)
+_resolved_context_cache = StatsLRUCache(RESOLVED_CONTEXT_CACHE_MAX_SIZE)
+_inverse_context_cache = StatsLRUCache(INVERSE_CONTEXT_CACHE_MAX_SIZE)
+_term_index_cache = StatsLRUCache(INVERSE_CONTEXT_CACHE_MAX_SIZE)
+# i18n datatype IRI -> (language, direction, valid language)
+_i18n_datatype_cache = StatsLRUCache(DATATYPE_CACHE_MAX_SIZE)
+_i18n_datatype_separators = re.compile(r'[#_]').split
+# datatypes converted by the useNativeTypes option
+_NATIVE_TYPES = (XSD_BOOLEAN, XSD_INTEGER, XSD_DOUBLE)
+_BOOLEANS = {'true': True, 'false': False}
 # Initial contexts, defined on first access
 INITIAL_CONTEXTS = {}
 
@@ -112,6 +130,20 @@ def expand(input_, options=None):
     return JsonLdProcessor().expand(input_, options)
 
 
+def iter_expand(input_, options=None):
+    """
+    Performs JSON-LD expansion, yielding the expanded node objects of a
+    top-level array or @graph one by one.
+
+    :param input_: the JSON-LD input to expand, or an iterator over the
+      members of a top-level array.
+    :param [options]: the options to use (see `expand`).
+
+    :return: an iterator over the expanded JSON-LD output.
+    """
+    return JsonLdProcessor().iter_expand(input_, options)
+
+
 def flatten(input_, ctx=None, options=None):
     """
     Performs JSON-LD flattening.
@@ -126,6 +158,9 @@ def flatten(input_, ctx=None, options=None):
         (default: True).
       [processingMode] Either 'json-ld-1.0' or 'json-ld-1.1',
         (default: 'json-ld-1.1').
+      [ordered] True to output nodes and properties in lexicographical
+        order, False to keep the order they are found in, which is faster
+        but not deterministic (default: True).
       [documentLoader(url, options)] the document loader
         (default: _default_document_loader).
 
@@ -139,7 +174,8 @@ def frame(input_, frame, options=None):
     Performs JSON-LD framing.
 
     :param input_: the JSON-LD input to frame.
-    :param frame: the JSON-LD frame to use.
+    :param frame: the JSON-LD frame to use, or a frame compiled with
+      `compile_frame`.
     :param [options]: the options to use.
       [base] the base IRI to use.
       [expandContext] a context to expand with.
@@ -150,6 +186,9 @@ def frame(input_, frame, options=None):
         (default: '@last').
       [explicit] default @explicit flag (default: False).
       [omitDefault] default @omitDefault flag (default: False).
+      [ordered] True to output nodes and properties in lexicographical
+        order, False to keep the order they are found in, which is faster
+        but not deterministic (default: True).
       [processingMode] Either 'json-ld-1.0' or 'json-ld-1.1',
         defaults to 'json-ld-1.1'.
       [pruneBlankNodeIdentifiers] remove unnecessary blank node identifiers
@@ -163,6 +202,50 @@ def frame(input_, frame, options=None):
     return JsonLdProcessor().frame(input_, frame, options)
 
 
+def iter_frame(input_, frame, options=None):
+    """
+    Performs JSON-LD framing, yielding each top-level framed object as soon
+    as it is complete.
+
+    :param input_: the JSON-LD input to frame.
+    :param frame: the JSON-LD frame to use.
+    :param [options]: the options to use (see `frame`).
+
+    :return: an iterator over the framed JSON-LD objects, each with its own
+      @context.
+    """
+    return JsonLdProcessor().iter_frame(input_, frame, options)
+
+
+def compile_frame(frame, options=None):
+    """
+    Compiles a JSON-LD frame to use it to frame many inputs: the frame is
+    dereferenced, expanded and validated, and its context processed, only
+    once.
+
+    The framing flags (embed, explicit, omitDefault and requireAll) are
+    resolved with the options given here, they are not taken from the
+    options given to `frame` or `iter_frame`.
+
+    :param frame: the JSON-LD frame to compile.
+    :param [options]: the options to use.
+      [base] the base IRI to expand the frame with (default: '').
+      [expandContext] a context to expand with.
+      [embed] default @embed flag: '@last', '@always', '@never', '@link'
+        (default: '@last').
+      [explicit] default @explicit flag (default: False).
+      [omitDefault] default @omitDefault flag (default: False).
+      [processingMode] Either 'json-ld-1.0' or 'json-ld-1.1',
+        defaults to 'json-ld-1.1'.
+      [requireAll] default @requireAll flag (default: False).
+      [documentLoader(url, options)] the document loader
+        (default: _default_document_loader).
+
+    :return: the compiled frame.
+    """
+    return JsonLdProcessor().compile_frame(frame, options)
+
+
 def link(input_, ctx, options=None):
     """
     **Experimental**
@@ -233,6 +316,9 @@ def from_rdf(input_, options=None):
       [useRdfType] True to use rdf:type, False to use @type (default: False).
       [useNativeTypes] True to convert XSD types into native types
         (boolean, integer, double), False not to (default: True).
+      [ordered] True to output nodes and properties in lexicographical
+        order, False to keep the order they are found in, which is faster
+        but not deterministic (default: True).
 
     :return: the JSON-LD output.
     """
@@ -247,7 +333,8 @@ def to_rdf(input_, options=None):
     :param [options]: the options to use.
       [base] the base IRI to use.
       [format] the format to use to output a string:
-        'application/n-quads' for N-Quads.
+        'application/n-quads' for N-Quads, or 'columnar' to output a
+        `QuadColumns` table instead of a dataset.
       [produceGeneralizedRdf] true to output generalized RDF, false
         to produce only standard RDF (default: false).
       [extractAllScripts] True to extract all JSON-LD script elements
@@ -258,12 +345,151 @@ def to_rdf(input_, options=None):
       [documentLoader(url, options)] the document loader
         (default: _default_document_loader).
       [rdfDirection] Only 'i18n-datatype' supported.
+      [ordered] True to output nodes and properties in lexicographical
+        order, False to keep the order they are found in, which is faster
+        but not deterministic (default: True).
 
     :return: the resulting RDF dataset (or a serialization of it).
     """
     return JsonLdProcessor().to_rdf(input_, options)
 
 
+def compact_many(inputs, ctx, options=None):
+    """
+    Performs JSON-LD compaction on each of the given inputs, processing the
+    context only once.
+
+    :param inputs: an iterable of JSON-LD inputs to compact.
+    :param ctx: the JSON-LD context to compact with.
+    :param [options]: the options to use (see `compact`).
+
+    :return: an iterator over the compacted JSON-LD outputs, in input order.
+    """
+    return JsonLdProcessor().compact_many(inputs, ctx, options)
+
+
+def expand_many(inputs, options=None):
+    """
+    Performs JSON-LD expansion on each of the given inputs.
+
+    :param inputs: an iterable of JSON-LD inputs to expand.
+    :param [options]: the options to use (see `expand`).
+
+    :return: an iterator over the expanded JSON-LD outputs, in input order.
+    """
+    return JsonLdProcessor().expand_many(inputs, options)
+
+
+def flatten_many(inputs, ctx=None, options=None):
+    """
+    Performs JSON-LD flattening on each of the given inputs, processing the
+    context only once.
+
+    :param inputs: an iterable of JSON-LD inputs to flatten.
+    :param ctx: the JSON-LD context to compact with (default: None).
+    :param [options]: the options to use (see `flatten`).
+
+    :return: an iterator over the flattened JSON-LD outputs, in input order.
+    """
+    return JsonLdProcessor().flatten_many(inputs, ctx, options)
+
+
+def to_rdf_many(inputs, options=None):
+    """
+    Outputs the RDF dataset found in each of the given JSON-LD inputs.
+
+    :param inputs: an iterable of JSON-LD inputs.
+    :param [options]: the options to use (see `to_rdf`).
+
+    :return: an iterator over the resulting RDF datasets (or their
+      serializations), in input order.
+    """
+    return JsonLdProcessor().to_rdf_many(inputs, options)
+
+
+def dumps_context(ctx, options=None):
+    """
+    Processes a JSON-LD context and serializes the resulting active context,
+    its inverse context and every context resolved while processing it, so
+    that they can be restored with `loads_context` in another process.
+
+    :param ctx: the JSON-LD context to process.
+    :param [options]: the options to use.
+      [base] the base IRI to use.
+      [processingMode] Either 'json-ld-1.0' or 'json-ld-1.1',
+        defaults to 'json-ld-1.1'.
+      [documentLoader(url, options)] the document loader
+        (default: _default_document_loader).
+
+    :return: the serialized context.
+    """
+    options = options.copy() if options else {}
+    options.setdefault('base', '')
+    options.setdefault('documentLoader', _default_document_loader)
+    options.setdefault('processingMode', JSONLD_VERSION)
+    # use a private resolver so that only the contexts used are recorded
+    resolver = ContextResolver(
+        {}, options['documentLoader'], options.get('profiler'))
+    options['contextResolver'] = resolver
+
+    processor = JsonLdProcessor()
+    initial_ctx = processor._get_initial_context(options)
+    active_ctx = processor.process_context(initial_ctx, ctx, options)
+
+    return pickle.dumps({
+        'version': __version__,
+        'processingMode': options['processingMode'],
+        'initialUuid': initial_ctx['_uuid'],
+        'activeCtx': active_ctx,
+        'inverse': processor._get_inverse_context(active_ctx),
+        'termIndex': processor._get_term_index(active_ctx),
+        'resolved': resolver.per_op_cache,
+    }, pickle.HIGHEST_PROTOCOL)
+
+
+def loads_context(data):
+    """
+    Restores a context serialized with `dumps_context` into the context
+    caches, so that later operations using the same context (or the same
+    context URLs) neither fetch nor process it again.
+
+    Note: the data is unpickled, only load data from a trusted source.
+
+    :param data: the serialized context.
+
+    :return: the processed active context.
+    """
+    artifact = pickle.loads(data)
+    if artifact.get('version') != __version__:
+        raise UnsupportedVersion(
+            'Serialized context was created by another version of PyLD.',
+            version=artifact.get('version'))
+
+    initial_ctx = JsonLdProcessor()._get_initial_context(
+        {'processingMode': artifact['processingMode']})
+    old_uuid = artifact['initialUuid']
+
+    for key, resolved in artifact['resolved'].items():
+        for resolved_context in JsonLdProcessor.arrayify(resolved):
+            # contexts processed against the initial context of the
+            # serializing process are keyed by that context's uuid
+            processed = resolved_context.cache.pop(old_uuid, None)
+            if processed is not None:
+                resolved_context.set_processed(initial_ctx, processed)
+        tag_map = (
+            _resolved_context_cache[key]
+            if key in _resolved_context_cache else {})
+        tag_map['static'] = resolved
+        _resolved_context_cache[key] = tag_map
+
+    active_ctx = artifact['activeCtx']
+    if active_ctx['_uuid'] == old_uuid:
+        return initial_ctx
+    _inverse_context_cache[active_ctx['_uuid']] = artifact['inverse']
+    _term_index_cache[active_ctx['_uuid']] = artifact['termIndex']
+    return active_ctx
+
+
 def set_document_loader(load_document_):
     """
     Sets the default JSON-LD document loader.
@@ -522,6 +748,8 @@ class JsonLdProcessor:
             defaults to 'json-ld-1.1'.
           [documentLoader(url, options)] the document loader
             (default: _default_document_loader).
+          [profiler] an object receiving the phases and counters of the
+            operation (see `pyld.profiler.Profiler`).
 
         :return: the compacted JSON-LD output.
         """
@@ -542,8 +770,9 @@ class JsonLdProcessor:
         options.setdefault('skipExpansion', False)
         options.setdefault('activeCtx', False)
         options.setdefault('documentLoader', _default_document_loader)
-        options.setdefault('contextResolver',
-            ContextResolver(_resolved_context_cache, options['documentLoader']))
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
         options.setdefault('extractAllScripts', False)
         options.setdefault('processingMode', JSONLD_VERSION)
         options.setdefault('link', False)
@@ -572,59 +801,7 @@ class JsonLdProcessor:
                 'Could not process context before compaction.',
                 cause=e)
 
-        # do compaction
-        compacted = self._compact(active_ctx, None, expanded, options)
-
-        if (options['compactArrays'] and not options['graph'] and
-                _is_array(compacted)):
-            # simplify to a single item
-            if len(compacted) == 1:
-                compacted = compacted[0]
-            # simplify to an empty object
-            elif len(compacted) == 0:
-                compacted = {}
-        # always use an array if graph options is on
-        elif options['graph']:
-            compacted = JsonLdProcessor.arrayify(compacted)
-
-        # follow @context key
-        if _is_object(ctx) and '@context' in ctx:
-            ctx = ctx['@context']
-
-        # build output context
-        ctx = JsonLdProcessor.arrayify(ctx)
-
-        # remove empty contexts
-        tmp = ctx
-        ctx = []
-        for v in tmp:
-            if not _is_object(v) or len(v) > 0:
-                ctx.append(v)
-
-        # remove array if only one context
-        ctx_length = len(ctx)
-        has_context = (ctx_length > 0)
-        if ctx_length == 1:
-            ctx = ctx[0]
-
-        # add context and/or @graph
-        if _is_array(compacted):
-            # use '@graph' keyword
-            kwgraph = self._compact_iri(active_ctx, '@graph')
-            graph = compacted
-            compacted = {}
-            if has_context:
-                compacted['@context'] = ctx
-            compacted[kwgraph] = graph
-        elif _is_object(compacted) and has_context:
-            # reorder keys so @context is first
-            graph = compacted
-            compacted = {}
-            compacted['@context'] = ctx
-            for k, v in graph.items():
-                compacted[k] = v
-
-        return compacted
+        return self._compact_document(expanded, ctx, active_ctx, options)
 
     def expand(self, input_, options):
         """
@@ -642,6 +819,8 @@ class JsonLdProcessor:
           [processingMode] Either 'json-ld-1.0' or 'json-ld-1.1',
             defaults to 'json-ld-1.1'.
           [documentLoader(url, options)] the document loader.
+          [profiler] an object receiving the phases and counters of the
+            operation (see `pyld.profiler.Profiler`).
 
         :return: the expanded JSON-LD output.
         """
@@ -650,62 +829,19 @@ class JsonLdProcessor:
         options.setdefault('isFrame', False)
         options.setdefault('keepFreeFloatingNodes', False)
         options.setdefault('documentLoader', _default_document_loader)
-        options.setdefault('contextResolver',
-            ContextResolver(_resolved_context_cache, options['documentLoader']))
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
         options.setdefault('extractAllScripts', False)
         options.setdefault('processingMode', JSONLD_VERSION)
 
-        # if input is a string, attempt to dereference remote document
-        if _is_string(input_):
-            remote_doc = load_document(input_, options)
-        else:
-            remote_doc = {
-                'contextUrl': None,
-                'documentUrl': None,
-                'document': input_
-            }
-
-        try:
-            if remote_doc['document'] is None:
-                raise NullRemoteDocument
-        except Exception as e:
-            raise LoadDocumentError(
-                'Could not retrieve a JSON-LD document from the URL.',
-                remoteDoc=remote_doc, code='loading document failed',
-                cause=e)
-
-        # set default base
-        options.setdefault('base', remote_doc['documentUrl'] or '')
-
-        # build meta-object and retrieve all @context urls
-        input_ = {
-            'document': copy.deepcopy(remote_doc['document']),
-            'remoteContext': remote_doc['contextUrl']
-        }
-        if 'expandContext' in options:
-            expand_context = options['expandContext']
-            if _is_object(expand_context) and '@context' in expand_context:
-                input_['expandContext'] = expand_context['@context']
-            else:
-                input_['expandContext'] = expand_context
-
-        active_ctx = self._get_initial_context(options)
-        document = input_['document']
-        remote_context = input_['remoteContext']
-
-        # process optional expandContext
-        if 'expandContext' in input_:
-            active_ctx = self.process_context(
-                active_ctx, input_['expandContext'], options)
-
-        # process remote context from HTTP Link Header
-        if remote_context is not None:
-            active_ctx = self.process_context(
-                active_ctx, remote_context, options)
+        document, active_ctx = self._load_expansion_input(input_, options)
+        document = copy.deepcopy(document)
 
         # do expansion
-        expanded = self._expand(
-            active_ctx, None, document, options, inside_list=False)
+        with phase(options.get('profiler'), 'expand'):
+            expanded = self._expand(
+                active_ctx, None, document, options, inside_list=False)
 
         # optimize away @graph with no other properties
         if (_is_object(expanded) and '@graph' in expanded and
@@ -717,6 +853,74 @@ class JsonLdProcessor:
         # normalize to an array
         return JsonLdProcessor.arrayify(expanded)
 
+    def iter_expand(self, input_, options):
+        """
+        Performs JSON-LD expansion, yielding the expanded node objects one by
+        one instead of building the whole output.
+
+        The members of a top-level array, or of a top-level @graph when it is
+        the only property besides @context, are expanded independently with
+        the context processed once. Any other document is expanded at once.
+        The input may also be an iterator over the members of a top-level
+        array, e.g. one produced by an incremental JSON parser, so that it
+        is never loaded entirely into memory.
+
+        :param input_: the JSON-LD input to expand.
+        :param options: the options to use (see `expand`).
+
+        :return: an iterator over the expanded JSON-LD output.
+        """
+        # set default options
+        options = options.copy() if options else {}
+        options.setdefault('isFrame', False)
+        options.setdefault('keepFreeFloatingNodes', False)
+        options.setdefault('documentLoader', _default_document_loader)
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
+        options.setdefault('extractAllScripts', False)
+        options.setdefault('processingMode', JSONLD_VERSION)
+
+        document, active_ctx = self._load_expansion_input(input_, options)
+
+        # find a top-level @graph with no other properties
+        active_property = None
+        if _is_object(document):
+            graph_ctx = self._revert_to_previous_context(active_ctx)
+            if '@context' in document:
+                graph_ctx = self._process_context(
+                    graph_ctx, document['@context'], options)
+            keys = [k for k in document if k != '@context']
+            if (len(keys) == 1 and
+                    (_is_array(document[keys[0]]) or
+                        _is_object(document[keys[0]])) and
+                    self._expand_iri(
+                        graph_ctx, keys[0], vocab=True) == '@graph'):
+                active_ctx = graph_ctx
+                active_property = keys[0]
+                document = JsonLdProcessor.arrayify(document[keys[0]])
+
+        # expand any other document at once
+        if (active_property is None and not _is_array(document) and
+                not hasattr(document, '__next__')):
+            expanded = self._expand(
+                active_ctx, None, copy.deepcopy(document), options,
+                inside_list=False)
+            # optimize away @graph with no other properties
+            if (_is_object(expanded) and '@graph' in expanded and
+                    len(expanded) == 1):
+                expanded = expanded['@graph']
+            elif expanded is None:
+                expanded = []
+            yield from JsonLdProcessor.arrayify(expanded)
+            return
+
+        # expand each member on its own
+        for member in document:
+            yield from self._expand(
+                active_ctx, active_property, [copy.deepcopy(member)],
+                options, inside_list=False)
+
     def flatten(self, input_, ctx, options):
         """
         Performs JSON-LD flattening.
@@ -731,18 +935,25 @@ class JsonLdProcessor:
             from HTML, False to extract just the first.
           [processingMode] Either 'json-ld-1.0' or 'json-ld-1.1',
             defaults to 'json-ld-1.1'.
+          [ordered] True to output nodes and properties in lexicographical
+            order, False to keep the order they are found in, which is faster
+            but not deterministic (default: True).
           [documentLoader(url, options)] the document loader
             (default: _default_document_loader).
+          [profiler] an object receiving the phases and counters of the
+            operation (see `pyld.profiler.Profiler`).
 
         :return: the flattened JSON-LD output.
         """
         options = options.copy() if options else {}
         options.setdefault('base', input_ if _is_string(input_) else '')
         options.setdefault('documentLoader', _default_document_loader)
-        options.setdefault('contextResolver',
-            ContextResolver(_resolved_context_cache, options['documentLoader']))
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
         options.setdefault('extractAllScripts', True)
         options.setdefault('processingMode', JSONLD_VERSION)
+        options.setdefault('ordered', True)
 
         try:
             # expand input
@@ -751,7 +962,7 @@ class JsonLdProcessor:
             raise FlattenError('Could not expand input before flattening.', cause=e)
 
         # do flattening
-        flattened = self._flatten(expanded)
+        flattened = self._flatten(expanded, options)
 
         if ctx is None:
             return flattened
@@ -782,6 +993,9 @@ class JsonLdProcessor:
             (default: '@last').
           [explicit] default @explicit flag (default: False).
           [omitDefault] default @omitDefault flag (default: False).
+          [ordered] True to output nodes and properties in lexicographical
+            order, False to keep the order they are found in, which is faster
+            but not deterministic (default: True).
           [omitGraph] does not use '@graph' at top level unless necessary
             to describe multiple objects.
             defaults to True if processingMode is 1.1, otherwise False.
@@ -792,6 +1006,8 @@ class JsonLdProcessor:
           [requireAll] default @requireAll flag (default: False).
           [documentLoader(url, options)] the document loader
             (default: _default_document_loader).
+          [profiler] an object receiving the phases and counters of the
+            operation (see `pyld.profiler.Profiler`).
 
         :return: the framed JSON-LD output.
         """
@@ -803,100 +1019,102 @@ class JsonLdProcessor:
         options.setdefault('explicit', False)
         options.setdefault('omitDefault', False)
         options.setdefault('requireAll', False)
+        options.setdefault('ordered', True)
         options.setdefault('bnodesToClear', [])
         options.setdefault('documentLoader', _default_document_loader)
-        options.setdefault('contextResolver',
-            ContextResolver(_resolved_context_cache, options['documentLoader']))
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
         options.setdefault('extractAllScripts', False)
         options.setdefault('processingMode', JSONLD_VERSION)
 
-        # if frame is a string, attempt to dereference remote document
-        if _is_string(frame):
-            remote_frame = load_document(frame, options)
-        else:
-            remote_frame = {
-                'contextUrl': None,
-                'documentUrl': None,
-                'document': frame
-            }
-
-        try:
-            if remote_frame['document'] is None:
-                raise NullRemoteDocument
-        except Exception as e:
-            raise LoadDocumentError(
-                'Could not retrieve a JSON-LD document from the URL.',
-                remoteDoc=remote_frame,
-                code='loading document failed',
-                cause=e)
-
-        # preserve frame context
-        frame = remote_frame['document']
-        if frame is not None:
-            ctx = frame.get('@context', {})
-            if remote_frame['contextUrl'] is not None:
-                if ctx is not None:
-                    ctx = remote_frame['contextUrl']
-                else:
-                    ctx = JsonLdProcessor.arrayify(ctx)
-                    ctx.append(remote_frame['contextUrl'])
-                frame['@context'] = ctx
-
-        # process context
-        active_ctx = self._get_initial_context(options)
-        frame_ctx = frame.get('@context', {}) if frame else {}
-        try:
-            active_ctx = self.process_context(active_ctx, frame_ctx, options)
-        except JsonLdError as e:
-            raise FrameError('Could not process context before framing.', cause=e)
-
-        # mode specific defaluts
-        if 'omitGraph' not in options:
-            options['omitGraph'] = self._processing_mode(active_ctx, 1.1)
-        if 'pruneBlankNodeIdentifiers' not in options:
-            options['pruneBlankNodeIdentifiers'] = self._processing_mode(active_ctx, 1.1)
-
-        try:
-            # expand input
-            expanded = self.expand(input_, options)
-        except JsonLdError as e:
-            raise FrameError('Could not expand input before framing.', cause=e)
-
-        try:
-            # expand frame
-            opts = dict(options)
-            opts['isFrame'] = True
-            opts['keepFreeFloatingNodes'] = True
-            expanded_frame = self.expand(frame, opts)
-        except JsonLdError as e:
-            raise FrameError('Could not expand frame before framing.', cause=e)
-
-        # if the unexpanded frame includes a key expanding to @graph, frame the
-        # default graph, otherwise, the merged graph
-        frame_keys = [self._expand_iri(active_ctx, key) for key in frame.keys()]
-        options['merged'] = '@graph' not in frame_keys
-        options['is11'] = self._processing_mode(active_ctx, 1.1)
+        expanded, expanded_frame, ctx, active_ctx = self._load_frame_input(
+            input_, frame, options)
 
         # do framing
         framed = self._frame(expanded, expanded_frame, options)
 
-        # remove @preserve from results
-        options['link'] = {}
-        framed = self._cleanup_preserve(framed, options)
+        return self._frame_output(framed, ctx, active_ctx, options)
 
-        try:
-            # compact result (force @graph option to True, skip expansion,
-            # check for linked embeds)
-            options['graph'] = not options['omitGraph']
-            options['skipExpansion'] = True
-            options['framing'] = True
-            options['link'] = {}
-            result = self.compact(framed, ctx, options)
-        except JsonLdError as e:
-            raise FrameError('Could not compact framed output.', cause=e)
+    def iter_frame(self, input_, frame, options):
+        """
+        Performs JSON-LD framing, yielding each top-level framed object,
+        compacted with the frame context, as soon as it is complete.
 
-        options['link'] = {}
-        return self._cleanup_null(result, options)
+        Each object is output as a separate JSON-LD document: it has its own
+        @context, blank node identifiers are pruned within each object and
+        omitGraph does not apply.
+
+        :param input_: the JSON-LD object to frame.
+        :param frame: the JSON-LD frame to use.
+        :param options: the options to use (see `frame`).
+
+        :return: an iterator over the framed JSON-LD objects.
+        """
+        # set default options
+        options = options.copy() if options else {}
+        options.setdefault('base', input_ if _is_string(input_) else '')
+        options.setdefault('compactArrays', True)
+        options.setdefault('embed', '@once')
+        options.setdefault('explicit', False)
+        options.setdefault('omitDefault', False)
+        options.setdefault('requireAll', False)
+        options.setdefault('ordered', True)
+        options.setdefault('bnodesToClear', [])
+        options.setdefault('documentLoader', _default_document_loader)
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
+        options.setdefault('extractAllScripts', False)
+        options.setdefault('processingMode', JSONLD_VERSION)
+
+        expanded, expanded_frame, ctx, active_ctx = self._load_frame_input(
+            input_, frame, options)
+        options['omitGraph'] = True
+
+        # frame and output each top-level object
+        for framed in self._iter_frame(expanded, expanded_frame, options):
+            yield self._frame_output([framed], ctx, active_ctx, options)
+
+    def compile_frame(self, frame, options):
+        """
+        Compiles a JSON-LD frame to use it to frame many inputs.
+
+        :param frame: the JSON-LD frame to compile.
+        :param options: the options to use (see `compile_frame`).
+
+        :return: the compiled frame.
+        """
+        # set default options
+        options = options.copy() if options else {}
+        options.setdefault('base', '')
+        options.setdefault('embed', '@once')
+        options.setdefault('explicit', False)
+        options.setdefault('omitDefault', False)
+        options.setdefault('requireAll', False)
+        options.setdefault('documentLoader', _default_document_loader)
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
+        options.setdefault('extractAllScripts', False)
+        options.setdefault('processingMode', JSONLD_VERSION)
+
+        frame, ctx, active_ctx = self._load_frame(frame, options)
+        expanded_frame = self._expand_frame(frame, active_ctx, options)
+
+        # validate the frame and resolve the flags of it and its sub-frames
+        state = {'options': options, 'frameFlags': {}}
+        self._get_frame_flags(state, expanded_frame)
+        self._resolve_frame_flags(state, expanded_frame)
+
+        return CompiledFrame(
+            expanded_frame, ctx, active_ctx,
+            frozendict({
+                name: options[name] for name in (
+                    'embed', 'explicit', 'omitDefault', 'requireAll',
+                    'merged', 'is11')
+            }),
+            state['frameFlags'])
 
     def normalize(self, input_, options):
         """
@@ -915,6 +1133,8 @@ class JsonLdProcessor:
           [format] the format if output is a string:
             'application/n-quads' for N-Quads.
           [documentLoader(url, options)] the document loader.
+          [profiler] an object receiving the phases and counters of the
+            operation (see `pyld.profiler.Profiler`).
 
         :return: the normalized output.
         """
@@ -923,8 +1143,9 @@ class JsonLdProcessor:
         options.setdefault('algorithm', 'URGNA2012')
         options.setdefault('base', input_ if _is_string(input_) else '')
         options.setdefault('documentLoader', _default_document_loader)
-        options.setdefault('contextResolver',
-            ContextResolver(_resolved_context_cache, options['documentLoader']))
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
         options.setdefault('extractAllScripts', True)
         options.setdefault('processingMode', JSONLD_VERSION)
 
@@ -969,6 +1190,11 @@ class JsonLdProcessor:
           [useNativeTypes] True to convert XSD types into native types
             (boolean, integer, double), False not to (default: False).
           [rdfDirection] Only 'i18n-datatype' is supported. (default: None)
+          [ordered] True to output nodes and properties in lexicographical
+            order, False to keep the order they are found in, which is faster
+            but not deterministic (default: True).
+          [profiler] an object receiving the phases and counters of the
+            operation (see `pyld.profiler.Profiler`).
 
         :return: the JSON-LD output.
         """
@@ -979,6 +1205,7 @@ class JsonLdProcessor:
         options.setdefault('useRdfType', False)
         options.setdefault('useNativeTypes', False)
         options.setdefault('rdfDirection', None)
+        options.setdefault('ordered', True)
 
         if ('format' not in options) and _is_string(dataset):
             options['format'] = 'application/n-quads'
@@ -999,7 +1226,12 @@ class JsonLdProcessor:
             dataset = parser(dataset)
 
         # convert from RDF
-        return self._from_rdf(dataset, options)
+        profiler = options.get('profiler')
+        with phase(profiler, 'from_rdf'):
+            if profiler is not None:
+                profiler.count(
+                    'quads', sum(len(triples) for triples in dataset.values()))
+            return self._from_rdf(dataset, options)
 
     def to_rdf(self, input_, options):
         """
@@ -1010,12 +1242,18 @@ class JsonLdProcessor:
           [base] the base IRI to use.
           [contextResolver] internal use only.
           [format] the format if input is a string:
-            'application/n-quads' for N-Quads.
+            'application/n-quads' for N-Quads, or 'columnar' to output a
+            `QuadColumns` table instead of a dataset.
           [produceGeneralizedRdf] true to output generalized RDF, false
             to produce only standard RDF.
           [documentLoader(url, options)] the document loader.
           [rdfDirection] Only 'i18n-datatype' supported
             (default: None).
+          [ordered] True to output nodes and properties in lexicographical
+            order, False to keep the order they are found in, which is faster
+            but not deterministic (default: True).
+          [profiler] an object receiving the phases and counters of the
+            operation (see `pyld.profiler.Profiler`).
 
         :return: the resulting RDF dataset (or a serialization of it).
         """
@@ -1024,10 +1262,12 @@ class JsonLdProcessor:
         options.setdefault('base', input_ if _is_string(input_) else '')
         options.setdefault('produceGeneralizedRdf', False)
         options.setdefault('documentLoader', _default_document_loader)
-        options.setdefault('contextResolver',
-            ContextResolver(_resolved_context_cache, options['documentLoader']))
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
         options.setdefault('extractAllScripts', True)
         options.setdefault('processingMode', JSONLD_VERSION)
+        options.setdefault('ordered', True)
 
         try:
             # expand input
@@ -1036,25 +1276,231 @@ class JsonLdProcessor:
             raise RdfError('Could not expand input before serialization to RDF.',
                            cause=e)
 
-        # create node map for default graph (and any named graphs)
-        issuer = IdentifierIssuer('_:b')
-        node_map = {'@default': {}}
-        self._create_node_map(expanded, node_map, '@default', issuer)
+        return self._to_rdf(expanded, options)
 
-        # output RDF dataset
-        dataset = {}
-        for graph_name, graph in sorted(node_map.items()):
-            # skip relative IRIs
-            if graph_name == '@default' or _is_absolute_iri(graph_name):
-                dataset[graph_name] = self._graph_to_rdf(
-                    graph, issuer, options)
+    def compact_many(self, inputs, ctx, options):
+        """
+        Performs JSON-LD compaction on each of the given inputs. The context
+        is processed, and its inverse built, only once and the same context
+        resolver is shared by every document.
 
-        # convert to output format
-        if 'format' in options:
-            if options['format'] in {'application/n-quads', 'application/nquads'}:
-                return to_nquads(dataset)
-            raise UnknownFormat('Unknown output format.', format=options['format'])
-        return dataset
+        :param inputs: an iterable of JSON-LD inputs to compact.
+        :param ctx: the context to compact with.
+        :param options: the options to use (see `compact`). If [base] is not
+          set, each string input is used as its own base IRI.
+
+        :return: an iterator over the compacted JSON-LD outputs, in input
+          order.
+        """
+        if ctx is None:
+            raise CompactError(
+                'The compaction context must not be null.',
+                code='invalid local context')
+
+        # set default options
+        options = options.copy() if options else {}
+        options.setdefault('compactArrays', True)
+        options.setdefault('graph', False)
+        options.setdefault('skipExpansion', False)
+        options.setdefault('activeCtx', False)
+        options.setdefault('documentLoader', _default_document_loader)
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
+        options.setdefault('extractAllScripts', False)
+        options.setdefault('processingMode', JSONLD_VERSION)
+        options.setdefault('link', False)
+
+        # process context once per base IRI, starting with the given one
+        active_ctxs = LRUCache(maxsize=MAX_ACTIVE_CONTEXTS)
+        try:
+            self._batch_context(ctx, options, active_ctxs)
+        except JsonLdError as e:
+            raise CompactError(
+                'Could not process context before compaction.',
+                cause=e)
+
+        def compact_all():
+            for input_ in inputs:
+                # nothing to compact
+                if input_ is None:
+                    yield None
+                    continue
+
+                opts = options.copy()
+                opts.setdefault('base', input_ if _is_string(input_) else '')
+                if opts['skipExpansion']:
+                    expanded = input_
+                else:
+                    # expand input
+                    try:
+                        expanded = self.expand(input_, opts)
+                    except JsonLdError as e:
+                        raise CompactError(
+                            'Could not expand input before compaction.',
+                            cause=e)
+
+                try:
+                    active_ctx = self._batch_context(ctx, opts, active_ctxs)
+                except JsonLdError as e:
+                    raise CompactError(
+                        'Could not process context before compaction.',
+                        cause=e)
+
+                yield self._compact_document(expanded, ctx, active_ctx, opts)
+
+        return compact_all()
+
+    def expand_many(self, inputs, options):
+        """
+        Performs JSON-LD expansion on each of the given inputs, sharing the
+        same context resolver between every document.
+
+        :param inputs: an iterable of JSON-LD inputs to expand.
+        :param options: the options to use (see `expand`).
+
+        :return: an iterator over the expanded JSON-LD outputs, in input
+          order.
+        """
+        # set default options
+        options = options.copy() if options else {}
+        options.setdefault('isFrame', False)
+        options.setdefault('keepFreeFloatingNodes', False)
+        options.setdefault('documentLoader', _default_document_loader)
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
+        options.setdefault('extractAllScripts', False)
+        options.setdefault('processingMode', JSONLD_VERSION)
+
+        return (self.expand(input_, options) for input_ in inputs)
+
+    def flatten_many(self, inputs, ctx, options):
+        """
+        Performs JSON-LD flattening on each of the given inputs. If a context
+        is given, it is processed, and its inverse built, only once and the
+        same context resolver is shared by every document.
+
+        :param inputs: an iterable of JSON-LD inputs to flatten.
+        :param ctx: the JSON-LD context to compact with (default: None).
+        :param options: the options to use (see `flatten`). If [base] is
+          not set, each string input is used as its own base IRI.
+
+        :return: an iterator over the flattened JSON-LD outputs, in input
+          order.
+        """
+        # set default options
+        options = options.copy() if options else {}
+        options.setdefault('documentLoader', _default_document_loader)
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
+        options.setdefault('extractAllScripts', True)
+        options.setdefault('processingMode', JSONLD_VERSION)
+        options.setdefault('ordered', True)
+
+        # process context once per base IRI, starting with the given one
+        active_ctxs = LRUCache(maxsize=MAX_ACTIVE_CONTEXTS)
+        if ctx is not None:
+            try:
+                self._batch_context(ctx, options, active_ctxs)
+            except JsonLdError as e:
+                raise FlattenError(
+                    'Could not process context before compaction.', cause=e)
+
+        def flatten_all():
+            for input_ in inputs:
+                opts = options.copy()
+                opts.setdefault('base', input_ if _is_string(input_) else '')
+
+                try:
+                    # expand input
+                    expanded = self.expand(input_, opts)
+                except Exception as e:
+                    raise FlattenError(
+                        'Could not expand input before flattening.', cause=e)
+
+                # do flattening
+                flattened = self._flatten(expanded, opts)
+
+                if ctx is None:
+                    yield flattened
+                    continue
+
+                # compact result (force @graph option to true)
+                opts.setdefault('compactArrays', True)
+                opts.setdefault('link', False)
+                opts['graph'] = True
+                try:
+                    active_ctx = self._batch_context(ctx, opts, active_ctxs)
+                    yield self._compact_document(
+                        flattened, ctx, active_ctx, opts)
+                except JsonLdError as e:
+                    raise FlattenError(
+                        'Could not compact flattened output.', cause=e)
+
+        return flatten_all()
+
+    def to_rdf_many(self, inputs, options):
+        """
+        Outputs the RDF dataset found in each of the given JSON-LD inputs,
+        sharing the same context resolver between every document.
+
+        :param inputs: an iterable of JSON-LD inputs.
+        :param options: the options to use (see `to_rdf`). If [base] is not
+          set, each string input is used as its own base IRI.
+
+        :return: an iterator over the resulting RDF datasets (or their
+          serializations), in input order.
+        """
+        # set default options
+        options = options.copy() if options else {}
+        options.setdefault('produceGeneralizedRdf', False)
+        options.setdefault('documentLoader', _default_document_loader)
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
+        options.setdefault('extractAllScripts', True)
+        options.setdefault('processingMode', JSONLD_VERSION)
+        options.setdefault('ordered', True)
+
+        def to_rdf_all():
+            for input_ in inputs:
+                opts = options.copy()
+                opts.setdefault('base', input_ if _is_string(input_) else '')
+
+                try:
+                    # expand input
+                    expanded = self.expand(input_, opts)
+                except JsonLdError as e:
+                    raise RdfError(
+                        'Could not expand input before serialization to RDF.',
+                        cause=e)
+
+                yield self._to_rdf(expanded, opts)
+
+        return to_rdf_all()
+
+    def _batch_context(self, ctx, options, active_ctxs):
+        """
+        Processes the context of a batch operation for the base IRI of an
+        input, unless it was already processed for that base IRI.
+
+        :param ctx: the context to process.
+        :param options: the options of the input.
+        :param active_ctxs: the active contexts processed so far, by base
+          IRI.
+
+        :return: the active context.
+        """
+        base = options.get('base', '')
+        active_ctx = active_ctxs.get(base)
+        if active_ctx is None:
+            active_ctx = self.process_context(
+                self._get_initial_context(options), ctx, options)
+            self._get_inverse_context(active_ctx)
+            active_ctxs[base] = active_ctx
+        return active_ctx
 
     def process_context(self, active_ctx, local_ctx, options):
         """
@@ -1078,8 +1524,9 @@ class JsonLdProcessor:
         options = options.copy() if options else {}
         options.setdefault('base', '')
         options.setdefault('documentLoader', _default_document_loader)
-        options.setdefault('contextResolver',
-            ContextResolver(_resolved_context_cache, options['documentLoader']))
+        options.setdefault('contextResolver', ContextResolver(
+            _resolved_context_cache, options['documentLoader'],
+            options.get('profiler')))
 
         return self._process_context(active_ctx, local_ctx, options)
 
@@ -1168,6 +1615,9 @@ class JsonLdProcessor:
           [allowDuplicate] True to allow duplicates, False not to (uses
             a simple shallow comparison of subject ID or value)
             (default: True).
+          [valueIndex] a dict, shared by every call adding values to the
+            same subjects, indexing the values already added so that
+            duplicates are found without scanning them (default: None).
         """
         options.setdefault('propertyIsArray', False)
         options.setdefault('valueIsArray', False)
@@ -1183,9 +1633,13 @@ class JsonLdProcessor:
                 JsonLdProcessor.add_value(subject, property, v, options)
         elif property in subject:
             # check if subject already has value if duplicates not allowed
-            has_value = (
-                    not options['allowDuplicate'] and
-                    JsonLdProcessor.has_value(subject, property, value))
+            if options['allowDuplicate']:
+                has_value = False
+            elif options.get('valueIndex') is not None:
+                has_value = JsonLdProcessor._has_indexed_value(
+                    options['valueIndex'], subject, property, value)
+            else:
+                has_value = JsonLdProcessor.has_value(subject, property, value)
 
             # make property an array if value not present or always an array
             if (not _is_array(subject[property]) and
@@ -1200,6 +1654,38 @@ class JsonLdProcessor:
             subject[property] = (
                 [value] if options['propertyIsArray'] else value)
 
+    @staticmethod
+    def _has_indexed_value(index, subject, prop, value):
+        """
+        Determines if the given value is a property of the given subject using
+        an index of the values of each subject property. The value is added
+        to the index when it is not found, as it is about to be added to the
+        subject.
+
+        :param index: the index, mapping subject ids to the keys of the
+          values of each property.
+        :param subject: the subject to check.
+        :param prop: the property to check.
+        :param value: the value to check.
+
+        :return: `True` if the value exists.
+        """
+        key = _value_key(value)
+        values = subject[prop]
+        if key is None or not _is_array(values):
+            return JsonLdProcessor.has_value(subject, prop, value)
+
+        # index the values added before the index was used
+        keys = index.setdefault(id(subject), {}).get(prop)
+        if keys is None:
+            keys = index[id(subject)][prop] = {
+                k for k in map(_value_key, values) if k is not None}
+
+        if key in keys:
+            return True
+        keys.add(key)
+        return False
+
     @staticmethod
     def get_values(subject, prop):
         """
@@ -1356,17 +1842,337 @@ class JsonLdProcessor:
 
         :return: True if the triples are the same, False if not.
         """
-        for attr in ['subject', 'predicate', 'object']:
-            if(t1[attr]['type'] != t2[attr]['type'] or
-                    t1[attr]['value'] != t2[attr]['value']):
-                return False
+        for attr in ['subject', 'predicate', 'object']:
+            if(t1[attr]['type'] != t2[attr]['type'] or
+                    t1[attr]['value'] != t2[attr]['value']):
+                return False
+
+        if t1['object'].get('language') != t2['object'].get('language'):
+            return False
+        if t1['object'].get('datatype') != t2['object'].get('datatype'):
+            return False
+
+        return True
+
+    def _load_expansion_input(self, input_, options):
+        """
+        Retrieves the document to expand and builds the active context to
+        expand it with from the expandContext option and any remote context
+        from an HTTP Link Header. Sets the default base in options.
+
+        :param input_: the JSON-LD input to expand.
+        :param options: the expansion options.
+
+        :return: the document (not copied) and the active context.
+        """
+        # if input is a string, attempt to dereference remote document
+        if _is_string(input_):
+            remote_doc = load_document(input_, options)
+        else:
+            remote_doc = {
+                'contextUrl': None,
+                'documentUrl': None,
+                'document': input_
+            }
+
+        try:
+            if remote_doc['document'] is None:
+                raise NullRemoteDocument
+        except Exception as e:
+            raise LoadDocumentError(
+                'Could not retrieve a JSON-LD document from the URL.',
+                remoteDoc=remote_doc, code='loading document failed',
+                cause=e)
+
+        # set default base
+        options.setdefault('base', remote_doc['documentUrl'] or '')
+
+        active_ctx = self._get_initial_context(options)
+
+        # process optional expandContext
+        if 'expandContext' in options:
+            expand_context = options['expandContext']
+            if _is_object(expand_context) and '@context' in expand_context:
+                expand_context = expand_context['@context']
+            active_ctx = self.process_context(
+                active_ctx, expand_context, options)
+
+        # process remote context from HTTP Link Header
+        if remote_doc['contextUrl'] is not None:
+            active_ctx = self.process_context(
+                active_ctx, remote_doc['contextUrl'], options)
+
+        return remote_doc['document'], active_ctx
+
+    def _load_frame_input(self, input_, frame, options):
+        """
+        Retrieves and expands the input and the frame to use for framing,
+        and processes the frame context. Sets the framing mode options.
+
+        :param input_: the JSON-LD input to frame.
+        :param frame: the JSON-LD frame to use, or a compiled frame.
+        :param options: the framing options.
+
+        :return: the expanded input, the expanded frame, the frame context
+          and the active context processed from it.
+        """
+        compiled = isinstance(frame, CompiledFrame)
+        if compiled:
+            # use the framing flags and modes the frame was compiled with
+            options.update(frame.options)
+            options['frameFlags'] = frame.flags
+            is11 = self._processing_mode(frame.active_ctx, 1.1)
+            options.setdefault('omitGraph', is11)
+            options.setdefault('pruneBlankNodeIdentifiers', is11)
+            expanded_frame = frame.frame
+            # the output references the context, don't share it
+            ctx = copy.deepcopy(frame.context)
+            active_ctx = frame.active_ctx
+        else:
+            frame, ctx, active_ctx = self._load_frame(frame, options)
+
+        try:
+            # expand input
+            expanded = self.expand(input_, options)
+        except JsonLdError as e:
+            raise FrameError('Could not expand input before framing.', cause=e)
+
+        if not compiled:
+            expanded_frame = self._expand_frame(frame, active_ctx, options)
+
+        return expanded, expanded_frame, ctx, active_ctx
+
+    def _load_frame(self, frame, options):
+        """
+        Retrieves the frame to use for framing and processes its context.
+        Sets the mode specific framing options.
+
+        :param frame: the JSON-LD frame to use.
+        :param options: the framing options.
+
+        :return: the frame, the frame context and the active context
+          processed from it.
+        """
+        # if frame is a string, attempt to dereference remote document
+        if _is_string(frame):
+            remote_frame = load_document(frame, options)
+        else:
+            remote_frame = {
+                'contextUrl': None,
+                'documentUrl': None,
+                'document': frame
+            }
+
+        try:
+            if remote_frame['document'] is None:
+                raise NullRemoteDocument
+        except Exception as e:
+            raise LoadDocumentError(
+                'Could not retrieve a JSON-LD document from the URL.',
+                remoteDoc=remote_frame,
+                code='loading document failed',
+                cause=e)
+
+        # preserve frame context
+        frame = remote_frame['document']
+        if frame is not None:
+            ctx = frame.get('@context', {})
+            if remote_frame['contextUrl'] is not None:
+                if ctx is not None:
+                    ctx = remote_frame['contextUrl']
+                else:
+                    ctx = JsonLdProcessor.arrayify(ctx)
+                    ctx.append(remote_frame['contextUrl'])
+                frame['@context'] = ctx
+
+        # process context
+        active_ctx = self._get_initial_context(options)
+        frame_ctx = frame.get('@context', {}) if frame else {}
+        try:
+            active_ctx = self.process_context(active_ctx, frame_ctx, options)
+        except JsonLdError as e:
+            raise FrameError('Could not process context before framing.', cause=e)
+
+        # mode specific defaluts
+        if 'omitGraph' not in options:
+            options['omitGraph'] = self._processing_mode(active_ctx, 1.1)
+        if 'pruneBlankNodeIdentifiers' not in options:
+            options['pruneBlankNodeIdentifiers'] = self._processing_mode(active_ctx, 1.1)
+
+        return frame, ctx, active_ctx
+
+    def _expand_frame(self, frame, active_ctx, options):
+        """
+        Expands the frame to use for framing. Sets the framing mode options
+        that depend on the frame.
+
+        :param frame: the JSON-LD frame to use.
+        :param active_ctx: the active context processed from the frame
+          context.
+        :param options: the framing options.
+
+        :return: the expanded frame.
+        """
+        try:
+            # expand frame
+            opts = dict(options)
+            opts['isFrame'] = True
+            opts['keepFreeFloatingNodes'] = True
+            expanded_frame = self.expand(frame, opts)
+        except JsonLdError as e:
+            raise FrameError('Could not expand frame before framing.', cause=e)
+
+        # if the unexpanded frame includes a key expanding to @graph, frame the
+        # default graph, otherwise, the merged graph
+        frame_keys = [self._expand_iri(active_ctx, key) for key in frame.keys()]
+        options['merged'] = '@graph' not in frame_keys
+        options['is11'] = self._processing_mode(active_ctx, 1.1)
+
+        return expanded_frame
+
+    def _frame_output(self, framed, ctx, active_ctx, options):
+        """
+        Removes @preserve, compacts and replaces @null in framed output in a
+        single traversal.
+
+        :param framed: the framed output.
+        :param ctx: the frame context.
+        :param active_ctx: the active context processed from ctx.
+        :param options: the framing options.
+
+        :return: the framed JSON-LD output.
+        """
+        try:
+            if ctx is None:
+                raise CompactError(
+                    'The compaction context must not be null.',
+                    code='invalid local context')
+
+            # compact result (force @graph option to True, skip expansion,
+            # check for linked embeds); in framing mode compaction also
+            # removes @preserve, unreferenced bnode ids and @null as it goes
+            options['graph'] = not options['omitGraph']
+            options['skipExpansion'] = True
+            options['framing'] = True
+            options['link'] = {}
+            options['bnodesToClear'] = set(options['bnodesToClear'])
+            options['cleaned'] = {}
+            result = self._compact_document(framed, ctx, active_ctx, options)
+        except JsonLdError as e:
+            raise FrameError('Could not compact framed output.', cause=e)
+
+        # replace @null in the top-level object built around the output
+        result = self._cleanup_null(result, options)
+        options['cleaned'] = {}
+        return result
+
+    def _compact_document(self, expanded, ctx, active_ctx, options):
+        """
+        Compacts an expanded document using an already processed context and
+        builds the top-level output object.
+
+        :param expanded: the expanded JSON-LD input.
+        :param ctx: the context the active context was processed from.
+        :param active_ctx: the processed active context.
+        :param options: the compaction options.
+
+        :return: the compacted JSON-LD output.
+        """
+        # do compaction
+        with phase(options.get('profiler'), 'compact'):
+            compacted = self._compact(active_ctx, None, expanded, options)
+
+        if (options['compactArrays'] and not options['graph'] and
+                _is_array(compacted)):
+            # simplify to a single item
+            if len(compacted) == 1:
+                compacted = compacted[0]
+            # simplify to an empty object
+            elif len(compacted) == 0:
+                compacted = {}
+        # always use an array if graph options is on
+        elif options['graph']:
+            compacted = JsonLdProcessor.arrayify(compacted)
+
+        # follow @context key
+        if _is_object(ctx) and '@context' in ctx:
+            ctx = ctx['@context']
+
+        # build output context
+        ctx = JsonLdProcessor.arrayify(ctx)
+
+        # remove empty contexts
+        tmp = ctx
+        ctx = []
+        for v in tmp:
+            if not _is_object(v) or len(v) > 0:
+                ctx.append(v)
+
+        # remove array if only one context
+        ctx_length = len(ctx)
+        has_context = (ctx_length > 0)
+        if ctx_length == 1:
+            ctx = ctx[0]
+
+        # add context and/or @graph
+        if _is_array(compacted):
+            # use '@graph' keyword
+            kwgraph = self._compact_iri(active_ctx, '@graph')
+            graph = compacted
+            compacted = {}
+            if has_context:
+                compacted['@context'] = ctx
+            compacted[kwgraph] = graph
+        elif _is_object(compacted) and has_context:
+            # reorder keys so @context is first
+            graph = compacted
+            compacted = {}
+            compacted['@context'] = ctx
+            for k, v in graph.items():
+                compacted[k] = v
+
+        return compacted
+
+    def _to_rdf(self, expanded, options):
+        """
+        Outputs the RDF dataset found in an expanded JSON-LD document.
+
+        :param expanded: the expanded JSON-LD input.
+        :param options: the RDF serialization options.
+
+        :return: the resulting RDF dataset (or a serialization of it).
+        """
+        # create node map for default graph (and any named graphs)
+        issuer = IdentifierIssuer('_:b')
+        node_map = {'@default': {}}
+        self._create_top_node_map(expanded, node_map, issuer, options)
 
-        if t1['object'].get('language') != t2['object'].get('language'):
-            return False
-        if t1['object'].get('datatype') != t2['object'].get('datatype'):
-            return False
+        # output RDF dataset
+        profiler = options.get('profiler')
+        columnar = options.get('format') == 'columnar'
+        dataset = QuadColumns() if columnar else {}
+        with phase(profiler, 'to_rdf'):
+            for graph_name, graph in _ordered_items(
+                    node_map, options['ordered']):
+                # skip relative IRIs
+                if graph_name == '@default' or _is_absolute_iri(graph_name):
+                    if columnar:
+                        # write triples straight into the columns
+                        self._graph_to_rdf(
+                            graph, issuer, options, dataset.sink(graph_name))
+                    else:
+                        dataset[graph_name] = self._graph_to_rdf(
+                            graph, issuer, options)
+            if profiler is not None:
+                profiler.count('quads', len(dataset) if columnar else sum(
+                    len(triples) for triples in dataset.values()))
 
-        return True
+        # convert to output format
+        if 'format' in options and not columnar:
+            if options['format'] in {'application/n-quads', 'application/nquads'}:
+                return to_nquads(dataset)
+            raise UnknownFormat('Unknown output format.', format=options['format'])
+        return dataset
 
     def _compact(self, active_ctx, active_property, element, options):
         """
@@ -1384,9 +2190,17 @@ class JsonLdProcessor:
         # recursively compact array
         if _is_array(element):
             rval = []
+            framing = options.get('framing')
             for e in element:
+                preserved = False
+                if framing:
+                    e, preserved = self._cleanup_preserve(e, options)
+                    # compact preserved default values as is
+                    options['framing'] = not preserved
                 # compact, dropping any None values
                 e = self._compact(active_ctx, active_property, e, options)
+                if preserved:
+                    options['framing'] = True
                 if e is not None:
                     rval.append(e)
             if options['compactArrays'] and len(rval) == 1:
@@ -1439,6 +2253,7 @@ class JsonLdProcessor:
 
             # FIXME: avoid misuse of active property as an expanded property?
             inside_reverse = (active_property == '@reverse')
+            framing = options.get('framing')
 
             rval = {}
 
@@ -1613,6 +2428,11 @@ class JsonLdProcessor:
 
                 # recusively process array values
                 for expanded_item in expanded_value:
+                    preserved = False
+                    if framing:
+                        expanded_item, preserved = self._cleanup_preserve(
+                            expanded_item, options)
+
                     # compact property and get container type
                     item_active_property = self._compact_iri(
                         active_ctx, expanded_property, expanded_item,
@@ -1642,10 +2462,15 @@ class JsonLdProcessor:
                     elif is_graph:
                         inner_ = expanded_item['@graph']
 
-                    # recursively compact expanded item
+                    # recursively compact expanded item (preserved default
+                    # values as is)
+                    if preserved:
+                        options['framing'] = False
                     compacted_item = self._compact(
                         active_ctx, item_active_property,
                         inner_ if (is_list or is_graph) else expanded_item, options)
+                    if preserved:
+                        options['framing'] = True
 
                     # handle @list
                     if is_list:
@@ -1806,6 +2631,12 @@ class JsonLdProcessor:
                             nest_result, item_active_property, compacted_item,
                             {'propertyIsArray': is_array})
 
+            if framing:
+                # replace @null in the values added to this object only, the
+                # compacted nested objects have already been cleaned up
+                rval = self._cleanup_null(rval, options)
+                options['cleaned'][id(rval)] = rval
+
             return rval
 
         # only primitives remain which are already compact
@@ -2408,18 +3239,19 @@ class JsonLdProcessor:
                     type_key=type_key,
                     type_scoped_ctx=type_scoped_ctx)
 
-    def _flatten(self, input):
+    def _flatten(self, input, options):
         """
         Performs JSON-LD flattening.
 
         :param input_: the expanded JSON-LD to flatten.
+        :param options: the flattening options.
 
         :return: the flattened JSON-LD output.
         """
         # produce a map of all subjects and label each bnode
         issuer = IdentifierIssuer('_:b')
         graphs = {'@default': {}}
-        self._create_node_map(input, graphs, '@default', issuer)
+        self._create_top_node_map(input, graphs, issuer, options)
 
         # add all non-default graphs to default graph
         default_graph = graphs['@default']
@@ -2429,11 +3261,12 @@ class JsonLdProcessor:
             graph_subject = default_graph.setdefault(
                 graph_name, {'@id': graph_name, '@graph': []})
             graph_subject.setdefault('@graph', []).extend(
-                [v for k, v in sorted(node_map.items())
+                [v for k, v in _ordered_items(node_map, options['ordered'])
                     if not _is_subject_reference(v)])
 
         # produce flattened output
-        return [value for key, value in sorted(default_graph.items())
+        return [value for key, value in
+                _ordered_items(default_graph, options['ordered'])
                 if not _is_subject_reference(value)]
 
     def _frame(self, input_, frame, options):
@@ -2446,6 +3279,73 @@ class JsonLdProcessor:
 
         :return: the framed output.
         """
+        state = self._create_frame_state(input_, options)
+
+        # frame the subjects
+        framed = []
+        with phase(options.get('profiler'), 'frame_match'):
+            self._match_frame(
+                state, self._get_graph_subjects(state, state['graph']), frame,
+                framed, None)
+
+        # if pruning blank nodes, find those to prune
+        if options['pruneBlankNodeIdentifiers']:
+            options['bnodesToClear'].extend(
+                [id_ for id_ in state['bnodeMap'].keys() if len(state['bnodeMap'][id_]) == 1])
+
+        return framed
+
+    def _iter_frame(self, input_, frame, options):
+        """
+        Performs JSON-LD framing, yielding each top-level framed object as
+        soon as it is complete. Blank node identifiers to prune are found
+        within each object and set in the bnodesToClear option before it is
+        yielded.
+
+        :param input_: the expanded JSON-LD to frame.
+        :param frame: the expanded JSON-LD frame to use.
+        :param options: the framing options.
+
+        :return: an iterator over the framed top-level objects.
+        """
+        state = self._create_frame_state(input_, options)
+
+        # only frame the subjects that may match
+        flags = self._get_frame_flags(state, frame)
+        candidates = self._get_frame_candidates(state, frame[0], flags)
+
+        for id_ in self._get_graph_subjects(state, state['graph']):
+            if candidates is not None and id_ not in candidates:
+                continue
+
+            # frame the subject on its own, but match @included against
+            # every subject of the graph as framing all subjects does
+            framed = []
+            state['bnodeMap'] = {}
+            with phase(options.get('profiler'), 'frame_match'):
+                self._match_frame(
+                    state, [id_], frame, framed, None,
+                    self._get_graph_subjects(state, state['graph']))
+            if not framed:
+                continue
+
+            # if pruning blank nodes, find those to prune
+            if options['pruneBlankNodeIdentifiers']:
+                options['bnodesToClear'] = [
+                    bnode for bnode, outputs in state['bnodeMap'].items()
+                    if len(outputs) == 1]
+
+            yield framed[0]
+
+    def _create_frame_state(self, input_, options):
+        """
+        Creates the framing state, with the node map of the input.
+
+        :param input_: the expanded JSON-LD to frame.
+        :param options: the framing options.
+
+        :return: the framing state.
+        """
         # create framing state
         state = {
             'options': options,
@@ -2455,28 +3355,24 @@ class JsonLdProcessor:
             'graphStack': [],
             'subjectStack': [],
             'link': {},
-            'bnodeMap': {}
+            'bnodeMap': {},
+            'frameIndexes': {},
+            'frameItems': {},
+            'frameFlags': dict(options.get('frameFlags', {})),
+            'implicitFrames': {},
+            'graphSubjects': {},
+            'nodeItems': {}
         }
 
         # produce a map of all graphs and name each bnode
         issuer = IdentifierIssuer('_:b')
-        self._create_node_map(input_, state['graphMap'], '@default', issuer)
+        self._create_top_node_map(input_, state['graphMap'], issuer, options)
         if options['merged']:
-            state['graphMap']['@merged'] = self._merge_node_map_graphs(state['graphMap'])
+            state['graphMap']['@merged'] = self._merge_node_map_graphs(
+                state['graphMap'], options['ordered'])
             state['graph'] = '@merged'
         state['subjects'] = state['graphMap'][state['graph']]
-
-        # frame the subjects
-        framed = []
-        self._match_frame(
-            state, sorted(state['subjects'].keys()), frame, framed, None)
-
-        # if pruning blank nodes, find those to prune
-        if options['pruneBlankNodeIdentifiers']:
-            options['bnodesToClear'].extend(
-                [id_ for id_ in state['bnodeMap'].keys() if len(state['bnodeMap'][id_]) == 1])
-
-        return framed
+        return state
 
     def _from_rdf(self, dataset, options):
         """
@@ -2489,13 +3385,29 @@ class JsonLdProcessor:
         """
         default_graph = {}
         graph_map = {'@default': default_graph}
+        # object -> (node, property, value) of its only reference, False if
+        # it is referenced more than once
         referenced_once = {}
+        # graph name -> the (node, property, value) references to rdf:nil
+        nil_usages = {}
+        # graph name -> the rdf:first and rdf:rest counts of each subject and
+        # the subjects with any other property, used to detect well-formed
+        # list nodes without probing them
+        list_index = {}
+        use_rdf_type = options.get('useRdfType', False)
+        use_native_types = options['useNativeTypes']
+        rdf_direction = options['rdfDirection']
+        native_values = (
+            _native_literals(dataset) if use_native_types else None)
 
         for name, graph in dataset.items():
             graph_map.setdefault(name, {})
             if name != '@default' and name not in default_graph:
                 default_graph[name] = {'@id': name}
             node_map = graph_map[name]
+            usages = nil_usages.setdefault(name, [])
+            firsts, rests, others = list_index.setdefault(
+                name, ({}, {}, set()))
             for triple in graph:
                 # get subject, predicate, object
                 s = triple['subject']['value']
@@ -2510,13 +3422,23 @@ class JsonLdProcessor:
                 if object_is_id and o['value'] not in node_map:
                     node_map[o['value']] = {'@id': o['value']}
 
-                if (p == RDF_TYPE and not options.get('useRdfType', False) and
-                        object_is_id):
+                if p == RDF_TYPE and not use_rdf_type and object_is_id:
                     JsonLdProcessor.add_value(
                         node, '@type', o['value'], {'propertyIsArray': True})
+                    # a list node may only be typed as rdf:List
+                    if o['value'] != RDF_LIST or len(node['@type']) > 1:
+                        others.add(s)
                     continue
 
-                value = self._rdf_to_object(o, options['useNativeTypes'], options['rdfDirection'])
+                if p == RDF_FIRST:
+                    firsts[s] = firsts.get(s, 0) + 1
+                elif p == RDF_REST:
+                    rests[s] = rests.get(s, 0) + 1
+                else:
+                    others.add(s)
+
+                value = self._rdf_to_object(
+                    o, use_native_types, rdf_direction, native_values)
                 JsonLdProcessor.add_value(
                     node, p, value, {'propertyIsArray': True})
 
@@ -2525,39 +3447,19 @@ class JsonLdProcessor:
                 if object_is_id:
                     # track rdf:nil uniquely per graph
                     if o['value'] == RDF_NIL:
-                        object = node_map[o['value']]
-                        if 'usages' not in object:
-                            object['usages'] = []
-                        object['usages'].append({
-                            'node': node,
-                            'property': p,
-                            'value': value
-                        })
+                        usages.append((node, p, value))
                     # object referenced more than once
                     elif o['value'] in referenced_once:
                         referenced_once[o['value']] = False
                     # track single reference
                     else:
-                        referenced_once[o['value']] = {
-                            'node': node,
-                            'property': p,
-                            'value': value
-                        }
+                        referenced_once[o['value']] = (node, p, value)
 
         # convert linked lists to @list arrays
         for name, graph_object in graph_map.items():
-            # no @lists to be converted, continue
-            if RDF_NIL not in graph_object:
-                continue
-
+            firsts, rests, others = list_index.get(name, ({}, {}, set()))
             # iterate backwards through each RDF list
-            nil = graph_object[RDF_NIL]
-            if 'usages' not in nil:
-                continue
-            for usage in nil['usages']:
-                node = usage['node']
-                property = usage['property']
-                head = usage['value']
+            for node, property, head in nil_usages.get(name, ()):
                 list_ = []
                 list_nodes = []
 
@@ -2567,26 +3469,17 @@ class JsonLdProcessor:
                 # 3. Have an array for rdf:rest that has 1 item
                 # 4. Have no keys other than: @id, rdf:first, rdf:rest
                 #   and, optionally, @type where the value is rdf:List.
-                node_key_count = len(node.keys())
-                while(property == RDF_REST and
-                        _is_object(referenced_once.get(node['@id'])) and
-                        _is_array(node[RDF_FIRST]) and
-                        len(node[RDF_FIRST]) == 1 and
-                        _is_array(node[RDF_REST]) and
-                        len(node[RDF_REST]) == 1 and
-                        (node_key_count == 3 or (node_key_count == 4 and
-                         _is_array(node.get('@type')) and
-                         len(node['@type']) == 1 and
-                         node['@type'][0] == RDF_LIST))):
+                while property == RDF_REST:
+                    id_ = node['@id']
+                    usage = referenced_once.get(id_)
+                    if (not usage or id_ in others or
+                            firsts.get(id_) != 1 or rests.get(id_) != 1):
+                        break
                     list_.append(node[RDF_FIRST][0])
-                    list_nodes.append(node['@id'])
+                    list_nodes.append(id_)
 
                     # get next node, moving backwards through list
-                    usage = referenced_once[node['@id']]
-                    node = usage['node']
-                    property = usage['property']
-                    head = usage['value']
-                    node_key_count = len(node.keys())
+                    node, property, head = usage
 
                     # if node is not a blank node, then list head found
                     if not node['@id'].startswith('_:'):
@@ -2598,16 +3491,13 @@ class JsonLdProcessor:
                 head['@list'] = list_
                 for node in list_nodes:
                     del graph_object[node]
-                    # graph_object.pop(node, None)
-
-            del nil['usages']
-            # nil.pop('usages', None)
 
         result = []
-        for subject, node in sorted(default_graph.items()):
+        for subject, node in _ordered_items(default_graph, options['ordered']):
             if subject in graph_map:
                 graph = node['@graph'] = []
-                for s, n in sorted(graph_map[subject].items()):
+                for s, n in _ordered_items(
+                        graph_map[subject], options['ordered']):
                     # only add full subjects to top-level
                     if not _is_subject_reference(n):
                         graph.append(n)
@@ -2656,8 +3546,10 @@ class JsonLdProcessor:
             return self._clone_active_context(active_ctx)
 
         # resolve contexts
-        resolved = options['contextResolver'].resolve(
-            active_ctx, local_ctx, options.get('base', ''))
+        profiler = options.get('profiler')
+        with phase(profiler, 'context_resolution'):
+            resolved = options['contextResolver'].resolve(
+                active_ctx, local_ctx, options.get('base', ''))
 
         # override propagate if first resolved context has `@propagate`
         if (_is_object(resolved[0].document)
@@ -2693,7 +3585,12 @@ class JsonLdProcessor:
                 continue
 
             # get processed context from cache if available
-            processed = resolved_context.get_processed(active_ctx)
+            processed = resolved_context.get_processed(
+                active_ctx, options.get('base', ''))
+            if profiler is not None:
+                profiler.count(
+                    'processed_context_cache_hits' if processed
+                    else 'processed_context_cache_misses')
             if processed:
                 rval = active_ctx = processed
                 continue
@@ -2713,6 +3610,8 @@ class JsonLdProcessor:
 
             # define context mappings for keys in local context
             defined = {}
+            # whether the result depends on the base IRI
+            relative = False
 
             # handle @version
             if '@version' in ctx:
@@ -2747,6 +3646,7 @@ class JsonLdProcessor:
                 # resolve contexts
                 if '_uuid' not in active_ctx:
                     active_ctx['_uuid'] = str(uuid.uuid1())
+                relative = not _is_absolute_iri(value)
                 resolved_import = options['contextResolver'].resolve(
                     active_ctx, value, options.get('base', ''))
                 if len(resolved_import) != 1:
@@ -2813,6 +3713,7 @@ class JsonLdProcessor:
                         'the value of "@vocab" in a @context must be an absolute IRI.',
                         context=ctx, code='invalid vocab mapping')
                 else:
+                    relative = relative or not _is_absolute_iri(value)
                     rval['@vocab'] = self._expand_iri(
                         rval, value, vocab=True, base=options.get('base', ''))
                 defined['@vocab'] = True
@@ -2902,7 +3803,8 @@ class JsonLdProcessor:
 
             # cache processed result and give the context a unique identifier
             rval = frozendict(rval)
-            resolved_context.set_processed(active_ctx, rval)
+            resolved_context.set_processed(
+                active_ctx, rval, options.get('base', '') if relative else None)
 
         return rval
 
@@ -3116,19 +4018,23 @@ class JsonLdProcessor:
         rval['@value'] = value
         return rval
 
-    def _graph_to_rdf(self, graph, issuer, options):
+    def _graph_to_rdf(self, graph, issuer, options, triples=None):
         """
         Creates an array of RDF triples for the given graph.
 
         :param graph: the graph to create RDF triples for.
         :param issuer: the IdentifierIssuer for issuing blank node identifiers.
         :param options: the RDF serialization options.
+        :param triples: the array, or any object with an `append` method,
+          to add the triples to (default: a new array).
 
         :return: the array of RDF triples for the given graph.
         """
-        triples = []
-        for id_, node in sorted(graph.items()):
-            for property, items in sorted(node.items()):
+        if triples is None:
+            triples = []
+        ordered = options['ordered']
+        for id_, node in _ordered_items(graph, ordered):
+            for property, items in _ordered_items(node, ordered):
                 if property == '@type':
                     property = RDF_TYPE
                 elif _is_keyword(property):
@@ -3195,11 +4101,13 @@ class JsonLdProcessor:
         for item in list_:
             object = self._object_to_rdf(item, issuer, triples, rdfDirection)
             next = {'type': 'blank node', 'value': issuer.get_id()}
-            triples.append({
-                'subject': subject,
-                'predicate': first,
-                'object': object
-            })
+            # skip None objects (they are relative IRIs)
+            if object is not None:
+                triples.append({
+                    'subject': subject,
+                    'predicate': first,
+                    'object': object
+                })
             triples.append({
                 'subject': subject,
                 'predicate': rest,
@@ -3211,11 +4119,13 @@ class JsonLdProcessor:
         # tail of list
         if last:
             object = self._object_to_rdf(last, issuer, triples, rdfDirection)
-            triples.append({
-                'subject': subject,
-                'predicate': first,
-                'object': object
-            })
+            # skip None objects (they are relative IRIs)
+            if object is not None:
+                triples.append({
+                    'subject': subject,
+                    'predicate': first,
+                    'object': object
+                })
             triples.append({
                 'subject': subject,
                 'predicate': rest,
@@ -3246,16 +4156,13 @@ class JsonLdProcessor:
 
             # convert to XSD datatypes as appropriate
             if item.get('@type') == '@json':
-                object['value'] = canonicalize(value).decode('utf-8')
+                object['value'] = canonicalize(value, utf8=False)
                 object['datatype'] = RDF_JSON_LITERAL
             elif _is_bool(value):
                 object['value'] = 'true' if value else 'false'
                 object['datatype'] = datatype or XSD_BOOLEAN
             elif _is_double(value) or datatype == XSD_DOUBLE:
-                # canonical double representation
-                object['value'] = re.sub(
-                    r'(\d)0*E\+?0*(\d)', r'\1E\2',
-                    ('%1.15E' % value))
+                object['value'] = _canonical_double(value)
                 object['datatype'] = datatype or XSD_DOUBLE
             elif _is_integer(value):
                 object['value'] = str(value)
@@ -3294,13 +4201,16 @@ class JsonLdProcessor:
 
         return object
 
-    def _rdf_to_object(self, o, use_native_types, rdf_direction):
+    def _rdf_to_object(
+            self, o, use_native_types, rdf_direction, native_values=None):
         """
         Converts an RDF triple object to a JSON-LD object.
 
         :param o: the RDF triple object to convert.
         :param use_native_types: True to output native types, False not to.
         :param rdf_direction: Only 'i18n-datatype' is supported.
+        :param native_values: the native values of the literals of the
+          dataset (see `_native_literals`), None to convert the literal.
 
         :return: the JSON-LD object.
         """
@@ -3323,7 +4233,7 @@ class JsonLdProcessor:
             if type_ == RDF_JSON_LITERAL:
                 type_ = '@json'
                 try:
-                    rval['@value'] = json.loads(rval['@value'])
+                    rval['@value'] = json_loads(rval['@value'])
                 except Exception as e:
                     raise InvalidJsonLiteral(
                         'JSON literal could not be parsed.',
@@ -3333,36 +4243,48 @@ class JsonLdProcessor:
 
             # use native types for certain xsd types
             if use_native_types:
-                if type_ == XSD_BOOLEAN:
-                    if rval['@value'] == 'true':
-                        rval['@value'] = True
-                    elif rval['@value'] == 'false':
-                        rval['@value'] = False
-                elif _is_numeric(rval['@value']):
-                    if type_ == XSD_INTEGER:
-                        if rval['@value'].isdigit():
-                            rval['@value'] = int(rval['@value'])
-                    elif type_ == XSD_DOUBLE:
-                        rval['@value'] = float(rval['@value'])
+                if type_ in _NATIVE_TYPES:
+                    if native_values is None:
+                        rval['@value'] = _native_column(
+                            type_, [rval['@value']])[0]
+                    else:
+                        rval['@value'] = native_values[type_][rval['@value']]
                 # do not add native type
-                if type_ not in [
-                        XSD_BOOLEAN, XSD_INTEGER, XSD_DOUBLE, XSD_STRING]:
+                elif type_ != XSD_STRING:
                     rval['@type'] = type_
             elif (rdf_direction == 'i18n-datatype' and
                 type_.startswith('https://www.w3.org/ns/i18n#')):
-                _, language, direction = re.split(r'[#_]', type_)
+                language, direction, valid = _parse_i18n_datatype(type_)
                 if language:
                     rval['@language'] = language
-                    if not REGEX_BCP47.match(language):
+                    if not valid:
                         warnings.warn('@language must be valid BCP47')
                 rval['@direction'] = direction
             elif type_ != XSD_STRING:
                 rval['@type'] = type_
         return rval
 
+    def _create_top_node_map(self, input_, graph_map, issuer, options):
+        """
+        Flattens the subjects of an expanded JSON-LD document into a node
+        map, starting in the default graph.
+
+        :param input_: the JSON-LD expanded input.
+        :param graph_map: a map of graph name to subject map.
+        :param issuer: the IdentifierIssuer for issuing blank node identifiers.
+        :param options: the options of the operation.
+        """
+        profiler = options.get('profiler')
+        with phase(profiler, 'node_map'):
+            self._create_node_map(input_, graph_map, '@default', issuer)
+            if profiler is not None:
+                profiler.count(
+                    'nodes', sum(len(graph) for graph in graph_map.values()))
+
     def _create_node_map(
             self, input_, graph_map, active_graph, issuer,
-            active_subject=None, active_property=None, list_=None):
+            active_subject=None, active_property=None, list_=None,
+            value_index=None):
         """
         Recursively flattens the subjects in the given JSON-LD expanded
         input into a node map.
@@ -3374,11 +4296,18 @@ class JsonLdProcessor:
         :param active_subject: the name assigned to the current input if it is a bnode.
         :param active_property: property within current node.
         :param list_: the list to append to, None for none.
+        :param value_index: the index of the values added to each node, to
+          find duplicates (see `add_value`).
         """
+        if value_index is None:
+            value_index = {}
+
         # recurse through array
         if _is_array(input_):
             for e in input_:
-                self._create_node_map(e, graph_map, active_graph, issuer, active_subject, active_property, list_)
+                self._create_node_map(
+                    e, graph_map, active_graph, issuer, active_subject,
+                    active_property, list_, value_index)
             return
 
         # Note: At this point, input must be a subject.
@@ -3404,13 +4333,15 @@ class JsonLdProcessor:
             elif subject_node:
                 JsonLdProcessor.add_value(
                     subject_node, active_property, input_,
-                    {'propertyIsArray': True, 'allowDuplicate': False})
+                    {'propertyIsArray': True, 'allowDuplicate': False,
+                     'valueIndex': value_index})
             return
 
         if _is_list(input_):
             o = {'@list': []}
             self._create_node_map(
-                input_['@list'], graph_map, active_graph, issuer, active_subject, active_property, o)
+                input_['@list'], graph_map, active_graph, issuer, active_subject, active_property, o,
+                value_index=value_index)
             if list_:
                 list_['@list'].append(o)
             elif subject_node:
@@ -3430,7 +4361,8 @@ class JsonLdProcessor:
             # reverse property relationship
             JsonLdProcessor.add_value(
                 node, active_property, active_subject,
-                {'propertyIsArray': True, 'allowDuplicate': False})
+                {'propertyIsArray': True, 'allowDuplicate': False,
+                 'valueIndex': value_index})
         elif active_property:
             reference = {'@id': id_}
             if list_:
@@ -3438,7 +4370,8 @@ class JsonLdProcessor:
             elif subject_node:
                 JsonLdProcessor.add_value(
                     subject_node, active_property, reference,
-                    {'propertyIsArray': True, 'allowDuplicate': False})
+                    {'propertyIsArray': True, 'allowDuplicate': False,
+                     'valueIndex': value_index})
 
         for property, objects in sorted(input_.items()):
             # skip @id
@@ -3454,7 +4387,8 @@ class JsonLdProcessor:
                         self._create_node_map(
                             item, graph_map, active_graph, issuer,
                             active_subject=referenced_node,
-                            active_property=reverse_property)
+                            active_property=reverse_property,
+                            value_index=value_index)
                 continue
 
             # recurse into active_graph
@@ -3462,12 +4396,15 @@ class JsonLdProcessor:
                 # add graph subjects map entry
                 graph_map.setdefault(id_, {})
                 g = active_graph if active_graph == '@merged' else id_
-                self._create_node_map(objects, graph_map, g, issuer)
+                self._create_node_map(
+                    objects, graph_map, g, issuer, value_index=value_index)
                 continue
 
             # recurse into included
             if property == '@included':
-                self._create_node_map(objects, graph_map, active_graph, issuer)
+                self._create_node_map(
+                    objects, graph_map, active_graph, issuer,
+                    value_index=value_index)
                 continue
 
             # copy non-@type keywords
@@ -3497,27 +4434,32 @@ class JsonLdProcessor:
                     o = issuer.get_id(o) if o.startswith('_:') else o
                     JsonLdProcessor.add_value(
                         node, property, o,
-                        {'propertyIsArray': True, 'allowDuplicate': False})
+                        {'propertyIsArray': True, 'allowDuplicate': False,
+                         'valueIndex': value_index})
                 else:
                     self._create_node_map(o, graph_map, active_graph, issuer,
-                        active_subject=id_, active_property=property)
+                        active_subject=id_, active_property=property,
+                        value_index=value_index)
 
-    def _merge_node_map_graphs(self, graph_map):
+    def _merge_node_map_graphs(self, graph_map, ordered=True):
         """
         Merge separate named graphs into a single merged graph including
         all nodes from the default graph and named graphs.
 
         :param graph_map: a map of graph name to subject map.
+        :param ordered: True to merge graphs, nodes and properties in
+          lexicographical order.
 
         :return: merged graph map.
         """
         merged = {}
-        for name, graph in sorted(graph_map.items()):
-            for id_, node in sorted(graph.items()):
+        value_index = {}
+        for name, graph in _ordered_items(graph_map, ordered):
+            for id_, node in _ordered_items(graph, ordered):
                 if id_ not in merged:
                     merged[id_] = {'@id': id}
                 merged_node = merged[id_]
-                for property, values in sorted(node.items()):
+                for property, values in _ordered_items(node, ordered):
                     if property != '@type' and _is_keyword(property):
                         # copy keywords
                         merged_node[property] = values
@@ -3526,10 +4468,13 @@ class JsonLdProcessor:
                         for value in values:
                             JsonLdProcessor.add_value(
                                 merged_node, property, value,
-                                {'propertyIsArray': True, 'allowDuplicate': False})
+                                {'propertyIsArray': True, 'allowDuplicate': False,
+                                 'valueIndex': value_index})
         return merged
 
-    def _match_frame(self, state, subjects, frame, parent, property):
+    def _match_frame(
+            self, state, subjects, frame, parent, property,
+            included_subjects=None):
         """
         Frames subjects according to the given frame.
 
@@ -3538,18 +4483,13 @@ class JsonLdProcessor:
         :param frame: the frame.
         :param parent: the parent subject or top-level array.
         :param property: the parent property, initialized to None.
+        :param included_subjects: the subjects to filter with the @included
+          frame (default: subjects).
         """
-        # validate the frame
-        self._validate_frame(frame)
+        # validate the frame and get its flags
+        flags = self._get_frame_flags(state, frame)
         frame = frame[0]
-
-        # get flags for current frame
         options = state['options']
-        flags = {
-            'embed': self._get_frame_flag(frame, options, 'embed'),
-            'explicit': self._get_frame_flag(frame, options, 'explicit'),
-            'requireAll': self._get_frame_flag(frame, options, 'requireAll')
-        }
 
         # get link for current graph
         state['link'].setdefault(state['graph'], {})
@@ -3558,15 +4498,18 @@ class JsonLdProcessor:
         # filter out subjects that match the frame
         matches = self._filter_subjects(state, subjects, frame, flags)
 
-        # add matches to output
-        for id_, subject in sorted(matches.items()):
+        # add matches to output (in the order of the subjects, which are
+        # already sorted)
+        for id_, subject in matches.items():
             # Note: In order to treat each top-level match as a
             # compartmentalized result, clear the unique embedded subjects map
             # when the property is None, which only occurs at the top-level.
             if property is None:
                 state['uniqueEmbeds'] = {state['graph']: {}}
+                state['embedsByParent'] = {state['graph']: {}}
             elif not state['graph'] in state['uniqueEmbeds']:
                 state['uniqueEmbeds'][state['graph']] = {}
+                state['embedsByParent'][state['graph']] = {}
 
             if flags['embed'] == '@link' and id_ in link:
                 # TODO: may want to also match an existing linked subject
@@ -3626,6 +4569,10 @@ class JsonLdProcessor:
                 'parent': parent,
                 'property': property
             }
+            # index embeds by the @id of their parent to find dependents
+            if _is_object(parent) and '@id' in parent:
+                state['embedsByParent'][state['graph']].setdefault(
+                    parent['@id'], set()).add(id_)
 
             # push matching subject onto stack to enable circular embed checks
             state['subjectStack'].append({'subject': subject, 'graph': state['graph']})
@@ -3646,16 +4593,18 @@ class JsonLdProcessor:
                     # recurse into graph
                     self._match_frame(
                         {**state, 'graph': id_, 'embedded': False},
-                        sorted(state['graphMap'][id_].keys()), [subframe], output, '@graph')
+                        self._get_graph_subjects(state, id_), [subframe], output, '@graph')
 
             # if frame has @included, recurse over its sub-frame
             if '@included' in frame:
                 self._match_frame(
                     {**state, 'embedded': False},
-                    subjects, frame['@included'], output, '@included')
+                    subjects if included_subjects is None
+                    else included_subjects,
+                    frame['@included'], output, '@included')
 
             # iterate over subject properties in order
-            for prop, objects in sorted(subject.items()):
+            for prop, objects in self._get_node_items(state, subject):
                 # copy keywords to output
                 if _is_keyword(prop):
                     output[prop] = subject[prop]
@@ -3678,14 +4627,14 @@ class JsonLdProcessor:
                     if prop in frame:
                         subframe = frame[prop]
                     else:
-                        subframe = self._create_implicit_frame(flags)
+                        subframe = self._get_implicit_frame(state, flags)
 
                     # recurse into list
                     if _is_list(o):
                         if prop in frame and frame[prop][0] and '@list' in frame[prop][0]:
                             subframe = frame[prop][0]['@list']
                         else:
-                            subframe = self._create_implicit_frame(flags)
+                            subframe = self._get_implicit_frame(state, flags)
 
                         # add empty list
                         list_ = {'@list': []}
@@ -3715,7 +4664,7 @@ class JsonLdProcessor:
                         self._add_frame_output(output, prop, o)
 
             # handle defaults in order
-            for prop in sorted(frame.keys()):
+            for prop, _ in self._get_frame_items(state, frame):
                 # skip keywords
                 if prop == '@type':
                     if (not frame[prop] or
@@ -3775,6 +4724,27 @@ class JsonLdProcessor:
             frame['@' + key] = [flags[key]]
         return [frame]
 
+    def _get_implicit_frame(self, state, flags):
+        """
+        Gets the implicit frame for the given flags, creating it only once
+        per set of flag values.
+
+        :param state: the current framing state.
+        :param flags: the current framing flags.
+
+        :return: the implicit frame.
+        """
+        key = (flags['embed'], flags['explicit'], flags['requireAll'])
+        try:
+            frame = state['implicitFrames'].get(key)
+        except TypeError:
+            # unhashable flag values
+            return self._create_implicit_frame(flags)
+        if frame is None:
+            frame = state['implicitFrames'][key] = (
+                self._create_implicit_frame(flags))
+        return frame
+
     def _creates_circular_reference(self, subject_to_embed, graph, subject_stack):
         """
         Checks the current subject stack to see if embedding the given subject
@@ -3818,6 +4788,50 @@ class JsonLdProcessor:
                     frame=frame, embed=rval, code='invalid @embed value')
         return rval
 
+    def _get_frame_flags(self, state, frame):
+        """
+        Validates a frame and gets its flags, only once per frame.
+
+        :param state: the current framing state.
+        :param frame: the frame.
+
+        :return: the frame flags.
+        """
+        # keep a reference to the frame so its id can't be reused
+        cached = state['frameFlags'].get(id(frame))
+        if cached is None or cached[0] is not frame:
+            self._validate_frame(frame)
+            options = state['options']
+            cached = state['frameFlags'][id(frame)] = (frame, {
+                'embed': self._get_frame_flag(frame[0], options, 'embed'),
+                'explicit': self._get_frame_flag(
+                    frame[0], options, 'explicit'),
+                'requireAll': self._get_frame_flag(
+                    frame[0], options, 'requireAll')
+            })
+        return cached[1]
+
+    def _resolve_frame_flags(self, state, frame):
+        """
+        Validates the sub-frames of a frame and gets their flags ahead of
+        framing. Invalid sub-frames are skipped, so they only fail if they
+        are used.
+
+        :param state: the current framing state.
+        :param frame: the frame, or a value within it.
+        """
+        if _is_array(frame):
+            if len(frame) == 1 and _is_object(frame[0]):
+                try:
+                    self._get_frame_flags(state, frame)
+                except JsonLdError:
+                    pass
+            for value in frame:
+                self._resolve_frame_flags(state, value)
+        elif _is_object(frame):
+            for value in frame.values():
+                self._resolve_frame_flags(state, value)
+
     def _validate_frame(self, frame):
         """
         Validates a JSON-LD frame, throwing an exception if the frame is
@@ -3855,13 +4869,187 @@ class JsonLdProcessor:
 
         :return: all of the matched subjects.
         """
+        # only check the subjects that can possibly match
+        candidates = None
+        if len(subjects) > 1:
+            candidates = self._get_frame_candidates(state, frame, flags)
+
         rval = {}
+        graph = state['graphMap'][state['graph']]
         for id_ in subjects:
-            subject = state['graphMap'][state['graph']][id_]
+            if candidates is not None and id_ not in candidates:
+                continue
+            subject = graph[id_]
             if self._filter_subject(state, subject, frame, flags):
                 rval[id_] = subject
         return rval
 
+    def _get_frame_index(self, state):
+        """
+        Gets the indexes of the subjects in the current graph by @type and
+        by property, building them on first use.
+
+        :param state: the current framing state.
+
+        :return: the subject indexes for the current graph.
+        """
+        index = state['frameIndexes'].get(state['graph'])
+        if index is not None:
+            return index
+
+        types = {}
+        properties = {}
+        typed = set()
+        untyped = set()
+        for id_, subject in state['graphMap'][state['graph']].items():
+            if subject.get('@type'):
+                typed.add(id_)
+                for type_ in JsonLdProcessor.arrayify(subject['@type']):
+                    if _is_string(type_):
+                        types.setdefault(type_, set()).add(id_)
+            else:
+                untyped.add(id_)
+            for prop, values in subject.items():
+                if values and not _is_keyword(prop):
+                    properties.setdefault(prop, set()).add(id_)
+
+        index = state['frameIndexes'][state['graph']] = {
+            'types': types,
+            'properties': properties,
+            'typed': typed,
+            'untyped': untyped
+        }
+        return index
+
+    def _get_frame_candidates(self, state, frame, flags):
+        """
+        Gets the subjects of the current graph that may match a parsed frame,
+        i.e. a superset of the subjects matched by `_filter_subject`.
+
+        :param state: the current framing state.
+        :param frame: the parsed frame.
+        :param flags: the frame flags.
+
+        :return: the set of candidate subject ids, None for all subjects.
+        """
+        index = self._get_frame_index(state)
+        require_all = flags['requireAll']
+        # subject sets that must (requireAll) or may match
+        required = []
+        optional = []
+
+        if '@id' in frame:
+            ids = frame['@id']
+            if (ids and not _is_empty_object(ids[0]) and
+                    all(_is_string(id_) for id_ in ids)):
+                required.append(set(ids))
+            if not require_all:
+                # @id alone decides the match
+                return required[0] if required else None
+
+        wildcard = True
+        if '@type' in frame:
+            wildcard = False
+            types = frame['@type']
+            if len(types) == 0:
+                # typed subjects never match, untyped ones match the @type
+                if not require_all:
+                    return index['untyped']
+                required.append(index['untyped'])
+            elif len(types) == 1 and _is_empty_object(types[0]):
+                if require_all:
+                    required.append(index['typed'])
+                else:
+                    optional.append(index['typed'])
+            elif not any(_is_object(t) and '@default' in t for t in types):
+                matched = set()
+                for type_ in types:
+                    if _is_string(type_):
+                        matched.update(index['types'].get(type_, ()))
+                required.append(matched)
+                if not require_all:
+                    # @type alone decides the match
+                    return matched
+            elif not require_all:
+                return None
+
+        for prop, values in frame.items():
+            if _is_keyword(prop):
+                continue
+            wildcard = False
+            if not values or values[0] is None:
+                # matches subjects without the property
+                if not require_all:
+                    return None
+                continue
+            subjects = index['properties'].get(prop, set())
+            if require_all:
+                if not (_is_object(values[0]) and '@default' in values[0]):
+                    required.append(subjects)
+            else:
+                optional.append(subjects)
+
+        if require_all:
+            if not required:
+                return None
+            return set.intersection(*required)
+        if wildcard:
+            return None
+        return set().union(*optional)
+
+    def _get_graph_subjects(self, state, graph):
+        """
+        Gets the ids of the subjects of a graph in the node map, sorted
+        only once per graph unless ordering is disabled.
+
+        :param state: the current framing state.
+        :param graph: the name of the graph.
+
+        :return: the subject ids.
+        """
+        subjects = state['graphSubjects'].get(graph)
+        if subjects is None:
+            subjects = list(state['graphMap'][graph].keys())
+            if state['options']['ordered']:
+                subjects.sort()
+            state['graphSubjects'][graph] = subjects
+        return subjects
+
+    def _get_node_items(self, state, node):
+        """
+        Gets the items of a node in the node map, sorted by property only
+        once per node unless ordering is disabled.
+
+        :param state: the current framing state.
+        :param node: the node.
+
+        :return: the node items.
+        """
+        if not state['options']['ordered']:
+            return node.items()
+        # keep a reference to the node so its id can't be reused
+        cached = state['nodeItems'].get(id(node))
+        if cached is None or cached[0] is not node:
+            cached = state['nodeItems'][id(node)] = (node, sorted(node.items()))
+        return cached[1]
+
+    def _get_frame_items(self, state, frame):
+        """
+        Gets the items of a parsed frame sorted by key, sorting them only
+        once per frame.
+
+        :param state: the current framing state.
+        :param frame: the parsed frame.
+
+        :return: the sorted frame items.
+        """
+        # keep a reference to the frame so its id can't be reused
+        cached = state['frameItems'].get(id(frame))
+        if cached is None or cached[0] is not frame:
+            cached = state['frameItems'][id(frame)] = (
+                frame, sorted(frame.items()))
+        return cached[1]
+
     def _filter_subject(self, state, subject, frame, flags):
         """
         Returns True if the given subject matches the given frame.
@@ -3884,7 +5072,7 @@ class JsonLdProcessor:
         # check ducktype
         wildcard = True
         matches_some = False
-        for k, v in sorted(frame.items()):
+        for k, v in self._get_frame_items(state, frame):
             match_this = False
             node_values = JsonLdProcessor.get_values(subject, k)
             is_empty = len(v) == 0
@@ -4010,22 +5198,18 @@ class JsonLdProcessor:
                 embed['parent'], property, subject,
                 {'propertyIsArray': use_array})
 
-        # recursively remove dependent dangling embeds
-        def remove_dependents(id_):
-            # get embed keys as a separate array to enable deleting keys
-            # in map
-            try:
-                ids = list(embeds.iterkeys())
-            except AttributeError:
-                ids = list(embeds.keys())
-            for next in ids:
+        # remove dependent dangling embeds
+        embeds_by_parent = state['embedsByParent'][state['graph']]
+        parents = [id_]
+        while parents:
+            parent_id = parents.pop()
+            for next in embeds_by_parent.pop(parent_id, ()):
+                # skip embeds already removed or since embedded elsewhere
                 if (next in embeds and
                         _is_object(embeds[next]['parent']) and
-                        '@id' in embeds[next]['parent'] and # could be @list
-                        embeds[next]['parent']['@id'] == id_):
+                        embeds[next]['parent'].get('@id') == parent_id):
                     del embeds[next]
-                    remove_dependents(next)
-        remove_dependents(id_)
+                    parents.append(next)
 
     def _add_frame_output(self, parent, prop, output):
         """
@@ -4086,66 +5270,34 @@ class JsonLdProcessor:
             return False
         return True
 
-    def _cleanup_preserve(self, input_, options):
+    def _cleanup_preserve(self, element, options):
         """
-        Removes the @preserve keywords as the last step of the framing
-        algorithm.
+        Removes the @preserve keyword and unreferenced blank node identifiers
+        from a framed element as it is compacted.
 
-        :param input_: the framed, compacted output.
+        :param element: the framed element.
         :param options: the compaction options used.
 
-        :return: the resulting output.
+        :return: the element to compact and True if it is a preserved default
+          value, False if not.
         """
-        # recurse through arrays
-        if _is_array(input_):
-            output = []
-            for e in input_:
-                result = self._cleanup_preserve(e, options)
-                # drop Nones from arrays
-                # XXX needed?
-                if result is not None:
-                    output.append(result)
-            return output
-        elif _is_object(input_):
+        if _is_object(element):
             # remove @preserve
-            if '@preserve' in input_:
-                #if input_['@preserve'] == '@null':
-                #    return None
-                return input_['@preserve'][0]
-
-            # skip @values
-            if _is_value(input_):
-                return input_
-
-            # recurse through @lists
-            if _is_list(input_):
-                input_['@list'] = self._cleanup_preserve(
-                    input_['@list'], options)
-                return input_
-
-            # handle in-memory linked nodes
-            if '@id' in input_:
-                id_ = input_['@id']
-                if id_ in options['link']:
-                    try:
-                        idx = options['link'][id_].index(input_)
-                        # already visited
-                        return options['link'][id_][idx]
-                    except:
-                        # prevent circular visitation
-                        options['link'][id_].append(input_)
-                else:
-                    # prevent circular visitation
-                    options['link'][id_] = [input_]
+            if '@preserve' in element:
+                return element['@preserve'][0], True
 
             # potentially remove the id, if it is an unreferenced bnode
-            if input_.get('@id') in options['bnodesToClear']:
-                input_.pop('@id')
-
-            # recurse through properties
-            for prop, v in input_.items():
-                input_[prop] = self._cleanup_preserve(v, options)
-        return input_
+            if element.get('@id') in options['bnodesToClear']:
+                element = {k: v for k, v in element.items() if k != '@id'}
+
+            # remove @preserve from default types
+            types = element.get('@type')
+            if _is_array(types) and any(_is_object(t) for t in types):
+                element = dict(element)
+                element['@type'] = [
+                    t['@preserve'][0] if _is_object(t) and '@preserve' in t
+                    else t for t in types]
+        return element, False
 
     def _cleanup_null(self, input_, options):
         """
@@ -4162,21 +5314,8 @@ class JsonLdProcessor:
             return [v for v in no_nulls if v is not None]
         if input_ == '@null':
             return None
-        if _is_object(input_):
-            # handle in-memory linked nodes
-            if '@id' in input_:
-                id_ = input_['@id']
-                if id_ in options['link']:
-                    try:
-                        idx = options['link'][id_].index(input_)
-                        # already visited
-                        return options['link'][id_][idx]
-                    except:
-                        # prevent circular visitation
-                        options['link'][id_].append(input_)
-                else:
-                    # prevent circular visitation
-                    options['link'][id_] = [input_]
+        # skip objects already cleaned up during compaction
+        if _is_object(input_) and id(input_) not in options['cleaned']:
             for prop, v in input_.items():
                 input_[prop] = self._cleanup_null(v, options)
         return input_
@@ -4230,6 +5369,13 @@ class JsonLdProcessor:
                 prefs.append('_' + lang_dir[0].split('_')[-1])
         prefs.append('@none')
 
+        # reuse any selection already made for the same preferences
+        selections = self._get_term_index(active_ctx)['selections']
+        key = (iri, tuple(containers), type_or_language, tuple(prefs))
+        if key in selections:
+            return selections[key]
+
+        term = None
         container_map = self._get_inverse_context(active_ctx)[iri]
         for container in containers:
             # skip container if not in map
@@ -4239,10 +5385,14 @@ class JsonLdProcessor:
                 container_map[container][type_or_language])
             for pref in prefs:
                 # skip type/language preference if not in map
-                if pref not in type_or_language_value_map:
-                    continue
-                return type_or_language_value_map[pref]
-        return None
+                if pref in type_or_language_value_map:
+                    term = type_or_language_value_map[pref]
+                    break
+            if term is not None:
+                break
+
+        selections[key] = term
+        return term
 
     def _compact_iri(
             self, active_ctx, iri, value=None, vocab=False, base=None, reverse=False):
@@ -4410,35 +5560,34 @@ class JsonLdProcessor:
                         return suffix
 
         # no term or @vocab match, check for possible CURIEs
+        term_index = self._get_term_index(active_ctx)
         candidate = None
-        for term, definition in active_ctx['mappings'].items():
-            # skip terms with colons, they can't be prefixes
-            if ':' in term:
-                continue
+        for length in term_index['lengths']:
             # skip entries with @ids that are not partial matches
-            if (definition is None or
-                    not definition['@id'] or
-                    definition['@id'] == iri or
-                    not iri.startswith(definition['@id'])):
+            if length >= len(iri):
+                break
+            prefix_terms = term_index['prefixes'].get(iri[:length])
+            if not prefix_terms:
                 continue
 
-            # a CURIE is usable if:
-            # 1. it has no mapping, OR
-            # 2. value is None, which means we're not compacting an @value, AND
-            #  the mapping matches the IRI
-            curie = term + ':' + iri[len(definition['@id']):]
-            is_usable_curie = (
-                active_ctx['mappings'][term]['_prefix'] and
-                curie not in active_ctx['mappings'] or
-                (value is None and
-                 active_ctx['mappings'].get(curie, {}).get('@id') == iri))
-
-            # select curie if it is shorter or the same length but
-            # lexicographically less than the current choice
-            if (is_usable_curie and (
-                    candidate is None or
-                    _compare_shortest_least(curie, candidate) < 0)):
-                candidate = curie
+            for term in prefix_terms:
+                # a CURIE is usable if:
+                # 1. it has no mapping, OR
+                # 2. value is None, which means we're not compacting an @value, AND
+                #  the mapping matches the IRI
+                curie = term + ':' + iri[length:]
+                is_usable_curie = (
+                    active_ctx['mappings'][term]['_prefix'] and
+                    curie not in active_ctx['mappings'] or
+                    (value is None and
+                     active_ctx['mappings'].get(curie, {}).get('@id') == iri))
+
+                # select curie if it is shorter or the same length but
+                # lexicographically less than the current choice
+                if (is_usable_curie and (
+                        candidate is None or
+                        _compare_shortest_least(curie, candidate) < 0)):
+                    candidate = curie
 
         # return curie candidate
         if candidate is not None:
@@ -4446,12 +5595,13 @@ class JsonLdProcessor:
 
         # if iri could be confused with a compact IRI using a term in this context,
         # signal an error
-        for term, definition in active_ctx['mappings'].items():
-            if definition and definition['_prefix'] and iri.startswith(term + ':'):
-                raise JsonLdSyntaxError(
-                    'Absolute IRI confused with prefix.',
-                    iri=iri, term=term, context=active_ctx,
-                    code='IRI confused with prefix')
+        if term_index['confusable'] and iri.startswith(term_index['confusable']):
+            for term in term_index['confusable']:
+                if iri.startswith(term):
+                    raise JsonLdSyntaxError(
+                        'Absolute IRI confused with prefix.',
+                        iri=iri, term=term[:-1], context=active_ctx,
+                        code='IRI confused with prefix')
 
         # compact IRI relative to base
         if not vocab:
@@ -4745,7 +5895,7 @@ class JsonLdProcessor:
                             context=local_ctx, iri=id_, code='invalid IRI mapping')
 
                 mapping['@id'] = id_
-                mapping['_prefix'] = (
+                mapping['_prefix'] = bool(
                     _simple_term and
                     not mapping['_term_has_colon'] and
                     re.match(r'.*[:/\?#\[\]@]$', id_))
@@ -5136,6 +6286,48 @@ class JsonLdProcessor:
         _inverse_context_cache[active_ctx['_uuid']] = inverse
         return inverse
 
+    def _get_term_index(self, active_ctx):
+        """
+        Generates the term selection index for use in the compaction
+        algorithm, if not already generated for the given active context.
+
+        The index groups the terms that may be used as CURIE prefixes by
+        their IRI, and the lengths of those IRIs, so that candidate prefixes
+        for an IRI can be found without scanning every mapping. It also
+        holds the terms selected by `_select_term`, keyed by the IRI and
+        the container and type/language preferences used to select them.
+
+        :param active_ctx: the active context to use.
+
+        :return: the term selection index.
+        """
+        # index already generated
+        index = _term_index_cache.get(active_ctx['_uuid'])
+        if index:
+            return index
+
+        prefixes = {}
+        confusable = []
+        for term, definition in active_ctx['mappings'].items():
+            if not definition:
+                continue
+            # terms that could be confused with a compact IRI
+            if definition['_prefix']:
+                confusable.append(term + ':')
+            # skip terms with colons, they can't be prefixes
+            if ':' in term or not definition['@id']:
+                continue
+            prefixes.setdefault(definition['@id'], []).append(term)
+
+        index = {
+            'prefixes': prefixes,
+            'lengths': sorted({len(iri) for iri in prefixes}),
+            'confusable': tuple(confusable),
+            'selections': {},
+        }
+        _term_index_cache[active_ctx['_uuid']] = index
+        return index
+
     def _clone_active_context(self, active_ctx):
         """
         Clones an active context, creating a child active context.
@@ -5306,6 +6498,110 @@ def _is_numeric(v):
         return False
 
 
+def _canonical_double(v):
+    """
+    Returns the canonical lexical form of a double.
+
+    :param v: the double.
+
+    :return: the lexical form, with no trailing zeros in the mantissa and no
+      sign or leading zeros in a positive exponent.
+    """
+    rval = '%1.15E' % v
+    mantissa, e, exponent = rval.partition('E')
+    # inf, nan and negative exponents are kept as they are
+    if not e or exponent[0] == '-':
+        return rval
+    mantissa = mantissa.rstrip('0')
+    if mantissa[-1] == '.':
+        mantissa += '0'
+    return mantissa + 'E' + (exponent[1:].lstrip('0') or '0')
+
+
+def _parse_i18n_datatype(type_):
+    """
+    Returns the language and direction of an i18n datatype IRI, such as
+    `https://www.w3.org/ns/i18n#en_rtl`.
+
+    :param type_: the datatype IRI.
+
+    :return: a tuple with the language, the direction and whether the
+      language is a valid BCP47 tag.
+    """
+    rval = _i18n_datatype_cache.get(type_)
+    if rval is None:
+        _, language, direction = _i18n_datatype_separators(type_)
+        rval = _i18n_datatype_cache[type_] = (
+            language, direction, bool(REGEX_BCP47.match(language)))
+    return rval
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """
+    Imports NumPy the first time it is needed.
+
+    :return: the numpy module, None if it is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _native_column(type_, values):
+    """
+    Converts a column of lexical forms of the same datatype to native values
+    at once. Doubles are converted with NumPy when it is available.
+
+    :param type_: XSD_BOOLEAN, XSD_INTEGER or XSD_DOUBLE.
+    :param values: the list of lexical forms.
+
+    :return: the list of native values, lexical forms that are not valid
+      for the datatype are kept as they are.
+    """
+    if type_ == XSD_BOOLEAN:
+        return [_BOOLEANS.get(v, v) for v in values]
+    if type_ == XSD_INTEGER:
+        return [int(v) if v.isdecimal() else v for v in values]
+    numpy = _numpy()
+    if numpy is not None:
+        try:
+            return numpy.array(values, dtype=numpy.float64).tolist()
+        except ValueError:
+            pass
+    rval = []
+    for v in values:
+        try:
+            rval.append(float(v))
+        except ValueError:
+            rval.append(v)
+    return rval
+
+
+def _native_literals(dataset):
+    """
+    Converts the xsd:boolean, xsd:integer and xsd:double literals of an RDF
+    dataset to native values, each distinct lexical form once and a column
+    per datatype at a time.
+
+    :param dataset: the RDF dataset.
+
+    :return: a map of datatype to a map of lexical form to native value.
+    """
+    columns = {type_: {} for type_ in _NATIVE_TYPES}
+    for graph in dataset.values():
+        for triple in graph:
+            o = triple['object']
+            column = columns.get(o.get('datatype'))
+            if column is not None:
+                column[o['value']] = None
+    return {
+        type_: dict(zip(column, _native_column(type_, list(column))))
+        for type_, column in columns.items()}
+
+
 def _is_subject(v):
     """
     Returns True if the given value is a subject with properties.
@@ -5365,6 +6661,48 @@ def _is_list(v):
     return _is_object(v) and '@list' in v
 
 
+def _value_key(v):
+    """
+    Returns a hashable key for a JSON-LD value such that two values have the
+    same key only if `JsonLdProcessor.compare_values` considers them equal.
+
+    :param v: the value to get the key for.
+
+    :return: the key, or None if the value has no such key.
+    """
+    if _is_object(v):
+        if '@value' in v:
+            if '@id' in v:
+                return None
+            value = v['@value']
+            key = (
+                '@value', _is_bool(value), value,
+                v.get('@type'), v.get('@language'), v.get('@index'))
+        elif '@id' in v:
+            key = ('@id', v['@id'])
+        else:
+            return None
+    else:
+        key = (None, _is_bool(v), v)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _ordered_items(obj, ordered=True):
+    """
+    Returns the items of a map, sorted by key if ordered.
+
+    :param obj: the map.
+    :param ordered: True to sort the items by key.
+
+    :return: the items.
+    """
+    return sorted(obj.items()) if ordered else obj.items()
+
+
 def _is_graph(v):
     """
     Note: A value is a graph if all of these hold true:
@@ -5469,7 +6807,15 @@ def load_document(url,
 
     if 'headers' not in options:
         options['headers'] = headers
-    remote_doc = options['documentLoader'](url, options)
+    profiler = options.get('profiler')
+    with phase(profiler, 'load_document', url=url, profile=requestProfile):
+        remote_doc = options['documentLoader'](url, options)
+        if profiler is not None:
+            profiler.count('remote_fetches')
+            # the built-in loaders parse the document and report the size of
+            # the response themselves; other loaders may return it unparsed
+            if _is_string(remote_doc.get('document')):
+                profiler.count('document_size', len(remote_doc['document']))
     if base:
         remote_doc['documentUrl'] = base
 
@@ -5491,7 +6837,7 @@ def load_document(url,
                     options['base'] = html_options['base']
             else:
                 # parse JSON
-                remote_doc['document'] = json.loads(remote_doc['document'])
+                remote_doc['document'] = json_loads(remote_doc['document'])
         except JsonLdError:
             raise
         except Exception as e:
@@ -5520,6 +6866,13 @@ def load_html(input, url, profile, options):
 
     :return: the extracted JSON.
     """
+    try:
+        import lxml.html
+    except ImportError as cause:
+        raise LoadDocumentError(
+            'lxml is required to extract JSON-LD from HTML documents.',
+            code='loading document failed', cause=cause)
+
     document = lxml.html.fromstring(input)
     # potentially update options[:base]
     html_base = document.xpath('/html/head/base/@href')
@@ -5544,7 +6897,7 @@ def load_html(input, url, profile, options):
                                     type=types, code='loading document failed')
         content = element[0].text
         try:
-            return json.loads(content)
+            return json_loads(content)
         except Exception as e:
             raise JsonLdSyntaxError(
                 'Invalid JSON syntax.',
@@ -5559,7 +6912,7 @@ def load_html(input, url, profile, options):
         result = []
         for element in elements:
             try:
-                js = json.loads(element.text)
+                js = json_loads(element.text)
                 if _is_array(js):
                     result.extend(js)
                 else:
@@ -5571,7 +6924,7 @@ def load_html(input, url, profile, options):
         return result
     elif elements:
         try:
-            return json.loads(elements[0].text)
+            return json_loads(elements[0].text)
         except Exception as cause:
             raise JsonLdSyntaxError(
                 'Invalid JSON syntax.',
@@ -1,7 +1,10 @@
 from .const import __copyright__, __license__, __version__
+from .codec import JsonCodec
 from .context_resolver import ContextResolver
-from .types import Context, Options, Object, IdentifierIssuer
-from typing import Any, Optional, Callable, List
+from .profiler import Profiler
+from .types import (
+    CompiledFrame, Context, Options, Object, IdentifierIssuer, QuadColumns)
+from typing import Any, Optional, Callable, Iterable, Iterator, List, Set, Tuple, Union
 
 __all__ = [
     '__copyright__', '__license__', '__version__',
@@ -11,14 +14,25 @@ __all__ = [
 
 def compact(input_: Any, ctx: Context, options: Options) -> Any: ...
 def expand(input_: Any, options: Optional[Options]): ...
+def iter_expand(input_: Any, options: Optional[Options]) -> Iterator[Any]: ...
 def flatten(input_: Any, ctx: Optional[Any], options: Optional[Options]): ...
 def frame(input_: Any, frame: Any, options: Optional[Options]): ...
+def iter_frame(input_: Any, frame: Any, options: Optional[Options]) -> Iterator[Any]: ...
+def compile_frame(frame: Any, options: Optional[Options]) -> CompiledFrame: ...
 def link(input_: Any, ctx: Any, options: Optional[Options]): ...
 def normalize(input_: Any, options: Optional[Options]): ...
 def from_rdf(input_: Any, options: Optional[Options]): ...
 def to_rdf(input_: Any, options: Optional[Options]): ...
+def compact_many(inputs: Iterable[Any], ctx: Context, options: Optional[Options]) -> Iterator[Any]: ...
+def expand_many(inputs: Iterable[Any], options: Optional[Options]) -> Iterator[Any]: ...
+def flatten_many(inputs: Iterable[Any], ctx: Optional[Any], options: Optional[Options]) -> Iterator[Any]: ...
+def to_rdf_many(inputs: Iterable[Any], options: Optional[Options]) -> Iterator[Any]: ...
+def dumps_context(ctx: Any, options: Optional[Options]) -> bytes: ...
+def loads_context(data: bytes) -> Context: ...
 def set_document_loader(load_document_: Any) -> None: ...
 def get_document_loader(): ...
+def set_json_codec(codec: Union[str, JsonCodec]) -> None: ...
+def get_json_codec() -> JsonCodec: ...
 def sync_document_loader(**kwargs: Any): ...
 def async_document_loader(**kwargs: Any): ...
 def register_rdf_parser(content_type: Any, parser: Any) -> None: ...
@@ -30,11 +44,19 @@ class JsonLdProcessor:
     def __init__(self) -> None: ...
     def compact(self, input_: Any, ctx: Context, options: Options): ...
     def expand(self, input_: Any, options: Options): ...
+    def iter_expand(self, input_: Any, options: Options) -> Iterator[Any]: ...
     def flatten(self, input_: Any, ctx: Context, options: Options): ...
     def frame(self, input_: Any, frame: Any, options: Options): ...
+    def iter_frame(self, input_: Any, frame: Any, options: Options) -> Iterator[Any]: ...
+    def compile_frame(self, frame: Any, options: Options) -> CompiledFrame: ...
     def normalize(self, input_: Any, options: Options): ...
     def from_rdf(self, dataset: Any, options: Options): ...
     def to_rdf(self, input_: Any, options: Options): ...
+    def compact_many(self, inputs: Iterable[Any], ctx: Context, options: Options) -> Iterator[Any]: ...
+    def expand_many(self, inputs: Iterable[Any], options: Options) -> Iterator[Any]: ...
+    def flatten_many(self, inputs: Iterable[Any], ctx: Context, options: Options) -> Iterator[Any]: ...
+    def to_rdf_many(self, inputs: Iterable[Any], options: Options) -> Iterator[Any]: ...
+    def _batch_context(self, ctx: Any, options: Options, active_ctxs: Any) -> Any: ...
 
     def process_context(
         self,
@@ -50,6 +72,8 @@ class JsonLdProcessor:
     @staticmethod
     def has_value(subject: Any, prop: str, value: Any) -> bool: ...
     @staticmethod
+    def _has_indexed_value(index: Object[Any], subject: Any, prop: str, value: Any) -> bool: ...
+    @staticmethod
     def add_value(subject: Any, property: str, value: Any, options: Options) -> None: ...
     @staticmethod
     def get_values(subject: Any, prop: str) -> List[Any]: ...
@@ -66,6 +90,36 @@ class JsonLdProcessor:
     @staticmethod
     def _compare_rdf_triples(t1: Any, t2: Any): ...
 
+    def _load_expansion_input(self, input_: Any, options: Options) -> Tuple[Any, Context]: ...
+
+    def _load_frame_input(
+        self,
+        input_: Any,
+        frame: Any,
+        options: Options,
+    ) -> Tuple[Any, Any, Any, Context]: ...
+
+    def _load_frame(self, frame: Any, options: Options) -> Tuple[Any, Any, Context]: ...
+    def _expand_frame(self, frame: Any, active_ctx: Context, options: Options) -> Any: ...
+
+    def _frame_output(
+        self,
+        framed: Any,
+        ctx: Any,
+        active_ctx: Context,
+        options: Options,
+    ) -> Any: ...
+
+    def _compact_document(
+        self,
+        expanded: Any,
+        ctx: Any,
+        active_ctx: Context,
+        options: Options,
+    ) -> Any: ...
+
+    def _to_rdf(self, expanded: Any, options: Options) -> Any: ...
+
     def _compact(
         self,
         active_ctx: Context,
@@ -98,8 +152,10 @@ class JsonLdProcessor:
         type_scoped_ctx: Optional[Context],
     ) -> None: ...
 
-    def _flatten(self, input: Any): ...
+    def _flatten(self, input: Any, options: Options): ...
     def _frame(self, input_: Any, frame: Any, options: Options): ...
+    def _iter_frame(self, input_: Any, frame: Any, options: Options) -> Iterator[Any]: ...
+    def _create_frame_state(self, input_: Any, options: Options) -> Object[Any]: ...
     def _from_rdf(self, dataset: Any, options: Options): ...
 
     def _process_context(
@@ -153,6 +209,7 @@ class JsonLdProcessor:
         graph: Any,
         issuer: IdentifierIssuer,
         options: Options,
+        triples: Optional[Any] = ...,
     ) -> Object[Object[str]]: ...
 
     def _list_to_rdf(
@@ -176,8 +233,17 @@ class JsonLdProcessor:
         o: Any,
         use_native_types: bool,
         rdf_direction: Any,
+        native_values: Optional[Object[Object[Any]]] = ...,
     ): ...
 
+    def _create_top_node_map(
+        self,
+        input_: Any,
+        graph_map: Any,
+        issuer: Any,
+        options: Options,
+    ) -> None: ...
+
     def _create_node_map(
         self,
         input_: Any,
@@ -187,9 +253,10 @@ class JsonLdProcessor:
         active_subject: Optional[Any],
         active_property: Optional[str],
         list_: Optional[Any],
+        value_index: Optional[Object[Any]],
     ) -> None: ...
 
-    def _merge_node_map_graphs(self, graph_map: Any): ...
+    def _merge_node_map_graphs(self, graph_map: Any, ordered: bool = ...): ...
 
     def _match_frame(
         self,
@@ -198,9 +265,11 @@ class JsonLdProcessor:
         frame: Any,
         parent: Any,
         property: str,
+        included_subjects: Optional[Any] = ...,
     ) -> None: ...
 
     def _create_implicit_frame(self, flags: Any): ...
+    def _get_implicit_frame(self, state: Any, flags: Any) -> Any: ...
 
     def _creates_circular_reference(
         self,
@@ -210,14 +279,21 @@ class JsonLdProcessor:
     ): ...
 
     def _get_frame_flag(self, frame: Any, options: Options, name: Any): ...
+    def _get_frame_flags(self, state: Any, frame: Any) -> Object[Any]: ...
+    def _resolve_frame_flags(self, state: Any, frame: Any) -> None: ...
     def _validate_frame(self, frame: Any) -> None: ...
     def _filter_subjects(self, state: Any, subjects: Any, frame: Any, flags: Any): ...
+    def _get_frame_index(self, state: Any) -> Object[Any]: ...
+    def _get_frame_candidates(self, state: Any, frame: Any, flags: Any) -> Optional[Set[str]]: ...
+    def _get_graph_subjects(self, state: Any, graph: str) -> List[str]: ...
+    def _get_node_items(self, state: Any, node: Any) -> Iterable[Tuple[str, Any]]: ...
+    def _get_frame_items(self, state: Any, frame: Any) -> List[Tuple[str, Any]]: ...
     def _filter_subject(self, state: Any, subject: Any, frame: Any, flags: Any): ...
     def _remove_embed(self, state: Any, id_: Any) -> None: ...
     def _add_frame_output(self, parent: Any, property: Any, output: Any) -> None: ...
     def _node_match(self, state: Any, pattern: Any, value: Any, flags: Any) -> bool: ...
     def _value_match(self, pattern: Any, value: Any) -> bool: ...
-    def _cleanup_preserve(self, input_: Any, options: Options): ...
+    def _cleanup_preserve(self, element: Any, options: Options) -> Tuple[Any, bool]: ...
     def _cleanup_null(self, input_: Any, options: Options): ...
 
     def _select_term(
@@ -271,6 +347,7 @@ class JsonLdProcessor:
 
     def _get_initial_context(self, options: Options) -> Context: ...
     def _get_inverse_context(self, active_ctx: Context) -> Context: ...
+    def _get_term_index(self, active_ctx: Context) -> Object[Any]: ...
     def _clone_active_context(self, active_ctx: Context) -> Context: ...
 
 
@@ -286,10 +363,17 @@ def _is_bool(v: Any) -> bool: ...
 def _is_integer(v: Any) -> bool: ...
 def _is_double(v: Any) -> bool: ...
 def _is_numeric(v: Any) -> bool: ...
+def _canonical_double(v: float) -> str: ...
+def _parse_i18n_datatype(type_: str) -> Tuple[str, str, bool]: ...
+def _numpy() -> Any: ...
+def _native_column(type_: str, values: List[str]) -> List[Any]: ...
+def _native_literals(dataset: Object[Any]) -> Object[Object[Any]]: ...
 def _is_subject(v: Any) -> bool: ...
 def _is_subject_reference(v: Any) -> bool: ...
 def _is_value(v: Any) -> bool: ...
 def _is_list(v: Any) -> bool: ...
+def _value_key(v: Any) -> Optional[Tuple[Any, ...]]: ...
+def _ordered_items(obj: Any, ordered: bool = ...) -> Iterable[Tuple[Any, Any]]: ...
 def _is_graph(v: Any) -> bool: ...
 def _is_simple_graph(v: Any) -> bool: ...
 def _is_bnode(v: Any) -> bool: ...
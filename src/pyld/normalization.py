@@ -7,6 +7,7 @@ from functools import cmp_to_key
 
 from .exceptions import UnknownFormat
 from .parse import to_nquad, parse_nquads
+from .profiler import phase
 from .types import IdentifierIssuer
 
 __all__ = ['URDNA2015', 'URGNA2012']
@@ -72,6 +73,8 @@ class URDNA2015:
         self.hash_to_blank_nodes = {}
         self.canonical_issuer = IdentifierIssuer('_:c14n')
         self.quads = []
+        # number of permutations tried by Hash N-Degree Quads
+        self.permutations = 0
         self.POSITIONS = {'subject': 's', 'object': 'o', 'name': 'g'}
 
     # 4.4) Normalization Algorithm
@@ -112,6 +115,54 @@ class URDNA2015:
         # populate it using the keys from the blank node to quads map.
         non_normalized = set(self.blank_node_info.keys())
 
+        profiler = options.get('profiler')
+
+        # 4-5) Issue canonical identifiers for the blank nodes with a unique
+        # first degree hash.
+        with phase(profiler, 'c14n_first_degree'):
+            if profiler is not None:
+                profiler.count('blank_nodes', len(self.blank_node_info))
+            self.issue_first_degree_identifiers(non_normalized)
+
+        # 6) Issue canonical identifiers for the rest of the blank nodes.
+        with phase(profiler, 'c14n_n_degree'):
+            self.issue_n_degree_identifiers()
+            if profiler is not None:
+                profiler.count('permutations', self.permutations)
+
+        # Note: At this point all blank nodes in the set of RDF quads have been
+        # assigned canonical identifiers, which have been stored in the
+        # canonical issuer. Here each quad is updated by assigning each of its
+        # blank nodes its new identifier.
+
+        # 7) For each quad, quad, in input dataset:
+        normalized = []
+        for quad in self.quads:
+            # 7.1) Create a copy, quad copy, of quad and replace any existing
+            # blank node identifiers using the canonical identifiers previously
+            # issued by canonical issuer. Note: We optimize away the copy here.
+            for key, component in quad.items():
+                if key == 'predicate':
+                    continue
+                if (component['type'] == 'blank node' and not
+                        component['value'].startswith(self.canonical_issuer.prefix)):
+                    component['value'] = self.canonical_issuer.get_id(
+                        component['value'])
+
+            # 7.2) Add quad copy to the normalized dataset.
+            normalized.append(to_nquad(quad))
+
+        # sort normalized output
+        normalized.sort()
+
+        # 8) Return the normalized dataset.
+        if (options.get('format') == 'application/n-quads' or
+                options.get('format') == 'application/nquads'):
+            return ''.join(normalized)
+        return parse_nquads(''.join(normalized))
+
+    # 4.4) Normalization Algorithm, steps 4 and 5
+    def issue_first_degree_identifiers(self, non_normalized):
         # 4) Initialize simple, a boolean flag, to true.
         simple = True
 
@@ -159,6 +210,8 @@ class URDNA2015:
                 # 5.4.5) Set simple to true.
                 simple = True
 
+    # 4.4) Normalization Algorithm, step 6
+    def issue_n_degree_identifiers(self):
         # 6) For each hash to identifier list mapping in hash to blank nodes
         # map, lexicographically-sorted by hash:
         for hash, id_list in sorted(self.hash_to_blank_nodes.items()):
@@ -200,37 +253,6 @@ class URDNA2015:
                 for existing in result['issuer'].existing:
                     self.canonical_issuer.get_id(existing)
 
-        # Note: At this point all blank nodes in the set of RDF quads have been
-        # assigned canonical identifiers, which have been stored in the
-        # canonical issuer. Here each quad is updated by assigning each of its
-        # blank nodes its new identifier.
-
-        # 7) For each quad, quad, in input dataset:
-        normalized = []
-        for quad in self.quads:
-            # 7.1) Create a copy, quad copy, of quad and replace any existing
-            # blank node identifiers using the canonical identifiers previously
-            # issued by canonical issuer. Note: We optimize away the copy here.
-            for key, component in quad.items():
-                if key == 'predicate':
-                    continue
-                if (component['type'] == 'blank node' and not
-                        component['value'].startswith(self.canonical_issuer.prefix)):
-                    component['value'] = self.canonical_issuer.get_id(
-                        component['value'])
-
-            # 7.2) Add quad copy to the normalized dataset.
-            normalized.append(to_nquad(quad))
-
-        # sort normalized output
-        normalized.sort()
-
-        # 8) Return the normalized dataset.
-        if (options.get('format') == 'application/n-quads' or
-                options.get('format') == 'application/nquads'):
-            return ''.join(normalized)
-        return parse_nquads(''.join(normalized))
-
     # 4.6) Hash First Degree Quads
     def hash_first_degree_quads(self, id_):
         # return cached hash
@@ -344,6 +366,8 @@ class URDNA2015:
 
             # 5.4) For each permutation of blank node list:
             for permutation in permutations(blank_nodes):
+                self.permutations += 1
+
                 # 5.4.1) Create a copy of issuer, issuer copy.
                 issuer_copy = copy.deepcopy(issuer)
 
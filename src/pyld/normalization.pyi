@@ -1,5 +1,5 @@
 from .types import IdentifierIssuer, Object, Options
-from typing import Any, Dict, Iterator, List, TypeVar
+from typing import Any, Dict, Iterator, List, Set, TypeVar
 from hashlib._hashlib import HASH
 
 T = TypeVar('T')
@@ -14,10 +14,13 @@ class URDNA2015:
     hash_to_blank_nodes: Dict
     canonical_issuer: IdentifierIssuer
     quads: List[Object[Any]]
+    permutations: int
     POSITIONS: Dict[str, str]
 
     def __init__(self) -> None: ...
     def main(self, dataset: Object, options: Options): ...
+    def issue_first_degree_identifiers(self, non_normalized: Set[str]) -> None: ...
+    def issue_n_degree_identifiers(self) -> None: ...
     def hash_first_degree_quads(self, id_: Any): ...
     def modify_first_degree_component(self, id_: str, component: Object[Any], key: Any): ...
     def hash_related_blank_node(self, related: Any, quad: Any, issuer: Any, position: Any): ...
@@ -0,0 +1,232 @@
+"""
+Parallel processing of JSON-LD documents in a pool of worker processes.
+
+The JSON-LD algorithms are CPU-bound pure Python, so threads cannot run them
+concurrently. A `JsonLdExecutor` runs them in worker processes instead, each
+warmed with the same preloaded contexts and document loader.
+"""
+import multiprocessing
+import pickle
+from functools import partial
+
+from . import jsonld
+from .exceptions import JsonLdError, WorkerError
+
+__all__ = ['JsonLdExecutor']
+
+
+def _init_worker(contexts, document_loader):
+    """
+    Prepares a worker process: installs the document loader and restores the
+    preloaded contexts into the context caches.
+
+    :param contexts: the contexts serialized with `jsonld.dumps_context`.
+    :param document_loader: the document loader to use, None for the
+      default one.
+    """
+    if document_loader is not None:
+        jsonld.set_document_loader(document_loader)
+    for data in contexts:
+        jsonld.loads_context(data)
+
+
+def _portable(error):
+    """
+    Returns an error that can be sent back to the parent process.
+
+    :param error: the JsonLdError raised in the worker.
+
+    :return: the error, or a WorkerError describing it if it can't be
+      pickled.
+    """
+    try:
+        pickle.dumps(error)
+    except Exception:
+        return WorkerError(
+            'Could not send error from worker process.',
+            code=error.code, error=str(error.args[-1]))
+    return error
+
+
+def _run(operation, args, options, item):
+    """
+    Runs a JSON-LD operation on a single input in a worker process.
+
+    :param operation: the name of the `jsonld` function to call.
+    :param args: the positional arguments following the input.
+    :param options: the options to use.
+    :param item: a tuple with the position of the input and the input.
+
+    :return: a tuple with the position of the input and the output or the
+      JsonLdError raised while processing it.
+    """
+    index, input_ = item
+    try:
+        return index, getattr(jsonld, operation)(input_, *args, options)
+    except JsonLdError as e:
+        return index, _portable(e)
+    except Exception as e:
+        return index, _portable(WorkerError(
+            'Unexpected error in worker process.', cause=e))
+
+
+class JsonLdExecutor:
+    """
+    Runs JSON-LD operations over many documents in a pool of worker
+    processes.
+    """
+
+    def __init__(
+            self, processes=None, contexts=None, document_loader=None,
+            chunksize=16, mp_context=None):
+        """
+        Creates a JsonLdExecutor.
+
+        :param processes: the number of worker processes
+          (default: os.cpu_count()).
+        :param contexts: contexts (or context URLs) to process once and
+          preload in every worker.
+        :param document_loader(url, options): the document loader to use in
+          the workers, it must be picklable (default: the default loader of
+          each worker).
+        :param chunksize: the number of documents sent to a worker at once.
+        :param mp_context: the multiprocessing start method to use
+          (default: the platform default).
+        """
+        options = {}
+        if document_loader is not None:
+            options['documentLoader'] = document_loader
+        preloaded = [
+            jsonld.dumps_context(ctx, options) for ctx in contexts or ()]
+
+        self.chunksize = chunksize
+        self._pool = multiprocessing.get_context(mp_context).Pool(
+            processes, _init_worker, (preloaded, document_loader))
+
+    def compact(self, inputs, ctx, options=None, ordered=True):
+        """
+        Performs JSON-LD compaction on each input.
+
+        :param inputs: an iterable of JSON-LD inputs.
+        :param ctx: the JSON-LD context to compact with.
+        :param [options]: the options to use (see `jsonld.compact`).
+        :param ordered: True to return outputs in input order, False to
+          return (index, output) tuples as they complete.
+
+        :return: an iterator over the outputs.
+        """
+        return self._map('compact', inputs, (ctx,), options, ordered)
+
+    def expand(self, inputs, options=None, ordered=True):
+        """
+        Performs JSON-LD expansion on each input.
+
+        :param inputs: an iterable of JSON-LD inputs.
+        :param [options]: the options to use (see `jsonld.expand`).
+        :param ordered: True to return outputs in input order, False to
+          return (index, output) tuples as they complete.
+
+        :return: an iterator over the outputs.
+        """
+        return self._map('expand', inputs, (), options, ordered)
+
+    def flatten(self, inputs, ctx=None, options=None, ordered=True):
+        """
+        Performs JSON-LD flattening on each input.
+
+        :param inputs: an iterable of JSON-LD inputs.
+        :param ctx: the JSON-LD context to compact with (default: None).
+        :param [options]: the options to use (see `jsonld.flatten`).
+        :param ordered: True to return outputs in input order, False to
+          return (index, output) tuples as they complete.
+
+        :return: an iterator over the outputs.
+        """
+        return self._map('flatten', inputs, (ctx,), options, ordered)
+
+    def frame(self, inputs, frame, options=None, ordered=True):
+        """
+        Performs JSON-LD framing on each input.
+
+        :param inputs: an iterable of JSON-LD inputs.
+        :param frame: the JSON-LD frame to use.
+        :param [options]: the options to use (see `jsonld.frame`).
+        :param ordered: True to return outputs in input order, False to
+          return (index, output) tuples as they complete.
+
+        :return: an iterator over the outputs.
+        """
+        return self._map('frame', inputs, (frame,), options, ordered)
+
+    def normalize(self, inputs, options=None, ordered=True):
+        """
+        Performs RDF dataset normalization on each input.
+
+        :param inputs: an iterable of JSON-LD inputs.
+        :param [options]: the options to use (see `jsonld.normalize`).
+        :param ordered: True to return outputs in input order, False to
+          return (index, output) tuples as they complete.
+
+        :return: an iterator over the outputs.
+        """
+        return self._map('normalize', inputs, (), options, ordered)
+
+    def to_rdf(self, inputs, options=None, ordered=True):
+        """
+        Outputs the RDF dataset found in each input.
+
+        :param inputs: an iterable of JSON-LD inputs.
+        :param [options]: the options to use (see `jsonld.to_rdf`).
+        :param ordered: True to return outputs in input order, False to
+          return (index, output) tuples as they complete.
+
+        :return: an iterator over the outputs.
+        """
+        return self._map('to_rdf', inputs, (), options, ordered)
+
+    def close(self):
+        """
+        Waits for the submitted work to finish and stops the workers.
+        """
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self):
+        """
+        Stops the workers without waiting for the submitted work.
+        """
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+
+    def _map(self, operation, inputs, args, options, ordered):
+        """
+        Runs an operation on each input in the worker processes.
+
+        Errors are not raised, the JsonLdError raised while processing an
+        input is returned in place of its output.
+
+        :param operation: the name of the `jsonld` function to call.
+        :param inputs: an iterable of JSON-LD inputs.
+        :param args: the positional arguments following the input.
+        :param options: the options to use, they must be picklable.
+        :param ordered: True to return outputs in input order, False to
+          return (index, output) tuples as they complete.
+
+        :return: an iterator over the outputs.
+        """
+        task = partial(_run, operation, args, options)
+        if ordered:
+            results = self._pool.imap(
+                task, enumerate(inputs), self.chunksize)
+            return (output for _, output in results)
+        return self._pool.imap_unordered(
+            task, enumerate(inputs), self.chunksize)
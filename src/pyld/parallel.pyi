@@ -0,0 +1,42 @@
+from .types import Context, Options
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+__all__ = ['JsonLdExecutor']
+
+
+def _init_worker(contexts: Iterable[bytes], document_loader: Optional[Callable]) -> None: ...
+def _portable(error: Exception) -> Exception: ...
+def _run(operation: str, args: Tuple[Any, ...], options: Optional[Options], item: Tuple[int, Any]) -> Tuple[int, Any]: ...
+
+
+class JsonLdExecutor:
+    chunksize: int
+
+    def __init__(
+        self,
+        processes: Optional[int] = ...,
+        contexts: Optional[Iterable[Any]] = ...,
+        document_loader: Optional[Callable] = ...,
+        chunksize: int = ...,
+        mp_context: Optional[str] = ...,
+    ) -> None: ...
+
+    def compact(self, inputs: Iterable[Any], ctx: Context, options: Optional[Options] = ..., ordered: bool = ...) -> Iterator[Any]: ...
+    def expand(self, inputs: Iterable[Any], options: Optional[Options] = ..., ordered: bool = ...) -> Iterator[Any]: ...
+    def flatten(self, inputs: Iterable[Any], ctx: Optional[Context] = ..., options: Optional[Options] = ..., ordered: bool = ...) -> Iterator[Any]: ...
+    def frame(self, inputs: Iterable[Any], frame: Any, options: Optional[Options] = ..., ordered: bool = ...) -> Iterator[Any]: ...
+    def normalize(self, inputs: Iterable[Any], options: Optional[Options] = ..., ordered: bool = ...) -> Iterator[Any]: ...
+    def to_rdf(self, inputs: Iterable[Any], options: Optional[Options] = ..., ordered: bool = ...) -> Iterator[Any]: ...
+    def close(self) -> None: ...
+    def terminate(self) -> None: ...
+    def __enter__(self) -> JsonLdExecutor: ...
+    def __exit__(self, exc_type: Any, exc_value: Any, tb: Any) -> None: ...
+
+    def _map(
+        self,
+        operation: str,
+        inputs: Iterable[Any],
+        args: Tuple[Any, ...],
+        options: Optional[Options],
+        ordered: bool,
+    ) -> Iterator[Any]: ...
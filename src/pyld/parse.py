@@ -142,26 +142,20 @@ ESCAPED = str.maketrans(
     {'\\':  r'\\', '\t':  r'\t', '\n':  r'\n', '\r':  r'\r', '"': r'\"'})
 
 
-def _compare_rdf_triples(t1, t2) -> bool:
+def _triple_key(triple):
     """
-    Compares two RDF triples for equality.
+    Returns a hashable key for an RDF triple, made of the type and value of
+    its subject, predicate and object, and the language and datatype of its
+    object. Two triples are the same if their keys are equal.
 
-    :param t1: the first triple.
-    :param t2: the second triple.
+    :param triple: the triple.
 
-    :return: True if the triples are the same, False if not.
+    :return: the key.
     """
-    for attr in ['subject', 'predicate', 'object']:
-        if (t1[attr]['type'] != t2[attr]['type'] or
-                t1[attr]['value'] != t2[attr]['value']):
-            return False
-
-    if t1['object'].get('language') != t2['object'].get('language'):
-        return False
-    if t1['object'].get('datatype') != t2['object'].get('datatype'):
-        return False
-
-    return True
+    s, p, o = triple['subject'], triple['predicate'], triple['object']
+    return (
+        s['type'], s['value'], p['type'], p['value'], o['type'], o['value'],
+        o.get('language'), o.get('datatype'))
 
 
 def parse_nquads(input_):
@@ -174,6 +168,8 @@ def parse_nquads(input_):
     """
     # build RDF dataset
     dataset = {}
+    # keys of the triples in each graph, to skip duplicates
+    keys = {}
 
     # split N-Quad input into lines and skip empty lines
     for i, line in enumerate(_eoln(input_), 1):
@@ -224,19 +220,12 @@ def parse_nquads(input_):
         # get graph name ('@default' is used for the default graph)
         name = n1 if n1 is not None else n2 if n2 is not None else '@default'
 
-        # initialize graph in dataset
-        if name not in dataset:
-            dataset[name] = [triple]
         # add triple if unique to its graph
-        else:
-            unique = True
-            triples = dataset[name]
-            for t in dataset[name]:
-                if _compare_rdf_triples(t, triple):
-                    unique = False
-                    break
-            if unique:
-                triples.append(triple)
+        key = _triple_key(triple)
+        graph_keys = keys.setdefault(name, set())
+        if key not in graph_keys:
+            graph_keys.add(key)
+            dataset.setdefault(name, []).append(triple)
 
     return dataset
 
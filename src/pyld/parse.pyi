@@ -26,6 +26,9 @@ def parse_link_header(header: str) -> Object[Any]: ...
 ESCAPED: Dict[int, str]
 
 
+def _triple_key(triple: Object[Any]) -> Tuple[Any, ...]: ...
+
+
 def parse_nquads(input_: str) -> Object[Any]: ...
 
 
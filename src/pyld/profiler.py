@@ -0,0 +1,160 @@
+"""
+Instrumentation of JSON-LD operations.
+
+A profiler is passed to an operation in the `profiler` option. It can be a
+`Profiler` or any object with the same `start`, `stop` and `count` methods,
+e.g. one that forwards the events to a monitoring system.
+
+The phases are 'load_document', 'context_resolution', 'expand',
+'node_map', 'frame_match', 'compact', 'to_rdf', 'from_rdf',
+'c14n_first_degree' and 'c14n_n_degree'. Phases nest, e.g. 'expand'
+includes the 'context_resolution' of the contexts it finds.
+
+The counters are 'remote_fetches', 'document_size', 'context_cache_hits',
+'context_cache_misses', 'processed_context_cache_hits',
+'processed_context_cache_misses', 'nodes', 'quads', 'blank_nodes' and
+'permutations'. They are reported while the phase they concern runs.
+'document_size' is the size in bytes of the responses of the built-in
+document loaders, and the length of the documents other loaders return
+unparsed.
+"""
+import time
+
+__all__ = ['Profiler']
+
+
+class Profiler:
+    """
+    Collects the number of calls and the time spent in each phase of JSON-LD
+    operations, and the counters they report.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        """
+        Creates a Profiler.
+
+        :param clock: the function returning the current time in seconds
+          (default: time.perf_counter).
+        """
+        self.clock = clock
+        # phase -> [calls, seconds]
+        self.phases = {}
+        self.counters = {}
+        # phase -> start times of its running calls
+        self._running = {}
+
+    def start(self, phase, **attributes):
+        """
+        Records the start of a phase.
+
+        :param phase: the name of the phase.
+        :param attributes: details about the phase, such as the URL of a
+          loaded document.
+        """
+        self._running.setdefault(phase, []).append(self.clock())
+
+    def stop(self, phase, **attributes):
+        """
+        Records the end of a phase.
+
+        The time of a phase nested in a running call of the same phase is
+        already included in that call, so only its outermost call adds to
+        its time.
+
+        :param phase: the name of the phase.
+        :param attributes: details about the outcome of the phase, such as
+          the `exception` that ended it.
+        """
+        running = self._running[phase]
+        start = running.pop()
+        entry = self.phases.setdefault(phase, [0, 0.0])
+        entry[0] += 1
+        if not running:
+            del self._running[phase]
+            entry[1] += self.clock() - start
+
+    def count(self, counter, n=1):
+        """
+        Adds to a counter.
+
+        :param counter: the name of the counter.
+        :param n: the amount to add (default: 1).
+        """
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def reset(self):
+        """
+        Clears the collected phases and counters.
+        """
+        self.phases = {}
+        self.counters = {}
+        self._running = {}
+
+    def as_dict(self):
+        """
+        Returns the collected phases and counters.
+
+        :return: a dict with the calls and seconds of each phase, and the
+          counters.
+        """
+        return {
+            'phases': {
+                phase: {'calls': calls, 'seconds': seconds}
+                for phase, (calls, seconds) in self.phases.items()},
+            'counters': dict(self.counters),
+        }
+
+
+class _Phase:
+    """
+    A context manager reporting a phase to a profiler.
+    """
+    __slots__ = 'profiler', 'name', 'attributes'
+
+    def __init__(self, profiler, name, attributes):
+        self.profiler = profiler
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.profiler.start(self.name, **self.attributes)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_value is None:
+            self.profiler.stop(self.name)
+        else:
+            self.profiler.stop(self.name, exception=exc_value)
+        return False
+
+
+class _NoPhase:
+    """
+    A context manager doing nothing, used when there is no profiler.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(profiler, name, **attributes):
+    """
+    Returns a context manager reporting a phase to a profiler.
+
+    :param profiler: the profiler, None if there is none.
+    :param name: the name of the phase.
+    :param attributes: details about the phase.
+
+    :return: the context manager, a shared one doing nothing if there is no
+      profiler.
+    """
+    if profiler is None:
+        return _NO_PHASE
+    return _Phase(profiler, name, attributes)
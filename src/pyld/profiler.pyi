@@ -0,0 +1,41 @@
+from typing import Any, Callable, Dict, List, Optional, Union
+
+__all__ = ['Profiler']
+
+
+class Profiler:
+    clock: Callable[[], float]
+    phases: Dict[str, List[Union[int, float]]]
+    counters: Dict[str, int]
+    _running: Dict[str, List[float]]
+
+    def __init__(self, clock: Callable[[], float] = ...) -> None: ...
+    def start(self, phase: str, **attributes: Any) -> None: ...
+    def stop(self, phase: str, **attributes: Any) -> None: ...
+    def count(self, counter: str, n: int = ...) -> None: ...
+    def reset(self) -> None: ...
+    def as_dict(self) -> Dict[str, Dict[str, Any]]: ...
+
+
+class _Phase:
+    profiler: Any
+    name: str
+    attributes: Dict[str, Any]
+
+    def __init__(
+        self, profiler: Any, name: str, attributes: Dict[str, Any]) -> None: ...
+    def __enter__(self) -> _Phase: ...
+    def __exit__(self, exc_type: Any, exc_value: Any, tb: Any) -> bool: ...
+
+
+class _NoPhase:
+    def __enter__(self) -> _NoPhase: ...
+    def __exit__(self, exc_type: Any, exc_value: Any, tb: Any) -> bool: ...
+
+
+_NO_PHASE: _NoPhase
+
+
+def phase(
+    profiler: Optional[Any], name: str,
+    **attributes: Any) -> Union[_Phase, _NoPhase]: ...
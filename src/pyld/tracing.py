@@ -0,0 +1,117 @@
+"""
+OpenTelemetry tracing of JSON-LD operations.
+
+A `TracingProfiler` passed in the `profiler` option reports each phase of
+an operation as a span named 'pyld.<phase>', a child of the span current
+when the operation is called. Phase details, such as the URL of a loaded
+document, and the counters reported while a span is current, such as
+context cache hits, document sizes and node counts, are set as
+'pyld.<name>' attributes of the span.
+
+When the OpenTelemetry API is not installed and no tracer is given, a
+`TracingProfiler` does nothing. Giving a tracer then raises an ImportError.
+"""
+from .const import __version__
+
+try:
+    from opentelemetry import context as otel_context, trace
+except ImportError:
+    otel_context = trace = None
+
+
+__all__ = ['TracingProfiler']
+
+
+class TracingProfiler:
+    """
+    Reports the phases of JSON-LD operations as OpenTelemetry spans.
+    """
+
+    def __init__(self, tracer=None, phases=None):
+        """
+        Creates a TracingProfiler.
+
+        :param tracer: the OpenTelemetry tracer to create spans with
+          (default: the 'pyld' tracer of the global tracer provider).
+          The OpenTelemetry API must be installed to give one.
+        :param phases: the names of the phases to report as spans, the
+          counters of the others are set on their parent span
+          (default: all phases).
+        """
+        if trace is None:
+            if tracer is not None:
+                raise ImportError(
+                    'opentelemetry-api is required to trace JSON-LD '
+                    'operations; install pyld[tracing]')
+        elif tracer is None:
+            tracer = trace.get_tracer('pyld', __version__)
+        self.tracer = tracer
+        self.phases = frozenset(phases) if phases is not None else None
+        # (span, context token, counters) of each running span
+        self._spans = []
+
+    def _traces(self, phase):
+        return self.tracer is not None and (
+            self.phases is None or phase in self.phases)
+
+    def start(self, phase, **attributes):
+        """
+        Starts the span of a phase and makes it the current span.
+
+        :param phase: the name of the phase.
+        :param attributes: the attributes of the span.
+        """
+        if not self._traces(phase):
+            return
+        span = self.tracer.start_span(
+            'pyld.' + phase, attributes=_attributes(attributes))
+        token = otel_context.attach(trace.set_span_in_context(span))
+        self._spans.append((span, token, {}))
+
+    def stop(self, phase, **attributes):
+        """
+        Ends the span of a phase, recording the exception that ended the
+        phase, if any.
+
+        :param phase: the name of the phase.
+        :param attributes: more attributes of the span.
+        """
+        if not self._traces(phase):
+            return
+        span, token, _ = self._spans.pop()
+        exception = attributes.pop('exception', None)
+        if exception is not None:
+            span.record_exception(exception)
+            span.set_status(trace.Status(
+                trace.StatusCode.ERROR, type(exception).__name__))
+        if attributes:
+            span.set_attributes(_attributes(attributes))
+        otel_context.detach(token)
+        span.end()
+
+    def count(self, counter, n=1):
+        """
+        Adds to a counter of the current span, setting its total as an
+        attribute of the span.
+
+        :param counter: the name of the counter.
+        :param n: the amount to add (default: 1).
+        """
+        if not self._spans:
+            return
+        span, _, counters = self._spans[-1]
+        counters[counter] = total = counters.get(counter, 0) + n
+        span.set_attribute('pyld.' + counter, total)
+
+
+def _attributes(attributes):
+    """
+    Converts phase details to span attributes, dropping those that are None.
+
+    :param attributes: the phase details.
+
+    :return: the span attributes.
+    """
+    return {
+        'pyld.' + key: value for key, value in attributes.items()
+        if value is not None}
@@ -0,0 +1,20 @@
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+__all__ = ['TracingProfiler']
+
+
+class TracingProfiler:
+    tracer: Optional[Any]
+    phases: Optional[FrozenSet[str]]
+    _spans: List[Tuple[Any, Any, Dict[str, int]]]
+
+    def __init__(
+        self, tracer: Optional[Any] = ...,
+        phases: Optional[Iterable[str]] = ...) -> None: ...
+    def _traces(self, phase: str) -> bool: ...
+    def start(self, phase: str, **attributes: Any) -> None: ...
+    def stop(self, phase: str, **attributes: Any) -> None: ...
+    def count(self, counter: str, n: int = ...) -> None: ...
+
+
+def _attributes(attributes: Dict[str, Any]) -> Dict[str, Any]: ...
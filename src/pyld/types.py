@@ -1,4 +1,5 @@
-from typing import NamedTuple, Optional
+from array import array
+from typing import Any, NamedTuple, Optional
 from collections.abc import Mapping
 from functools import reduce
 
@@ -30,6 +31,10 @@ class frozendict(Mapping):
     def __repr__(self):
         return f'<{self.__class__.__name__} {self._dict}>'
 
+    def __reduce__(self):
+        # the cached hash depends on the interpreter's hash seed
+        return self.__class__, (self._dict,)
+
     def __hash__(self):
         if self._hash is None:
             self._hash = reduce(
@@ -97,6 +102,202 @@ class ParsedUrl(NamedTuple):
     fragment: Optional[str]
 
 
+class CompiledFrame(NamedTuple):
+    """
+    A JSON-LD frame dereferenced, expanded and validated once, with its
+    context processed and its framing flags resolved, to frame any number of
+    inputs. It must not be modified.
+    """
+    frame: Any
+    context: Any
+    active_ctx: Mapping
+    options: Mapping
+    flags: dict
+
+    def __reduce__(self):
+        # the resolved flags are keyed by the ids of the sub-frames
+        return self.__class__, tuple(self[:-1]) + ({},)
+
+
+class QuadColumns(object):
+    """
+    An RDF dataset stored as columns, one row per quad.
+
+    Terms are dictionary-encoded: `subject`, `predicate`, `object`, `graph`,
+    `datatype` and `language` hold indexes into `terms`, -1 for the default
+    graph or no datatype or language. `object_type` holds indexes into
+    `OBJECT_TYPES`.
+    """
+    COLUMNS = (
+        'subject', 'predicate', 'object', 'object_type', 'datatype',
+        'language', 'graph')
+    OBJECT_TYPES = ('IRI', 'blank node', 'literal')
+
+    def __init__(self):
+        self.terms = []
+        self._term_ids = {}
+        self._object_type_ids = {
+            type_: i for i, type_ in enumerate(self.OBJECT_TYPES)}
+        for name in self.COLUMNS:
+            setattr(self, name, array('b' if name == 'object_type' else 'q'))
+
+    def __len__(self):
+        return len(self.subject)
+
+    def __reduce__(self):
+        return _restore_quad_columns, (
+            self.terms, [getattr(self, name) for name in self.COLUMNS])
+
+    def term_id(self, term):
+        """
+        Returns the index of a term in `terms`, adding it if it is new.
+
+        :param term: the term.
+
+        :return: the index of the term.
+        """
+        id_ = self._term_ids.get(term)
+        if id_ is None:
+            id_ = self._term_ids[term] = len(self.terms)
+            self.terms.append(term)
+        return id_
+
+    def add(self, triple, graph_name='@default'):
+        """
+        Adds an RDF triple to a graph of the dataset.
+
+        :param triple: the RDF triple.
+        :param graph_name: the name of the graph.
+        """
+        term_id = self.term_id
+        o = triple['object']
+        self.subject.append(term_id(triple['subject']['value']))
+        self.predicate.append(term_id(triple['predicate']['value']))
+        self.object.append(term_id(o['value']))
+        self.object_type.append(self._object_type_ids[o['type']])
+        datatype = o.get('datatype')
+        self.datatype.append(term_id(datatype) if datatype else -1)
+        language = o.get('language')
+        self.language.append(term_id(language) if language else -1)
+        self.graph.append(
+            -1 if graph_name == '@default' else term_id(graph_name))
+
+    def sink(self, graph_name='@default'):
+        """
+        Returns an object whose `append` method adds RDF triples to a graph
+        of the dataset, to use in place of a list of triples.
+
+        :param graph_name: the name of the graph.
+
+        :return: the sink.
+        """
+        return _QuadColumnsSink(self, graph_name)
+
+    def to_dataset(self):
+        """
+        Converts the columns back to an RDF dataset.
+
+        :return: the RDF dataset, a map of graph name to list of triples.
+        """
+        terms = self.terms
+        dataset = {}
+        for s, p, o, type_, datatype, language, graph in zip(
+                *(getattr(self, name) for name in self.COLUMNS)):
+            subject = terms[s]
+            object = {'type': self.OBJECT_TYPES[type_], 'value': terms[o]}
+            if datatype >= 0:
+                object['datatype'] = terms[datatype]
+            if language >= 0:
+                object['language'] = terms[language]
+            dataset.setdefault(
+                '@default' if graph < 0 else terms[graph], []).append({
+                    'subject': {
+                        'type': (
+                            'blank node' if subject.startswith('_:')
+                            else 'IRI'),
+                        'value': subject
+                    },
+                    'predicate': {
+                        'type': (
+                            'blank node' if terms[p].startswith('_:')
+                            else 'IRI'),
+                        'value': terms[p]
+                    },
+                    'object': object
+                })
+        return dataset
+
+    def to_numpy(self):
+        """
+        Returns the columns as NumPy arrays sharing the memory of the
+        columns, and the terms as an array of objects. Requires NumPy.
+
+        :return: a map of column name to array, with a `terms` entry.
+        """
+        import numpy
+
+        rval = {
+            name: numpy.frombuffer(
+                getattr(self, name),
+                dtype=numpy.int8 if name == 'object_type' else numpy.int64)
+            for name in self.COLUMNS}
+        rval['terms'] = numpy.array(self.terms, dtype=object)
+        return rval
+
+    def to_arrow(self):
+        """
+        Returns the columns as a table of dictionary-encoded string columns,
+        where -1 indexes are nulls. Requires pyarrow.
+
+        :return: the pyarrow.Table.
+        """
+        import pyarrow
+        import pyarrow.compute
+
+        def indices(column, type_):
+            rval = pyarrow.Array.from_buffers(
+                type_, len(column), [None, pyarrow.py_buffer(column)])
+            if type_ == pyarrow.int64():
+                rval = pyarrow.compute.if_else(
+                    pyarrow.compute.greater_equal(rval, 0), rval,
+                    pyarrow.scalar(None, type_))
+            return rval
+
+        terms = pyarrow.array(self.terms, pyarrow.string())
+        object_types = pyarrow.array(self.OBJECT_TYPES, pyarrow.string())
+        return pyarrow.table({
+            name: pyarrow.DictionaryArray.from_arrays(
+                indices(getattr(self, name), pyarrow.int8()),
+                object_types)
+            if name == 'object_type' else
+            pyarrow.DictionaryArray.from_arrays(
+                indices(getattr(self, name), pyarrow.int64()), terms)
+            for name in self.COLUMNS})
+
+
+class _QuadColumnsSink(object):
+    """
+    Adds the RDF triples appended to it to a graph of a QuadColumns.
+    """
+    __slots__ = 'columns', 'graph_name'
+
+    def __init__(self, columns, graph_name):
+        self.columns = columns
+        self.graph_name = graph_name
+
+    def append(self, triple):
+        self.columns.add(triple, self.graph_name)
+
+
+def _restore_quad_columns(terms, columns):
+    rval = QuadColumns()
+    for term in terms:
+        rval.term_id(term)
+    for name, column in zip(QuadColumns.COLUMNS, columns):
+        setattr(rval, name, column)
+    return rval
+
+
 # class IdentifierIssuer(dict):
 #     """
 #     An IdentifierIssuer issues unique identifiers, keeping track of any
@@ -1,7 +1,8 @@
+from array import array
 from collections.abc import Mapping
 from typing import (
-    Any, Dict, Iterator, List, Literal, NamedTuple, Optional,
-    TypedDict, TypeVar, Union,
+    Any, ClassVar, Dict, Iterator, List, Literal, NamedTuple, Optional,
+    Tuple, TypedDict, TypeVar, Union,
 )
 
 NoneType = type(None)
@@ -20,6 +21,7 @@ class frozendict(Mapping[KT, VT]):
     def copy(self, **items: Any) -> 'frozendict': ...
     def __iter__(self) -> Iterator: ...
     def __len__(self) -> int: ...
+    def __reduce__(self) -> Any: ...
     def __hash__(self) -> int: ...
 
 
@@ -33,6 +35,47 @@ class IdentifierIssuer:
     def has_id(self, old: Any) -> bool: ...
 
 
+class CompiledFrame(NamedTuple):
+    frame: List[Any]
+    context: Any
+    active_ctx: Mapping
+    options: Mapping[str, Any]
+    flags: Dict[int, Any]
+    def __reduce__(self) -> Any: ...
+
+
+class QuadColumns:
+    COLUMNS: ClassVar[Tuple[str, ...]]
+    OBJECT_TYPES: ClassVar[Tuple[str, ...]]
+    terms: List[str]
+    subject: array
+    predicate: array
+    object: array
+    object_type: array
+    datatype: array
+    language: array
+    graph: array
+    def __init__(self) -> None: ...
+    def __len__(self) -> int: ...
+    def __reduce__(self) -> Any: ...
+    def term_id(self, term: str) -> int: ...
+    def add(self, triple: Object[Any], graph_name: str = ...) -> None: ...
+    def sink(self, graph_name: str = ...) -> '_QuadColumnsSink': ...
+    def to_dataset(self) -> Object[List[Object[Any]]]: ...
+    def to_numpy(self) -> Object[Any]: ...
+    def to_arrow(self) -> Any: ...
+
+
+class _QuadColumnsSink:
+    columns: QuadColumns
+    graph_name: str
+    def __init__(self, columns: QuadColumns, graph_name: str) -> None: ...
+    def append(self, triple: Object[Any]) -> None: ...
+
+
+def _restore_quad_columns(terms: List[str], columns: List[array]) -> QuadColumns: ...
+
+
 class ParsedUrl(NamedTuple):
     scheme: str
     authority: Optional[str]
@@ -51,7 +94,7 @@ class AnyOptions(TypedDict, total=False):
     embed: str  # TODO: keyword?
     expandContext: Any
     extractAllScripts: bool
-    format: Literal['application/n-quads', 'application/nquads']
+    format: Literal['application/n-quads', 'application/nquads', 'columnar']
     framing: bool
     graph: bool
     headers: Object[str]
@@ -0,0 +1,103 @@
+"""
+Shared fixtures of the API tests.
+
+Tests over the W3C test manifests load them with the test runner from the
+json-ld-api and json-ld-framing repositories checked out next to this one,
+as `runtests.py` does, and are skipped when they are not found.
+"""
+import os
+import unittest
+
+import pytest
+
+import runtests
+from pyld import jsonld
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def _iter_tests(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_tests(test)
+        else:
+            yield test
+
+
+def load_manifest(repository, manifest):
+    """
+    Loads the positive evaluation tests of a test manifest.
+
+    :param repository: the name of the repository holding the test suite.
+    :param manifest: the file name of the manifest.
+
+    :return: the list of runnable tests.
+    """
+    filename = os.path.join(ROOT, '..', repository, 'tests', manifest)
+    if not os.path.exists(filename):
+        pytest.skip(f'{repository} test suite not found')
+    runtests.ROOT_MANIFEST_DIR = '/'
+    root_manifest = {
+        '@id': '',
+        '@type': 'mf:Manifest',
+        'name': 'PyLD API tests',
+        'sequence': [os.path.abspath(filename)],
+    }
+    suite = runtests.Manifest(root_manifest, '/').load()
+
+    rval = []
+    for test in _iter_tests(suite):
+        if test.is_negative or test.is_syntax:
+            continue
+        try:
+            test.setUp()
+        except unittest.SkipTest:
+            continue
+        if not test.pending:
+            rval.append(test)
+    return rval
+
+
+@pytest.fixture
+def manifest_tests():
+    """
+    Returns a function loading the tests of a manifest, with the parameters
+    of their operation.
+    """
+    def load(repository, manifest):
+        return [
+            (test, [param(test) for param in
+                    runtests.TEST_TYPES[test.test_type]['params']])
+            for test in load_manifest(repository, manifest)]
+    return load
+
+
+class StaticLoader:
+    """
+    A picklable document loader serving documents from a map of URL to
+    document, failing for any other URL.
+    """
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __call__(self, url, options=None):
+        if url not in self.documents:
+            raise jsonld.LoadDocumentError(
+                'Unexpected fetch.', code='loading document failed',
+                url=url)
+        return {
+            'contentType': 'application/ld+json',
+            'contextUrl': None,
+            'documentUrl': url,
+            'document': self.documents[url],
+        }
+
+
+@pytest.fixture
+def static_loader():
+    """
+    Returns a function creating a document loader from a map of URL to
+    document; the loader fails for any other URL.
+    """
+    return StaticLoader
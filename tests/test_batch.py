@@ -0,0 +1,67 @@
+"""
+Tests of the batch API, which must give the results of the single-document
+operations.
+"""
+from pyld import cache, jsonld
+
+
+def _results(fn, *args):
+    """
+    Returns the outputs of a batch operation, ending with the type of the
+    error raised, if any.
+    """
+    cache.clear()
+    rval = []
+    try:
+        for output in fn(*args):
+            rval.append(output)
+    except jsonld.JsonLdError as e:
+        rval.append(type(e))
+    return rval
+
+
+def _expected(fn, inputs, *args):
+    """
+    Returns the outputs of a single-document operation on each input, up to
+    the type of the first error raised, if any. Each input is processed with
+    empty caches.
+    """
+    def outputs():
+        for input_ in inputs:
+            cache.clear()
+            yield fn(input_, *args)
+    return _results(outputs)
+
+
+def test_compact_many_relative_vocab(static_loader):
+    ctx = {'@vocab': 'terms/'}
+    docs = {
+        'http://a.example/doc': {'http://a.example/terms/p': 1},
+        'http://b.example/doc': {'http://b.example/terms/p': 2},
+    }
+    options = {'documentLoader': static_loader(docs)}
+    expected = _expected(jsonld.compact, docs, ctx, options)
+    assert [doc['p'] for doc in expected] == [1, 2]
+    assert _results(jsonld.compact_many, docs, ctx, options) == expected
+    # the processed context cache also tells the bases apart
+    assert [jsonld.compact(url, ctx, options) for url in docs] == expected
+
+
+def test_compact_many(manifest_tests):
+    previous = None
+    for test, (input_, ctx, options) in manifest_tests(
+            'json-ld-api', 'compact-manifest.jsonld'):
+        inputs = [input_] if previous is None else [input_, previous]
+        previous = input_
+        assert _results(jsonld.compact_many, inputs, ctx, options) == \
+            _expected(jsonld.compact, inputs, ctx, options), test.data['@id']
+
+
+def test_flatten_many(manifest_tests):
+    previous = None
+    for test, (input_, ctx, options) in manifest_tests(
+            'json-ld-api', 'flatten-manifest.jsonld'):
+        inputs = [input_] if previous is None else [input_, previous]
+        previous = input_
+        assert _results(jsonld.flatten_many, inputs, ctx, options) == \
+            _expected(jsonld.flatten, inputs, ctx, options), test.data['@id']
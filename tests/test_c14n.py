@@ -0,0 +1,102 @@
+"""
+Tests of the streaming JCS encoders, which must write the output of
+canonicalize.
+"""
+import hashlib
+import io
+import random
+
+import pytest
+
+from pyld.c14n import _BufferedWriter, canonical_digest, canonicalize, \
+    canonicalize_to
+
+VALUES = [
+    None, True, False, 0, -1, 2 ** 60, 1.5, -0.0, 1e21, 1e-7,
+    333333333.3333333,
+    '', 'a"b\\c', '€\U0001f600\n\x1f', [], {}, [[]], {'': {}},
+    {'b': [1, {'z': None, 'a': 'é'}], 'a': 'x', 'é': 1, 'A': 2},
+]
+
+
+def _random_value(rnd, depth=0):
+    """
+    Returns a random JSON value.
+    """
+    kind = rnd.randrange(8 if depth < 4 else 5)
+    if kind == 0:
+        return rnd.choice([None, True, False])
+    if kind == 1:
+        return rnd.randint(-2 ** 53, 2 ** 53)
+    if kind == 2:
+        return rnd.uniform(-1e6, 1e6) * 10 ** rnd.randint(-20, 20)
+    if kind in (3, 4):
+        return ''.join(
+            chr(rnd.choice([rnd.randrange(0x20, 0x7f), rnd.randrange(0x3000)]))
+            for _ in range(rnd.randrange(6)))
+    if kind in (5, 6):
+        return [
+            _random_value(rnd, depth + 1) for _ in range(rnd.randrange(5))]
+    return {
+        str(rnd.randrange(100)): _random_value(rnd, depth + 1)
+        for _ in range(rnd.randrange(5))}
+
+
+def _streamed(obj, utf8):
+    """
+    Returns the output of canonicalize_to and the number of writes.
+    """
+    class Sink:
+        def __init__(self):
+            self.writes = []
+
+        def write(self, data):
+            self.writes.append(data)
+
+    sink = Sink()
+    canonicalize_to(obj, sink, utf8)
+    return (b'' if utf8 else '').join(sink.writes), len(sink.writes)
+
+
+def _values():
+    rnd = random.Random(0)
+    return VALUES + [_random_value(rnd) for _ in range(300)]
+
+
+@pytest.mark.parametrize('utf8', [True, False])
+def test_canonicalize_to(utf8):
+    for value in _values():
+        assert _streamed(value, utf8)[0] == canonicalize(value, utf8), value
+
+
+def test_canonicalize_to_file():
+    fp = io.StringIO()
+    canonicalize_to(VALUES, fp, utf8=False)
+    assert fp.getvalue() == canonicalize(VALUES, utf8=False)
+
+
+def test_canonical_digest():
+    for value in _values():
+        assert canonical_digest(value, hashlib.sha256()).digest() == \
+            hashlib.sha256(canonicalize(value)).digest(), value
+
+
+@pytest.mark.parametrize('utf8', [True, False])
+def test_large_input(utf8):
+    value = {
+        'items': [
+            {'id': i, 'name': f'né{i}', 'tags': ['a', i * 0.5]}
+            for i in range(_BufferedWriter.BLOCK)],
+    }
+    output, writes = _streamed(value, utf8)
+    assert writes > 2
+    assert output == canonicalize(value, utf8)
+    assert canonical_digest(value, hashlib.sha256()).digest() == \
+        hashlib.sha256(canonicalize(value)).digest()
+
+
+def test_circular_reference():
+    value = []
+    value.append(value)
+    with pytest.raises(ValueError):
+        canonicalize_to(value, io.BytesIO())
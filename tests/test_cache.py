@@ -0,0 +1,153 @@
+"""
+Tests of the statistics and management of the context caches.
+"""
+import pytest
+
+from pyld import cache, jsonld
+from pyld.cache import StatsLRUCache
+
+EX = 'http://example.org/'
+CONTEXT_URL = EX + 'context'
+CONTEXT = {'@vocab': EX, 'knows': {'@type': '@id'}}
+INPUT = {'@id': EX + 'a', EX + 'knows': {'@id': EX + 'b'}}
+
+
+@pytest.fixture
+def loader(static_loader):
+    return static_loader({CONTEXT_URL: {'@context': CONTEXT}})
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    maxsizes = {
+        name: entry['maxsize'] for name, entry in cache.stats().items()
+        if entry['maxsize'] is not None}
+    cache.clear()
+    cache.reset_stats()
+    yield
+    for name, maxsize in maxsizes.items():
+        cache.resize(name, maxsize)
+    cache.clear()
+
+
+def test_stats_lru_cache():
+    lru = StatsLRUCache(2)
+    lru['a'] = 1
+    lru['b'] = 2
+    assert lru.get('a') == 1
+    assert lru.get('c') is None
+    # 'b' is the least recently used entry
+    lru['c'] = 3
+    assert list(lru) == ['a', 'c']
+    assert (lru.stats.hits, lru.stats.misses, lru.stats.evictions) == \
+        (1, 1, 1)
+    # indexing and membership tests are not counted
+    assert 'a' in lru and lru['a'] == 1
+    assert lru.stats.hits == 1
+
+
+def test_stats(loader):
+    jsonld.compact(INPUT, CONTEXT_URL, {'documentLoader': loader})
+    jsonld.compact(INPUT, CONTEXT_URL, {'documentLoader': loader})
+    stats = cache.stats()
+    assert set(stats) == set(cache.CACHES)
+    assert stats['resolved_contexts']['misses'] >= 1
+    assert stats['resolved_contexts']['hits'] >= 1
+    assert stats['processed_contexts']['misses'] == 1
+    assert stats['processed_contexts']['hits'] >= 1
+    entry = stats['inverse_contexts']
+    assert entry['misses'] == 1
+    assert entry['hits'] >= 1
+    assert entry['hit_rate'] == entry['hits'] / (entry['hits'] + 1)
+    assert entry['currsize'] == 1
+
+    cache.reset_stats('inverse_contexts')
+    entry = cache.stats('inverse_contexts')['inverse_contexts']
+    assert (entry['hits'], entry['misses'], entry['hit_rate']) == \
+        (0, 0, None)
+    assert entry['currsize'] == 1
+    assert cache.stats(memory=True)['inverse_contexts']['bytes'] > 0
+
+
+def test_evictions():
+    cache.resize('inverse_contexts', 1)
+    jsonld.compact(INPUT, CONTEXT)
+    jsonld.compact(INPUT, {'@vocab': EX})
+    entry = cache.stats('inverse_contexts')['inverse_contexts']
+    assert entry['evictions'] == 1
+    assert entry['currsize'] == entry['maxsize'] == 1
+
+
+@pytest.mark.parametrize('name', [
+    'resolved_contexts', 'processed_contexts', 'inverse_contexts'])
+def test_resize(name, loader):
+    jsonld.compact(INPUT, CONTEXT_URL, {'documentLoader': loader})
+    assert cache.stats(name)[name]['currsize'] >= 1
+
+    cache.resize(name, 0)
+    assert cache.stats(name)[name]['currsize'] == 0
+    jsonld.compact(INPUT, CONTEXT_URL, {'documentLoader': loader})
+    entry = cache.stats(name)[name]
+    assert entry['currsize'] == entry['maxsize'] == 0
+
+    cache.resize(name, 10)
+    cache.reset_stats(name)
+    jsonld.compact(INPUT, CONTEXT_URL, {'documentLoader': loader})
+    jsonld.compact(INPUT, CONTEXT_URL, {'documentLoader': loader})
+    entry = cache.stats(name)[name]
+    assert entry['currsize'] >= 1
+    assert entry['maxsize'] == 10
+    assert entry['hits'] >= 1
+
+
+def test_clear(loader):
+    jsonld.compact(INPUT, CONTEXT_URL, {'documentLoader': loader})
+    cache.clear('inverse_contexts')
+    stats = cache.stats()
+    assert stats['inverse_contexts']['currsize'] == 0
+    assert stats['resolved_contexts']['currsize'] >= 1
+    # counters are kept
+    assert stats['inverse_contexts']['misses'] == 1
+
+
+def test_unknown_cache():
+    for fn in (cache.stats, cache.reset_stats, cache.clear):
+        with pytest.raises(ValueError):
+            fn('contexts')
+    with pytest.raises(ValueError):
+        cache.resize('contexts', 1)
+    with pytest.raises(ValueError):
+        cache.resize('initial_contexts', 1)
+    with pytest.raises(ValueError):
+        cache.resize('inverse_contexts', -1)
+
+
+def test_warm(static_loader, loader):
+    cache.warm([CONTEXT_URL], {'documentLoader': loader})
+    cache.reset_stats()
+
+    jsonld.compact(
+        INPUT, CONTEXT_URL, {'documentLoader': static_loader({})})
+    stats = cache.stats()
+    assert stats['processed_contexts']['hits'] >= 1
+    assert stats['processed_contexts']['misses'] == 0
+    assert stats['inverse_contexts']['hits'] >= 1
+    assert stats['inverse_contexts']['misses'] == 0
+
+
+def test_processed_contexts_per_base():
+    # a relative @vocab is processed against the base IRI
+    ctx = {'@vocab': 'v/'}
+    bases = ['http://a.example/', 'http://b.example/', 'http://c.example/']
+    for base in bases + bases[:1]:
+        compacted = jsonld.compact(
+            {base + 'v/p': 1}, ctx, {'base': base})
+        assert compacted['p'] == 1
+    entry = cache.stats('processed_contexts')['processed_contexts']
+    assert (entry['hits'], entry['misses']) == (1, 3)
+    assert entry['currsize'] == 3
+
+    cache.resize('processed_contexts', 1)
+    entry = cache.stats('processed_contexts')['processed_contexts']
+    assert entry['currsize'] == 1
+    assert entry['evictions'] == 2
@@ -0,0 +1,117 @@
+"""
+Tests of the JSON codec, whose results and errors must not depend on the
+codec in use.
+"""
+import json
+import sys
+
+import pytest
+
+from pyld import codec
+from pyld.codec import JsonCodec, get_json_codec, loads, set_json_codec
+
+LONG = '12345678901234567890'
+INPUTS = [
+    LONG,
+    '[-' + LONG + ', 0.' + LONG + ', 1e' + LONG[:3] + ']',
+    '{"a": [1, 2.5, "' + LONG + '", null, true]}',
+    'NaN',
+    '[Infinity, -Infinity]',
+    '"\\ud800"',
+    '"\ud800"'.encode('utf-8', 'surrogatepass'),
+    '{"a": "é"}'.encode('utf-16'),
+    '{"a": "é"}'.encode(),
+]
+
+
+def _strict_loads(s):
+    """
+    Parses JSON as a strict, 64-bit codec would: rejecting constants, lone
+    surrogates and non-UTF-8 bytes, and parsing integers as floats.
+    """
+    if isinstance(s, bytes):
+        s = s.decode('utf-8')
+    s.encode('utf-8')
+
+    def reject(constant):
+        raise ValueError(constant)
+
+    return json.loads(s, parse_int=float, parse_constant=reject)
+
+
+STRICT_CODEC = JsonCodec('strict', _strict_loads)
+
+
+@pytest.fixture(autouse=True)
+def restore_codec():
+    previous = get_json_codec()
+    yield
+    set_json_codec(previous)
+
+
+def _result(s):
+    """
+    Returns the repr of a parsed document, or the type of the error raised.
+    """
+    try:
+        return repr(loads(s))
+    except Exception as e:
+        return type(e)
+
+
+def _expected(s):
+    try:
+        return repr(json.loads(s))
+    except Exception as e:
+        return type(e)
+
+
+@pytest.mark.parametrize('s, expected', [
+    (LONG, True),
+    ('-' + LONG, True),
+    ('[1, ' + LONG + ']', True),
+    ('"' + LONG + '"', True),
+    ('0.' + LONG, False),
+    ('123456789012345678', False),
+    ('[1.5, 2]', False),
+    (LONG.encode(), True),
+])
+def test_may_hold_long_integers(s, expected):
+    assert codec._may_hold_long_integers(s) is expected
+
+
+def test_long_integers():
+    set_json_codec(STRICT_CODEC)
+    value = loads(LONG)
+    assert type(value) is int and value == int(LONG)
+    assert loads('[' + LONG + ', 2]') == [int(LONG), 2]
+    # other documents are parsed with the codec
+    assert type(loads('[1.5, 2]')[1]) is float
+
+
+def test_fallback():
+    set_json_codec(STRICT_CODEC)
+    for s in INPUTS + [b'"\xff"', '{']:
+        assert _result(s) == _expected(s), s
+
+
+@pytest.mark.parametrize('name', ['orjson', 'ujson', 'simdjson', 'json'])
+def test_codecs(name):
+    pytest.importorskip(name)
+    set_json_codec(name)
+    assert get_json_codec().name == name
+    for s in INPUTS + [b'"\xff"', '{']:
+        assert _result(s) == _expected(s), s
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        set_json_codec('yaml')
+
+
+def test_missing_codec(monkeypatch):
+    previous = get_json_codec()
+    monkeypatch.setitem(sys.modules, 'ujson', None)
+    with pytest.raises(ImportError):
+        set_json_codec('ujson')
+    assert get_json_codec() is previous
@@ -0,0 +1,81 @@
+"""
+Tests of compile_frame, whose compiled frames must frame as the frames they
+were compiled from.
+"""
+import pickle
+
+import pytest
+
+from pyld import jsonld
+
+EX = 'http://example.org/'
+CONTEXT = {'@vocab': EX, 'knows': {'@type': '@id'}}
+INPUT = {
+    '@context': CONTEXT,
+    '@graph': [
+        {'@id': EX + 'a', '@type': 'Person', 'name': 'A', 'knows': EX + 'b'},
+        {'@id': EX + 'b', '@type': 'Person', 'name': 'B', 'knows': EX + 'a',
+         'age': 3},
+        {'@id': EX + 'c', '@type': 'Person', 'knows': [EX + 'a', EX + 'b']},
+        {'@id': EX + 'd', '@type': 'Place', 'name': 'D'},
+    ],
+}
+FRAMES = [
+    {'@context': CONTEXT, '@type': 'Person'},
+    {'@context': CONTEXT, '@type': 'Person', 'knows': {'name': {}}},
+    {'@context': CONTEXT, 'name': {}, 'age': {'@default': 0}},
+    {'@context': CONTEXT, '@type': 'Person', 'name': {}, 'age': {},
+     '@requireAll': True},
+    {'@context': CONTEXT, '@id': [EX + 'a', EX + 'd'], '@embed': '@never'},
+]
+FLAGS = [
+    {},
+    {'embed': '@always'},
+    {'embed': '@never'},
+    {'explicit': True},
+    {'omitDefault': True},
+    {'requireAll': True},
+]
+
+
+def _cases():
+    return [
+        (frame, flags) for frame in FRAMES for flags in FLAGS]
+
+
+@pytest.mark.parametrize('frame, flags', _cases())
+def test_compiled_frame(frame, flags):
+    expected = jsonld.frame(INPUT, frame, dict(flags))
+    compiled = jsonld.compile_frame(frame, dict(flags))
+    assert jsonld.frame(INPUT, compiled) == expected
+    # the compiled frame can be used again
+    assert jsonld.frame(INPUT, compiled) == expected
+
+
+@pytest.mark.parametrize('frame, flags', _cases())
+def test_pickled_compiled_frame(frame, flags):
+    expected = jsonld.frame(INPUT, frame, dict(flags))
+    compiled = jsonld.compile_frame(frame, dict(flags))
+    jsonld.frame(INPUT, compiled)
+    restored = pickle.loads(pickle.dumps(compiled))
+    assert restored.flags == {}
+    assert jsonld.frame(INPUT, restored) == expected
+
+
+def test_compiled_frames(manifest_tests):
+    for test, (input_, frame, options) in manifest_tests(
+            'json-ld-framing', 'frame-manifest.jsonld'):
+        try:
+            expected = jsonld.frame(input_, frame, dict(options))
+        except jsonld.JsonLdError as e:
+            with pytest.raises(type(e)):
+                jsonld.frame(
+                    input_, jsonld.compile_frame(frame, dict(options)),
+                    dict(options))
+            continue
+        compiled = jsonld.compile_frame(frame, dict(options))
+        assert jsonld.frame(input_, compiled, dict(options)) == expected, \
+            test.data['@id']
+        restored = pickle.loads(pickle.dumps(compiled))
+        assert jsonld.frame(input_, restored, dict(options)) == expected, \
+            test.data['@id']
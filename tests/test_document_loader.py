@@ -0,0 +1,70 @@
+"""
+Tests of the remote document loaders.
+"""
+import asyncio
+import sys
+import types
+
+import pytest
+
+from pyld import document_loader, jsonld
+from pyld.document_loader import async_document_loader, sync_document_loader
+from pyld.profiler import Profiler
+
+URL = 'http://example.invalid/x'
+
+
+@pytest.fixture
+def no_http_client(monkeypatch):
+    """
+    Makes the imports of the HTTP clients fail.
+    """
+    monkeypatch.setitem(sys.modules, 'httpx', None)
+    monkeypatch.setitem(sys.modules, 'requests', None)
+
+
+def _assert_missing_http_client(error):
+    assert error.code == 'loading document failed'
+    assert 'install pyld[http]' in str(error)
+    assert isinstance(error.cause, ImportError)
+
+
+def test_sync_loader_without_http_client(no_http_client):
+    with pytest.raises(jsonld.LoadDocumentError) as info:
+        sync_document_loader()(URL)
+    _assert_missing_http_client(info.value)
+
+
+def test_async_loader_without_http_client(no_http_client):
+    loop = asyncio.new_event_loop()
+    try:
+        with pytest.raises(jsonld.LoadDocumentError) as info:
+            async_document_loader(loop=loop)(URL)
+    finally:
+        loop.close()
+    _assert_missing_http_client(info.value)
+
+
+def test_expand_without_http_client(no_http_client):
+    with pytest.raises(jsonld.LoadDocumentError) as info:
+        jsonld.expand(URL, {'documentLoader': sync_document_loader()})
+    _assert_missing_http_client(info.value)
+
+
+def test_document_size(monkeypatch):
+    content = b'{"@id": "http://example.org/a"}'
+
+    def get(url, headers=None):
+        return types.SimpleNamespace(
+            headers={'content-type': 'application/ld+json'},
+            url=url, content=content)
+
+    monkeypatch.setattr(document_loader, '_http_get', lambda: get)
+    profiler = Profiler()
+    remote_doc = jsonld.load_document(URL, {
+        'documentLoader': sync_document_loader(), 'profiler': profiler})
+    # the size is reported to the profiler, not added to the document
+    assert set(remote_doc) == {
+        'contentType', 'contextUrl', 'documentUrl', 'document'}
+    assert profiler.counters['document_size'] == len(content)
+    assert profiler.counters['remote_fetches'] == 1
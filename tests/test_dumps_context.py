@@ -0,0 +1,90 @@
+"""
+Tests of dumps_context and loads_context, which must restore a processed
+context into the context caches.
+"""
+import pickle
+
+import pytest
+
+from pyld import cache, jsonld
+from pyld.context_resolver import ResolvedContext
+from pyld.types import frozendict
+
+EX = 'http://example.org/'
+CONTEXT_URL = EX + 'context'
+CONTEXT = {
+    '@context': {
+        '@vocab': EX,
+        'knows': {'@type': '@id'},
+        'name': {'@language': 'en'},
+        'xsd': 'http://www.w3.org/2001/XMLSchema#',
+    },
+}
+INPUT = {
+    '@id': EX + 'a',
+    EX + 'name': {'@value': 'A', '@language': 'en'},
+    EX + 'knows': {'@id': EX + 'b'},
+    EX + 'age': {
+        '@value': '3', '@type': 'http://www.w3.org/2001/XMLSchema#integer'},
+}
+
+
+@pytest.fixture
+def loader(static_loader):
+    return static_loader({CONTEXT_URL: CONTEXT})
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    cache.clear()
+    cache.reset_stats()
+    yield
+    cache.clear()
+
+
+def test_round_trip(loader, static_loader):
+    ctx = [CONTEXT_URL, {'label': 'http://www.w3.org/2000/01/rdf-schema#label'}]
+    expected = jsonld.compact(INPUT, ctx, {'documentLoader': loader})
+    data = jsonld.dumps_context(ctx, {'documentLoader': loader})
+
+    cache.clear()
+    cache.reset_stats()
+    jsonld.loads_context(data)
+    # restoring the context looks nothing up
+    for name, entry in cache.stats().items():
+        assert not entry['hits'] and not entry['misses'], name
+
+    assert jsonld.compact(
+        INPUT, ctx, {'documentLoader': static_loader({})}) == expected
+    stats = cache.stats()
+    assert stats['processed_contexts']['hits'] >= 1
+    assert stats['processed_contexts']['misses'] == 0
+    assert stats['inverse_contexts']['hits'] >= 1
+    assert stats['inverse_contexts']['misses'] == 0
+
+
+def test_version(loader):
+    data = pickle.loads(jsonld.dumps_context(
+        CONTEXT_URL, {'documentLoader': loader}))
+    data['version'] = '0.0.0'
+    with pytest.raises(jsonld.UnsupportedVersion):
+        jsonld.loads_context(pickle.dumps(data))
+
+
+def test_pickle_frozendict():
+    value = frozendict({'@id': EX + 'a', '@type': frozendict({'x': 1})})
+    hash(value)
+    restored = pickle.loads(pickle.dumps(value))
+    assert type(restored) is frozendict
+    assert restored == value
+    assert restored._hash is None
+    assert hash(restored) == hash(value)
+
+
+def test_pickle_resolved_context():
+    resolved = ResolvedContext(CONTEXT)
+    resolved.set_processed({'_uuid': 'a'}, {'_uuid': 'b'})
+    restored = pickle.loads(pickle.dumps(resolved))
+    assert restored.cache.stats is ResolvedContext.stats
+    assert restored.get_processed({'_uuid': 'a'}) == {'_uuid': 'b'}
+    assert ResolvedContext.stats.hits == 1
@@ -0,0 +1,103 @@
+"""
+Tests of the @preserve, @null and blank node identifier cleanup of framed
+output, which is done while compacting it.
+"""
+import pytest
+
+from pyld import jsonld
+
+EX = 'http://example.org/'
+CONTEXT = {'@vocab': EX, 'knows': {'@type': '@id'}}
+INPUT = {'@context': CONTEXT, '@graph': [
+    {'@id': EX + 'a', '@type': 'Person', 'name': 'A', 'knows': '_:b'},
+    {'@id': '_:b', '@type': 'Person', 'name': 'B'},
+    {'@id': EX + 'c', '@type': 'Person', 'knows': ['_:b', EX + 'a']},
+]}
+# _:b is embedded both as knows and as friend of a
+SHARED = {'@context': CONTEXT, '@graph': [
+    {'@id': EX + 'a', 'name': 'A', 'knows': '_:b', 'friend': {'@id': '_:b'}},
+    {'@id': '_:b', 'name': 'B', 'knows': EX + 'a'},
+]}
+B = {'@id': '_:b0', '@type': 'Person', 'name': 'B'}
+
+
+def _frame(input_, frame, **options):
+    framed = jsonld.frame(input_, dict(frame, **{'@context': CONTEXT}), options)
+    assert framed.pop('@context') == CONTEXT
+    return framed
+
+
+def _defaults(embed):
+    return {
+        '@type': 'Person', '@embed': embed,
+        'name': {'@default': None}, 'age': {'@default': 0},
+        'nick': {'@default': None},
+        'knows': {
+            '@embed': embed, 'age': {'@default': 1},
+            'nick': {'@default': None}, 'name': {}},
+    }
+
+
+def test_defaults_embed_always():
+    b = dict(B, age=1, nick=None)
+    assert _frame(INPUT, _defaults('@always')) == {'@graph': [
+        dict(B, age=0, knows=None, nick=None),
+        {'@id': EX + 'a', '@type': 'Person', 'age': 0, 'knows': b,
+         'name': 'A', 'nick': None},
+        {'@id': EX + 'c', '@type': 'Person', 'age': 0,
+         'knows': [b, {
+             '@id': EX + 'a', '@type': 'Person', 'age': 1, 'knows': B,
+             'name': 'A', 'nick': None}],
+         'name': None, 'nick': None},
+    ]}
+
+
+def test_defaults_embed_never():
+    assert _frame(INPUT, _defaults('@never')) == {'@graph': [
+        dict(B, age=0, knows=None, nick=None),
+        {'@id': EX + 'a', '@type': 'Person', 'age': 0, 'knows': '_:b0',
+         'name': 'A', 'nick': None},
+        {'@id': EX + 'c', '@type': 'Person', 'age': 0,
+         'knows': ['_:b0', EX + 'a'], 'name': None, 'nick': None},
+    ]}
+
+
+@pytest.mark.parametrize('processing_mode', ['json-ld-1.0', 'json-ld-1.1'])
+def test_keep_blank_node_identifiers(processing_mode):
+    framed = _frame(
+        INPUT, {
+            '@id': EX + 'a', 'nick': {'@default': None},
+            'knows': {'nick': {'@default': None}, 'name': {}}},
+        processingMode=processing_mode, pruneBlankNodeIdentifiers=False)
+    a = {'@id': EX + 'a', '@type': 'Person', 'knows': dict(B, nick=None),
+         'name': 'A', 'nick': None}
+    if processing_mode == 'json-ld-1.0':
+        assert framed == {'@graph': [a]}
+    else:
+        assert framed == a
+
+
+def test_node_embedded_in_two_places():
+    framed = _frame(SHARED, {
+        '@id': EX + 'a',
+        'knows': {
+            '@embed': '@always', 'name': {}, 'nick': {'@default': None},
+            'age': {'@default': 2}},
+        'friend': {'@embed': '@always', 'name': {}},
+    })
+    b = {'@id': '_:b0', 'knows': EX + 'a', 'name': 'B'}
+    # the defaults of one embed don't leak into the other
+    assert framed == {
+        '@id': EX + 'a', 'name': 'A',
+        'knows': dict(b, age=2, nick=None), 'friend': b}
+
+
+def test_node_embedded_once_pruned():
+    framed = _frame(SHARED, {
+        '@id': EX + 'a',
+        'friend': {'@embed': '@always', 'name': {}},
+        'knows': {'@embed': '@never', 'nick': {'@default': None}},
+    })
+    assert framed == {
+        '@id': EX + 'a', 'name': 'A', 'knows': None,
+        'friend': {'knows': EX + 'a', 'name': 'B'}}
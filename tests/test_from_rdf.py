@@ -0,0 +1,137 @@
+"""
+Tests of the conversion of RDF lists by from_rdf.
+"""
+import pytest
+
+from pyld import jsonld
+
+RDF = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#'
+EX = 'http://example.org/'
+FIRST = f'<{RDF}first>'
+REST = f'<{RDF}rest>'
+NIL = f'<{RDF}nil>'
+S = f'<{EX}s>'
+P = f'<{EX}p>'
+Q = f'<{EX}q>'
+
+
+def _from_rdf(*quads):
+    return jsonld.from_rdf(
+        ''.join(f'{quad} .\n' for quad in quads),
+        {'format': 'application/n-quads'})
+
+
+def _values(*values):
+    return [{'@value': value} for value in values]
+
+
+def test_well_formed_lists():
+    assert _from_rdf(
+        f'{S} {P} _:l1',
+        f'_:l1 {FIRST} "a"',
+        f'_:l1 {REST} _:l2',
+        f'_:l2 {FIRST} "b"',
+        f'_:l2 <{RDF}type> <{RDF}List>',
+        f'_:l2 {REST} {NIL}',
+        f'{S} {Q} {NIL}',
+    ) == [{
+        '@id': EX + 's',
+        EX + 'p': [{'@list': _values('a', 'b')}],
+        EX + 'q': [{'@list': []}],
+    }]
+
+
+@pytest.mark.parametrize('quad', [
+    # two rdf:first values
+    f'_:l1 {FIRST} "x"',
+    # two rdf:rest values
+    f'_:l1 {REST} {NIL}',
+    # an extra property
+    f'_:l1 {Q} "x"',
+])
+def test_malformed_list_node(quad):
+    expanded = _from_rdf(
+        f'{S} {P} _:l1',
+        f'_:l1 {FIRST} "a"',
+        f'_:l1 {REST} _:l2',
+        f'_:l2 {FIRST} "b"',
+        f'_:l2 {REST} {NIL}',
+        quad,
+    )
+    # the list is converted from the node after the malformed one
+    assert expanded[-1] == {'@id': EX + 's', EX + 'p': [{'@id': '_:l1'}]}
+    node = expanded[0]
+    assert node['@id'] == '_:l1'
+    assert {'@list': _values('b')} in node[RDF + 'rest']
+
+
+def test_duplicate_first_triples():
+    def triple(s, p, o):
+        return {
+            'subject': {'type': 'blank node', 'value': s},
+            'predicate': {'type': 'IRI', 'value': p},
+            'object': o,
+        }
+    literal = {
+        'type': 'literal', 'value': 'a',
+        'datatype': 'http://www.w3.org/2001/XMLSchema#string'}
+    dataset = {'@default': [
+        {
+            'subject': {'type': 'IRI', 'value': EX + 's'},
+            'predicate': {'type': 'IRI', 'value': EX + 'p'},
+            'object': {'type': 'blank node', 'value': '_:l1'},
+        },
+        triple('_:l1', RDF + 'first', literal),
+        triple('_:l1', RDF + 'first', literal),
+        triple('_:l1', RDF + 'rest', {'type': 'IRI', 'value': RDF + 'nil'}),
+    ]}
+    # the values of distinct triples are not merged
+    assert jsonld.from_rdf(dataset)[0] == {
+        '@id': '_:l1',
+        RDF + 'first': _values('a', 'a'),
+        RDF + 'rest': [{'@list': []}],
+    }
+
+
+def test_shared_list_nodes():
+    expanded = _from_rdf(
+        f'{S} {P} _:l1',
+        f'{S} {Q} _:l2',
+        f'_:l1 {FIRST} "a"',
+        f'_:l1 {REST} _:l2',
+        f'_:l2 {FIRST} "b"',
+        f'_:l2 {REST} {NIL}',
+    )
+    assert expanded == [
+        {
+            '@id': '_:l1',
+            RDF + 'first': _values('a'),
+            RDF + 'rest': [{'@id': '_:l2'}],
+        },
+        {
+            '@id': '_:l2',
+            RDF + 'first': _values('b'),
+            RDF + 'rest': [{'@list': []}],
+        },
+        {
+            '@id': EX + 's',
+            EX + 'p': [{'@id': '_:l1'}],
+            EX + 'q': [{'@id': '_:l2'}],
+        },
+    ]
+
+
+def test_list_in_named_graph():
+    assert _from_rdf(
+        f'{S} {P} _:l1 {S}',
+        f'_:l1 {FIRST} "a" {S}',
+        f'_:l1 {REST} {NIL} {S}',
+        f'{S} {P} "d"',
+    ) == [{
+        '@id': EX + 's',
+        EX + 'p': _values('d'),
+        '@graph': [{
+            '@id': EX + 's',
+            EX + 'p': [{'@list': _values('a')}],
+        }],
+    }]
@@ -0,0 +1,80 @@
+"""
+Tests of the cache keys of inline contexts, which must follow the content
+of a context rather than its identity.
+"""
+import json
+
+import pytest
+
+from pyld import cache, jsonld
+from pyld.c14n import canonicalize
+from pyld.context_resolver import _inline_context_key, _inline_context_keys
+
+EX = 'http://example.org/'
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _key(ctx):
+    return canonicalize(json.loads(json.dumps(ctx)), utf8=False)
+
+
+def test_changed_value():
+    ctx = {'@vocab': EX, 'name': {'@id': EX + 'name'}}
+    assert _inline_context_key(ctx) == _key(ctx)
+    ctx['name']['@id'] = EX + 'label'
+    assert _inline_context_key(ctx) == _key(ctx)
+
+    doc = {'@context': ctx, 'name': 'A'}
+    assert EX + 'label' in jsonld.expand(doc)[0]
+    ctx['name']['@id'] = EX + 'title'
+    assert EX + 'title' in jsonld.expand(doc)[0]
+
+
+def test_true_to_one():
+    ctx = {'@vocab': EX, '@propagate': True}
+    key = _inline_context_key(ctx)
+    doc = {'@context': ctx, 'name': 'A'}
+    jsonld.expand(doc)
+    # true == 1, but the canonical JSON tells them apart
+    ctx['@propagate'] = 1
+    assert _inline_context_key(ctx) != key
+    assert _inline_context_key(ctx) == _key(ctx)
+    with pytest.raises(jsonld.JsonLdError) as info:
+        jsonld.expand(doc)
+    assert info.value.code == 'invalid @propagate value'
+
+
+def test_nested_scalar_type():
+    ctx = {'@vocab': EX, 'p': {'@id': EX + 'p', '@protected': True}}
+    key = _inline_context_key(ctx)
+    ctx['p']['@protected'] = 1
+    assert _inline_context_key(ctx) != key
+    ctx['p']['@protected'] = 1.0
+    assert _inline_context_key(ctx) == _key(ctx)
+
+
+def test_reused_id():
+    ctx = {'@vocab': EX}
+    stale = {'@vocab': EX + 'other/'}
+    # the entry of a freed context whose id was given to ctx
+    _inline_context_keys[id(ctx)] = (stale, [], _key(stale))
+    assert _inline_context_key(ctx) == _key(ctx)
+    assert jsonld.expand({'@context': ctx, 'name': 'A'}) == [
+        {EX + 'name': [{'@value': 'A'}]}]
+
+    # a context later created with the same id
+    key = _inline_context_key(ctx)
+    ctx_id = id(ctx)
+    del ctx
+    for _ in range(1000):
+        ctx = {'@vocab': EX + 'new/'}
+        if id(ctx) == ctx_id:
+            assert _inline_context_key(ctx) != key
+            break
+    assert _inline_context_key(ctx) == _key(ctx)
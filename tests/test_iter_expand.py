@@ -0,0 +1,79 @@
+"""
+Tests of iter_expand, which must yield the expanded output of expand.
+"""
+import pytest
+
+from pyld import jsonld
+
+EX = 'http://example.org/'
+CONTEXT = {'@vocab': EX, 'knows': {'@type': '@id'}}
+NODES = [
+    {'@id': EX + 'a', '@type': 'Person', 'name': 'A', 'knows': EX + 'b'},
+    {'@id': EX + 'b', 'name': {'@value': 'B', '@language': 'en'}},
+    {'@value': 'a free-floating value'},
+    {'@id': EX + 'c'},
+]
+
+INPUTS = {
+    'array': [dict(node, **{'@context': CONTEXT}) for node in NODES],
+    'array with shared context': [
+        {'@context': CONTEXT, '@graph': NODES[:2]}, NODES[3]],
+    'graph': {'@context': CONTEXT, '@graph': NODES},
+    'aliased graph': {
+        '@context': dict(CONTEXT, graph='@graph', id='@id'),
+        'graph': NODES,
+    },
+    'graph with other keys': {
+        '@context': CONTEXT, '@graph': NODES, 'name': 'top',
+    },
+    'graph with @id': {
+        '@context': CONTEXT, '@id': EX + 'g', '@graph': NODES,
+    },
+    'scoped context': {
+        '@context': dict(CONTEXT, Person={
+            '@id': EX + 'Person',
+            '@context': {'name': {'@id': EX + 'label', '@language': 'en'}},
+        }),
+        '@graph': NODES,
+    },
+    'propagate false': {
+        '@context': dict(CONTEXT, **{'@propagate': False}),
+        '@graph': [{
+            '@id': EX + 'a', EX + 'label': 'A', 'name': 'A',
+            EX + 'knows': {'name': 'B', EX + 'label': 'B'},
+        }],
+    },
+    'type-scoped propagate false': {
+        '@context': dict(CONTEXT, Person={
+            '@id': EX + 'Person',
+            '@context': {
+                '@propagate': False, 'name': {'@id': EX + 'label'}},
+        }),
+        '@graph': [{'@type': 'Person', 'name': 'A', 'knows': {'name': 'B'}}],
+    },
+}
+
+
+@pytest.mark.parametrize('input_', INPUTS.values(), ids=list(INPUTS))
+def test_iter_expand(input_):
+    assert list(jsonld.iter_expand(input_)) == jsonld.expand(input_)
+
+
+def test_iter_expand_iterator():
+    input_ = INPUTS['array']
+    assert list(jsonld.iter_expand(iter(input_))) == jsonld.expand(input_)
+    assert list(jsonld.iter_expand(
+        node for node in input_)) == jsonld.expand(input_)
+
+
+def test_iter_expand_manifest(manifest_tests):
+    for test, (input_, options) in manifest_tests(
+            'json-ld-api', 'expand-manifest.jsonld'):
+        try:
+            expected = jsonld.expand(input_, dict(options))
+        except jsonld.JsonLdError as e:
+            with pytest.raises(type(e)):
+                list(jsonld.iter_expand(input_, dict(options)))
+            continue
+        assert list(jsonld.iter_expand(input_, dict(options))) == expected, \
+            test.data['@id']
@@ -0,0 +1,57 @@
+"""
+Tests of iter_frame, which must yield the top-level objects of frame.
+"""
+import pytest
+
+from pyld import jsonld
+
+EX = 'http://example.org/'
+
+
+def _graph(framed):
+    """
+    Returns the top-level objects of a framed output, without @context.
+    """
+    framed = {k: v for k, v in framed.items() if k != '@context'}
+    if '@graph' in framed:
+        return framed['@graph']
+    return [framed] if framed else []
+
+
+def _objects(framed):
+    """
+    Returns the objects yielded by iter_frame, without @context.
+    """
+    return [
+        {k: v for k, v in obj.items() if k != '@context'} for obj in framed]
+
+
+def test_iter_frame_included():
+    doc = {'@graph': [
+        {'@id': EX + 'a', '@type': EX + 'A'},
+        {'@id': EX + 'b', '@type': EX + 'B'},
+    ]}
+    frame = {
+        '@context': {'@vocab': EX},
+        '@type': 'A',
+        '@included': {'@type': 'B'},
+    }
+    expected = _graph(jsonld.frame(doc, frame))
+    assert expected[0]['@included'] == {'@id': EX + 'b', '@type': 'B'}
+    assert _objects(jsonld.iter_frame(doc, frame)) == expected
+
+
+def test_iter_frame(manifest_tests):
+    for test, (input_, frame, options) in manifest_tests(
+            'json-ld-framing', 'frame-manifest.jsonld'):
+        # iter_frame prunes blank node identifiers within each object, so
+        # compare the objects with every identifier
+        options['pruneBlankNodeIdentifiers'] = False
+        try:
+            expected = _graph(jsonld.frame(input_, frame, options))
+        except jsonld.JsonLdError as e:
+            with pytest.raises(type(e)):
+                list(jsonld.iter_frame(input_, frame, options))
+            continue
+        assert _objects(jsonld.iter_frame(input_, frame, options)) == \
+            expected, test.data['@id']
@@ -0,0 +1,96 @@
+"""
+Tests of the ordered option, whose output must only differ from the ordered
+output in the order of nodes and properties and in blank node identifiers.
+"""
+import pytest
+
+from pyld import jsonld
+
+EX = 'http://example.org/'
+CONTEXT = {
+    '@vocab': EX,
+    'knows': {'@type': '@id'},
+    'items': {'@container': '@list'},
+    'tags': {'@container': '@set'},
+}
+INPUTS = [
+    {
+        '@context': CONTEXT,
+        '@graph': [
+            {'@id': EX + 'z', '@type': ['B', 'A'], 'name': 'Z',
+             'knows': ['_:x', EX + 'a'], 'tags': ['t2', 't1']},
+            {'@id': '_:x', 'name': 'X', 'knows': {'@id': '_:y', 'name': 'Y'},
+             'items': [3, 1, {'@id': '_:y'}]},
+            {'@id': EX + 'a', 'age': 3, 'b': True, 'height': 1.5},
+            {'@id': EX + 'g', '@graph': [
+                {'@id': '_:y', 'name': 'Y in g'},
+                {'@id': EX + 'm', 'knows': '_:y',
+                 'label': {'@value': 'M', '@language': 'en'}},
+            ]},
+            {'@id': '_:g', '@graph': {'@id': EX + 'n', 'name': 'N'}},
+        ],
+    },
+    {
+        '@context': CONTEXT,
+        '@id': EX + 'root',
+        'contains': [
+            {'name': 'c', 'contains': {'name': 'd', 'knows': EX + 'root'}},
+            {'name': 'b', 'items': [{'name': 'e'}, {'name': 'f'}]},
+        ],
+    },
+]
+FRAMES = [
+    {'@context': CONTEXT},
+    {'@context': CONTEXT, 'name': {}},
+    {'@context': CONTEXT, '@id': EX + 'root', '@embed': '@always'},
+]
+
+
+def _normalize(input_, options=None):
+    return jsonld.normalize(input_, dict(
+        options or {}, algorithm='URDNA2015',
+        format='application/n-quads'))
+
+
+def _both(fn, *args, **options):
+    """
+    Returns the normalized outputs of an operation with and without
+    ordering.
+    """
+    return [
+        _normalize(fn(*args, dict(options, ordered=ordered)))
+        for ordered in (True, False)]
+
+
+@pytest.mark.parametrize('input_', INPUTS)
+def test_flatten(input_):
+    ordered, unordered = _both(jsonld.flatten, input_, CONTEXT)
+    assert ordered and unordered == ordered
+
+
+@pytest.mark.parametrize('input_', INPUTS)
+@pytest.mark.parametrize('frame', FRAMES)
+def test_frame(input_, frame):
+    ordered, unordered = _both(jsonld.frame, input_, frame)
+    assert unordered == ordered
+
+
+@pytest.mark.parametrize('input_', INPUTS)
+def test_to_rdf(input_):
+    outputs = [
+        _normalize(
+            jsonld.to_rdf(input_, {
+                'ordered': ordered, 'format': 'application/n-quads'}),
+            {'inputFormat': 'application/n-quads'})
+        for ordered in (True, False)]
+    assert outputs[0] and outputs[1] == outputs[0]
+
+
+@pytest.mark.parametrize('input_', INPUTS)
+def test_from_rdf(input_):
+    dataset = jsonld.to_rdf(input_)
+    # native types, as strings typed xsd:double can't be converted back
+    ordered, unordered = _both(
+        jsonld.from_rdf, dataset, useNativeTypes=True)
+    assert ordered and unordered == ordered
+    assert ordered == _normalize(input_)
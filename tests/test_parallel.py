@@ -0,0 +1,139 @@
+"""
+Tests of the multiprocessing executor, which must give the results of the
+single-document operations.
+"""
+import multiprocessing
+import pickle
+import threading
+
+import pytest
+
+from pyld import jsonld
+from pyld.exceptions import WorkerError
+from pyld.parallel import JsonLdExecutor
+
+EX = 'http://example.org/'
+CONTEXT = {'@vocab': EX, 'knows': {'@type': '@id'}}
+FRAME = {'@context': CONTEXT, '@type': 'Person'}
+INPUTS = [
+    {
+        '@context': CONTEXT,
+        '@id': EX + str(i),
+        '@type': 'Person',
+        'name': f'person {i}',
+        'knows': {'@id': EX + str(i + 1), 'name': f'person {i + 1}'},
+    }
+    for i in range(20)
+]
+# an invalid @vocab, failing every operation
+INVALID = {'@context': {'@vocab': 1}, 'p': 'v'}
+REMOTE = EX + 'remote'
+
+START_METHODS = [
+    method for method in ('fork', 'spawn')
+    if method in multiprocessing.get_all_start_methods()]
+
+
+class _Unpicklable(Exception):
+    """
+    An error holding a lock, which can't be pickled.
+    """
+
+    def __init__(self):
+        super().__init__('unpicklable')
+        self.lock = threading.Lock()
+
+
+def _unpicklable_loader(url, options=None):
+    """
+    Fails with an unpicklable cause.
+    """
+    raise jsonld.LoadDocumentError(
+        'Could not load the document.', code='loading document failed',
+        cause=_Unpicklable())
+
+
+@pytest.fixture
+def options(static_loader):
+    """
+    Returns the options of the operations, serving a copy of the first input
+    at REMOTE.
+    """
+    return {'documentLoader': static_loader({REMOTE: INPUTS[0]})}
+
+
+def _expected(fn, inputs, args, options):
+    """
+    Returns the outputs of a single-document operation on each input, with
+    the type and code of the error raised in place of its output.
+    """
+    rval = []
+    for input_ in inputs:
+        try:
+            rval.append(fn(input_, *args, dict(options)))
+        except jsonld.JsonLdError as e:
+            rval.append((type(e), e.code))
+    return rval
+
+
+def _outputs(outputs):
+    """
+    Returns the outputs of the executor, with the type and code of the
+    errors returned in place of an output.
+    """
+    return [
+        (type(output), output.code)
+        if isinstance(output, jsonld.JsonLdError) else output
+        for output in outputs]
+
+
+@pytest.fixture(params=START_METHODS)
+def executor(request):
+    with JsonLdExecutor(
+            processes=2, contexts=[CONTEXT], chunksize=3,
+            mp_context=request.param) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize('operation, args', [
+    ('compact', (CONTEXT,)),
+    ('frame', (FRAME,)),
+    ('normalize', ()),
+])
+def test_ordered(executor, options, operation, args):
+    inputs = INPUTS + [INVALID, REMOTE]
+    expected = _expected(getattr(jsonld, operation), inputs, args, options)
+    assert isinstance(expected[-2], tuple)
+    outputs = getattr(executor, operation)(inputs, *args, options)
+    assert _outputs(outputs) == expected
+
+
+def test_unordered(executor, options):
+    inputs = INPUTS + [INVALID]
+    expected = _expected(jsonld.compact, inputs, (CONTEXT,), options)
+    outputs = executor.compact(inputs, CONTEXT, options, ordered=False)
+    outputs = sorted(outputs, key=lambda item: item[0])
+    assert [index for index, _ in outputs] == list(range(len(inputs)))
+    assert _outputs(output for _, output in outputs) == expected
+
+
+def test_unpicklable_error(executor):
+    [output] = executor.expand(
+        [EX + 'unpicklable'], {'documentLoader': _unpicklable_loader})
+    assert isinstance(output, WorkerError)
+    assert output.code == 'loading document failed'
+    assert 'Could not load the document.' in output.details['error']
+
+
+def test_pickle_error():
+    error = jsonld.JsonLdSyntaxError(
+        'invalid @id', code='invalid @id value', cause=ValueError('cause'),
+        id=1)
+    restored = pickle.loads(pickle.dumps(error))
+    assert type(restored) is jsonld.JsonLdSyntaxError
+    assert restored.code == error.code
+    assert restored.type == error.type == 'jsonld.SyntaxError'
+    assert repr(restored.cause) == repr(error.cause)
+    assert restored.details == {'id': 1}
+    assert restored.args[0] is restored
+    assert restored.args[1:] == error.args[1:]
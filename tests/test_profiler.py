@@ -0,0 +1,101 @@
+"""
+Tests of the phases and counters recorded by a Profiler.
+"""
+import itertools
+
+import pytest
+
+from pyld import cache, jsonld
+from pyld.profiler import Profiler
+
+EX = 'http://example.org/'
+CONTEXT_URL = EX + 'context'
+INPUT = {
+    '@context': CONTEXT_URL,
+    '@id': EX + 'a',
+    '@type': 'A',
+    'knows': {'@id': '_:b', 'name': 'B'},
+}
+
+
+@pytest.fixture
+def run(static_loader):
+    """
+    Returns a function running an operation with empty caches and a new
+    Profiler, and returning the Profiler.
+    """
+    loader = static_loader({CONTEXT_URL: {'@context': {'@vocab': EX}}})
+
+    def run(fn, *args, **options):
+        cache.clear()
+        profiler = Profiler()
+        fn(INPUT, *args, dict(
+            options, documentLoader=loader, profiler=profiler))
+        return profiler
+    return run
+
+
+def _calls(profiler):
+    return {
+        phase: calls for phase, (calls, _) in profiler.phases.items()}
+
+
+def test_flatten(run):
+    profiler = run(jsonld.flatten, None)
+    assert _calls(profiler) == {
+        'load_document': 1, 'context_resolution': 1, 'expand': 1,
+        'node_map': 1}
+    assert profiler.counters == {
+        'remote_fetches': 1, 'context_cache_misses': 2,
+        'processed_context_cache_misses': 1, 'nodes': 2}
+    assert profiler._running == {}
+
+
+def test_frame(run):
+    profiler = run(jsonld.frame, {'@context': {'@vocab': EX}, '@type': 'A'})
+    calls = _calls(profiler)
+    assert calls['frame_match'] == calls['compact'] == 1
+    # the input and the frame are both expanded
+    assert calls['expand'] == 2
+    assert profiler.counters['remote_fetches'] == 1
+    assert profiler.counters['processed_context_cache_hits'] >= 1
+    assert profiler._running == {}
+
+
+def test_normalize(run):
+    profiler = run(
+        jsonld.normalize, algorithm='URDNA2015',
+        format='application/n-quads')
+    calls = _calls(profiler)
+    assert calls['to_rdf'] == calls['c14n_first_degree'] == 1
+    assert calls['c14n_n_degree'] == 1
+    assert profiler.counters['quads'] == 3
+    assert profiler.counters['blank_nodes'] == 1
+    assert profiler._running == {}
+
+
+@pytest.mark.parametrize('fn, args', [
+    (jsonld.flatten, (None,)),
+    (jsonld.frame, ({'@type': EX + 'A'},)),
+    (jsonld.normalize, ()),
+])
+def test_error(fn, args, static_loader):
+    cache.clear()
+    profiler = Profiler()
+    with pytest.raises(jsonld.JsonLdError):
+        fn(INPUT, *args, {
+            'documentLoader': static_loader({}), 'profiler': profiler})
+    assert profiler.phases['load_document'][0] == 1
+    assert profiler._running == {}
+
+
+def test_nested_time():
+    profiler = Profiler(clock=itertools.count().__next__)
+    profiler.start('expand')
+    profiler.start('expand')
+    profiler.stop('expand')
+    profiler.stop('expand')
+    # only the outermost call adds to the time
+    assert profiler.as_dict()['phases'] == {
+        'expand': {'calls': 2, 'seconds': 2}}
+    assert profiler._running == {}
@@ -0,0 +1,112 @@
+"""
+Tests of the columnar output of to_rdf, which must hold the RDF dataset of
+to_rdf.
+"""
+import pickle
+
+import pytest
+
+from pyld import jsonld
+from pyld.types import QuadColumns
+
+EX = 'http://example.org/'
+INPUT = {
+    '@context': {
+        '@vocab': EX,
+        'knows': {'@type': '@id'},
+        'label': {'@language': 'en'},
+        'items': {'@container': '@list'},
+    },
+    '@graph': [
+        {
+            '@id': EX + 'a',
+            '@type': 'Person',
+            'label': 'A',
+            'name': [
+                {'@value': 'Ä', '@language': 'de'},
+                {'@value': 'A', '@direction': 'rtl', '@language': 'ar'},
+            ],
+            'age': 3,
+            'knows': '_:b',
+            'items': ['x', {'@id': '_:c'}],
+        },
+        {
+            '@id': EX + 'g',
+            '@graph': [
+                {'@id': '_:b', 'label': 'B', 'height': 1.5, 'alive': True},
+                {'@id': EX + 'c', 'knows': EX + 'a'},
+            ],
+        },
+        {
+            '@id': '_:g',
+            '@graph': {'@id': EX + 'd', 'label': 'D'},
+        },
+    ],
+}
+
+
+@pytest.fixture
+def columns():
+    return jsonld.to_rdf(INPUT, {'format': 'columnar'})
+
+
+def test_to_dataset(columns):
+    assert isinstance(columns, QuadColumns)
+    dataset = jsonld.to_rdf(INPUT)
+    assert len(dataset) == 3 and EX + 'g' in dataset
+    assert any(name.startswith('_:') for name in dataset)
+    assert columns.to_dataset() == dataset
+    assert len(columns) == sum(len(triples) for triples in dataset.values())
+
+
+def test_pickle(columns):
+    restored = pickle.loads(pickle.dumps(columns))
+    assert restored.terms == columns.terms
+    for name in QuadColumns.COLUMNS:
+        assert getattr(restored, name) == getattr(columns, name), name
+    assert restored.to_dataset() == jsonld.to_rdf(INPUT)
+
+
+def _quads(dataset):
+    """
+    Returns the quads of an RDF dataset as sorted rows of the columns, with
+    None for the default graph or no datatype or language.
+    """
+    rows = []
+    for name, triples in dataset.items():
+        for triple in triples:
+            o = triple['object']
+            rows.append((
+                triple['subject']['value'], triple['predicate']['value'],
+                o['value'], o['type'], o.get('datatype'), o.get('language'),
+                None if name == '@default' else name))
+    return sorted(rows, key=repr)
+
+
+def test_to_numpy(columns):
+    numpy = pytest.importorskip('numpy')
+    arrays = columns.to_numpy()
+    assert set(arrays) == set(QuadColumns.COLUMNS) | {'terms'}
+    assert arrays['object_type'].dtype == numpy.int8
+    assert arrays['subject'].dtype == numpy.int64
+    terms = arrays['terms']
+
+    def term(i):
+        return None if i < 0 else terms[i]
+
+    rows = [
+        (terms[s], terms[p], terms[o], QuadColumns.OBJECT_TYPES[type_],
+         term(datatype), term(language), term(graph))
+        for s, p, o, type_, datatype, language, graph in zip(
+            *(arrays[name].tolist() for name in QuadColumns.COLUMNS))]
+    assert sorted(rows, key=repr) == _quads(columns.to_dataset())
+
+
+def test_to_arrow(columns):
+    pytest.importorskip('pyarrow')
+    table = columns.to_arrow()
+    assert table.column_names == list(QuadColumns.COLUMNS)
+    assert table.num_rows == len(columns)
+    rows = list(zip(*(
+        table.column(name).to_pylist() for name in QuadColumns.COLUMNS)))
+    assert sorted(rows, key=repr) == _quads(columns.to_dataset())
@@ -0,0 +1,112 @@
+"""
+Tests of the OpenTelemetry tracing of JSON-LD operations.
+"""
+import types
+
+import pytest
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter)
+    from opentelemetry.trace import StatusCode
+except ImportError:
+    TracerProvider = None
+
+from pyld import document_loader, jsonld, tracing
+from pyld.tracing import TracingProfiler
+
+requires_sdk = pytest.mark.skipif(
+    TracerProvider is None, reason='opentelemetry-sdk not installed')
+
+URL = 'http://example.org/doc'
+CONTENT = (
+    b'{"@context": {"@vocab": "http://example.org/"}, '
+    b'"@id": "http://example.org/a", "p": {"@id": "http://example.org/b"}}')
+
+
+@pytest.fixture
+def exporter():
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def tracer(exporter):
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider.get_tracer('test')
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    """
+    Returns the built-in synchronous loader, getting CONTENT from any URL.
+    """
+    def get(url, headers=None):
+        return types.SimpleNamespace(
+            headers={'content-type': 'application/ld+json'},
+            url=url, content=CONTENT)
+
+    monkeypatch.setattr(document_loader, '_http_get', lambda: get)
+    return document_loader.sync_document_loader()
+
+
+def _spans(exporter):
+    """
+    Returns the finished spans by name.
+    """
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+@requires_sdk
+def test_spans(exporter, tracer, loader):
+    with tracer.start_as_current_span('parent'):
+        jsonld.flatten(URL, None, {
+            'documentLoader': loader, 'profiler': TracingProfiler(tracer)})
+    spans = _spans(exporter)
+    parent = spans['parent'].context.span_id
+    for name in ('pyld.load_document', 'pyld.expand', 'pyld.node_map'):
+        assert spans[name].parent.span_id == parent, name
+    assert spans['pyld.context_resolution'].parent.span_id == \
+        spans['pyld.expand'].context.span_id
+
+    load = spans['pyld.load_document']
+    assert load.attributes['pyld.url'] == URL
+    assert load.attributes['pyld.remote_fetches'] == 1
+    assert load.attributes['pyld.document_size'] == len(CONTENT)
+    assert spans['pyld.node_map'].attributes['pyld.nodes'] == 2
+
+
+@requires_sdk
+def test_document_size_unparsed(exporter, tracer, static_loader):
+    jsonld.expand(URL, {
+        'documentLoader': static_loader({URL: CONTENT.decode()}),
+        'profiler': TracingProfiler(tracer)})
+    load = _spans(exporter)['pyld.load_document']
+    assert load.attributes['pyld.document_size'] == len(CONTENT)
+
+
+@requires_sdk
+def test_error_status(exporter, tracer, static_loader):
+    with pytest.raises(jsonld.JsonLdError):
+        jsonld.expand(URL, {
+            'documentLoader': static_loader({}),
+            'profiler': TracingProfiler(tracer)})
+    load = _spans(exporter)['pyld.load_document']
+    assert load.status.status_code == StatusCode.ERROR
+    assert load.status.description == 'LoadDocumentError'
+    assert 'pyld.document_size' not in load.attributes
+
+
+def test_without_api(monkeypatch, loader):
+    monkeypatch.setattr(tracing, 'trace', None)
+    monkeypatch.setattr(tracing, 'otel_context', None)
+    with pytest.raises(ImportError, match=r'pyld\[tracing\]'):
+        TracingProfiler(types.SimpleNamespace())
+    # without a tracer, nothing is traced
+    profiler = TracingProfiler()
+    assert jsonld.flatten(URL, None, {
+        'documentLoader': loader, 'profiler': profiler}) == \
+        jsonld.flatten(URL, None, {'documentLoader': loader})
+    assert profiler._spans == []